@@ -1,21 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, List, Tuple, Dict, Any, AsyncIterator
+import asyncio
+import json
+import logging
 import time
 
 from app.db.base import get_db
-from app.schemas.search import SearchRequest, SearchResponse, Coordinates, SearchResult, RestaurantLinks
+from app.db.spatial import places_within_radius
+from app.db.store import StoredPlace, freshness_cutoff, fresh_place_detail, fresh_places, is_stale
+from app.db.writer import persistence_writer
+from app.schemas.search import (
+    SearchRequest, SearchResponse, Coordinates, SearchResult, RestaurantLinks, SearchStreamComplete
+)
 from app.schemas.place import PlaceDetailResponse, PlaceDetail, GlutenSnippet
 from app.providers.geocode import geocoding_provider
 from app.providers.yelp import yelp_provider
-from app.nlp.keywords import gluten_detector
-from app.nlp.sentiment import sentiment_analyzer
+from app.providers.place_index import business_from_place, place_index
+from app.providers.ratelimit import Priority, QuotaExceededError
+from app.providers.search_cache import search_result_cache
+from app.nlp.analysis import ReviewAnalysis, review_analyzer
+from app.nlp.llm import llm_classifier
 from app.scoring.wilson import calculate_confidence_score
-from app.util.distance import calculate_distance_miles
+from app.util.distance import points_within_radius
 from app.util.cuisine import cuisine_mapper
+from app.util.refresh import BackgroundRefresher
 from app.core.config import settings
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+YELP_SEARCH_LIMIT = 50
+
+# Results kept when a cuisine search matches nothing
+CUISINE_FALLBACK_RESULTS = 5
+
+# Stored places just past their TTL are served while one background task refreshes each
+stored_place_refresher = BackgroundRefresher("stored_places")
 
 @router.post("/search", response_model=SearchResponse)
 async def search_restaurants(
@@ -35,133 +57,27 @@ async def search_restaurants(
         Search results with gluten safety analysis
     """
     start_time = time.time()
+    use_mock = mock or settings.MOCK_MODE_ENABLED
     
     try:
-        # Geocode the search location
-        coords = await geocoding_provider.geocode_address(request.query)
-        if not coords:
-            raise HTTPException(status_code=400, detail="Could not geocode the provided address")
-        
-        lat, lng = coords
-        center = Coordinates(lat=lat, lng=lng)
+        center = await _geocode_center(request)
+        results = _cached_results(request, center, use_mock)
         
-        # Convert radius from miles to meters for Yelp API
-        radius_meters = int(request.radiusMiles * 1609.34)
-        
-        # Get cuisine search terms
-        search_term = None
-        if request.cuisine:
-            search_term = cuisine_mapper.get_primary_search_term(request.cuisine)
-        
-        # Search for businesses
-        if mock or settings.MOCK_MODE_ENABLED:
-            businesses = yelp_provider._mock_search_businesses(lat, lng, search_term)
-        else:
-            businesses = await yelp_provider.search_businesses(
-                latitude=lat,
-                longitude=lng,
-                radius_meters=radius_meters,
-                term=search_term,
-                limit=50
-            )
-        
-        results = []
-        
-        for business in businesses:
-            # Calculate distance
-            distance_miles = calculate_distance_miles(
-                lat, lng,
-                business["coordinates"]["latitude"],
-                business["coordinates"]["longitude"]
-            )
-            
-            # Skip if outside radius
-            if distance_miles > request.radiusMiles:
-                continue
-            
-            # Get reviews for gluten analysis
-            if mock or settings.MOCK_MODE_ENABLED:
-                reviews = yelp_provider._mock_business_reviews(business["id"])
-            else:
-                reviews = await yelp_provider.get_business_reviews(business["id"])
+        if results is None:
+            candidates, exhaustive, fallback = await _find_candidates(request, center, use_mock, db)
+            stored = await _load_stored(db, candidates, use_mock)
             
-            # Analyze reviews for gluten safety
-            gluten_reviews = []
-            positive_count = 0
-            negative_count = 0
+            # Fetch and score concurrently, keeping results in business order
+            results = [None] * len(candidates)
+            async for index, result in _score_businesses(candidates, use_mock, stored):
+                results[index] = result
             
-            for review in reviews:
-                review_text = review.get("text", "")
-                
-                # Check if review contains gluten-related keywords
-                if gluten_detector.has_gluten_keywords(review_text):
-                    gluten_reviews.append(review)
-                    
-                    # Analyze sentiment
-                    sentiment = sentiment_analyzer.analyze_sentiment(review_text)
-                    if sentiment == "positive":
-                        positive_count += 1
-                    elif sentiment == "negative":
-                        negative_count += 1
+            if fallback:
+                candidates, results = _top_ranked(candidates, results, CUISINE_FALLBACK_RESULTS)
             
-            # Calculate confidence score
-            total_gluten_reviews = len(gluten_reviews)
-            confidence = calculate_confidence_score(
-                positive_count, negative_count, total_gluten_reviews
-            )
-            
-            # Generate summary from gluten reviews
-            summary = _generate_gluten_summary(gluten_reviews)
-            
-            # Create links
-            links = RestaurantLinks(
-                provider=business.get("url", ""),
-                maps=f"https://maps.google.com/?q={business['coordinates']['latitude']},{business['coordinates']['longitude']}"
-            )
-            
-            # Create result
-            result = SearchResult(
-                placeId=business["id"],
-                name=business["name"],
-                distanceMiles=round(distance_miles, 1),
-                confidence=int(confidence),
-                glutenReviewCount=total_gluten_reviews,
-                positiveGlutenReviews=positive_count,
-                negativeGlutenReviews=negative_count,
-                summary=summary,
-                address=business["location"].get("address1", ""),
-                rating=business.get("rating"),
-                userRatingsTotal=business.get("review_count"),
-                links=links
-            )
-            
-            results.append(result)
+            _cache_results(request, center, candidates, results, exhaustive, use_mock)
         
-        # Sort by confidence (descending) then distance (ascending)
-        results.sort(key=lambda x: (-x.confidence, x.distanceMiles))
-        
-        # Apply cuisine filter if specified
-        if request.cuisine:
-            filtered_results = []
-            for result in results:
-                # Get business details to check categories
-                if mock or settings.MOCK_MODE_ENABLED:
-                    business_details = yelp_provider._mock_business_details(result.placeId)
-                else:
-                    business_details = await yelp_provider.get_business_details(result.placeId)
-                
-                if business_details:
-                    categories = [cat["alias"] for cat in business_details.get("categories", [])]
-                    if cuisine_mapper.is_cuisine_match(
-                        result.name, categories, request.cuisine
-                    ):
-                        filtered_results.append(result)
-            
-            # If no strong matches, return top results with a flag
-            if not filtered_results and results:
-                filtered_results = results[:5]  # Return top 5 anyway
-            
-            results = filtered_results
+        results = _rank_results(results)
         
         search_time = time.time() - start_time
         
@@ -173,8 +89,101 @@ async def search_restaurants(
             searchTime=round(search_time, 2)
         )
         
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Search unavailable: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+@router.post("/search/stream")
+async def stream_search_restaurants(
+    request: SearchRequest,
+    http_request: Request,
+    mock: bool = Query(False, description="Use mock data for testing"),
+    format: Optional[str] = Query(None, pattern="^(ndjson|sse)$", description="Stream format: ndjson or sse"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search for gluten-friendly restaurants, streaming results as they are scored.
+    
+    Each scored result is sent as a ``result`` frame in completion order. The
+    stream ends with a ``complete`` frame holding the final sorted order of
+    place IDs, the search center and the search time. Frames are NDJSON by
+    default, or Server-Sent Events when ``format=sse`` or the client accepts
+    ``text/event-stream``.
+    
+    Args:
+        request: Search parameters
+        http_request: Raw request, used for content negotiation
+        mock: Use mock data (for development)
+        format: Stream format override
+        db: Database session
+        
+    Returns:
+        Streaming response of search frames
+    """
+    start_time = time.time()
+    use_mock = mock or settings.MOCK_MODE_ENABLED
+    
+    try:
+        center = await _geocode_center(request)
+        cached = _cached_results(request, center, use_mock)
+        if cached is None:
+            candidates, exhaustive, fallback = await _find_candidates(request, center, use_mock, db)
+            stored = await _load_stored(db, candidates, use_mock)
+    except HTTPException:
+        raise
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Search unavailable: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+    
+    use_sse = format == "sse" or (
+        format is None and "text/event-stream" in http_request.headers.get("accept", "")
+    )
+    
+    async def frames():
+        try:
+            if cached is not None:
+                results = cached
+                for result in results:
+                    yield _encode_frame("result", result.model_dump(mode="json"), use_sse)
+            else:
+                scored = candidates
+                results = [None] * len(scored)
+                async for index, result in _score_businesses(scored, use_mock, stored):
+                    results[index] = result
+                    if not fallback:
+                        yield _encode_frame("result", result.model_dump(mode="json"), use_sse)
+                
+                # Fallback results are only known once every candidate is scored
+                if fallback:
+                    scored, results = _top_ranked(scored, results, CUISINE_FALLBACK_RESULTS)
+                    for result in results:
+                        yield _encode_frame("result", result.model_dump(mode="json"), use_sse)
+                
+                _cache_results(request, center, scored, results, exhaustive, use_mock)
+            
+            results = _rank_results(results)
+            
+            complete = SearchStreamComplete(
+                center=center,
+                order=[result.placeId for result in results],
+                totalResults=len(results),
+                searchTime=round(time.time() - start_time, 2)
+            )
+            yield _encode_frame("complete", complete.model_dump(mode="json"), use_sse)
+            
+        except Exception as e:
+            yield _encode_frame("error", {"detail": f"Search failed: {str(e)}"}, use_sse)
+    
+    if use_sse:
+        return StreamingResponse(
+            frames(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
 
 @router.get("/places/{place_id}", response_model=PlaceDetailResponse)
 async def get_place_details(
@@ -193,9 +202,18 @@ async def get_place_details(
     Returns:
         Place details with gluten analysis
     """
+    use_mock = mock or settings.MOCK_MODE_ENABLED
+    
     try:
+        # Serve a freshly stored place without calling Yelp
+        stored = await _load_stored_detail(db, place_id, use_mock)
+        if stored is not None:
+            if is_stale(stored[0], settings.CACHE_TTL_SECONDS):
+                stored_place_refresher.schedule(place_id, lambda: _refresh_stored_place(place_id))
+            return await _stored_place_detail(*stored)
+        
         # Get business details
-        if mock or settings.MOCK_MODE_ENABLED:
+        if use_mock:
             business = yelp_provider._mock_business_details(place_id)
         else:
             business = await yelp_provider.get_business_details(place_id)
@@ -204,36 +222,27 @@ async def get_place_details(
             raise HTTPException(status_code=404, detail="Place not found")
         
         # Get reviews
-        if mock or settings.MOCK_MODE_ENABLED:
+        if use_mock:
             reviews = yelp_provider._mock_business_reviews(place_id)
         else:
             reviews = await yelp_provider.get_business_reviews(place_id)
         
-        # Analyze gluten-related reviews
-        gluten_snippets = []
-        positive_count = 0
-        negative_count = 0
-        total_gluten_reviews = 0
+        # Analyze each review once and reuse the result for counting and snippets
+        deadline = asyncio.get_running_loop().time() + settings.LLM_DEADLINE_SECONDS
+        analyses = await _analyze_reviews(reviews, deadline)
+        positive_count, negative_count, total_gluten_reviews = _count_sentiments(analyses)
         
-        for review in reviews:
-            review_text = review.get("text", "")
-            
-            if gluten_detector.has_gluten_keywords(review_text):
-                total_gluten_reviews += 1
-                sentiment = sentiment_analyzer.analyze_sentiment(review_text)
-                
-                if sentiment == "positive":
-                    positive_count += 1
-                elif sentiment == "negative":
-                    negative_count += 1
-                
-                # Create snippet (truncate if too long)
-                snippet_text = review_text[:200] + "..." if len(review_text) > 200 else review_text
-                
+        # Keep the stored row stale rather than marking a failed fetch as fresh
+        if persistence_writer is not None and not use_mock and reviews:
+            persistence_writer.enqueue(business, reviews, analyses)
+        
+        gluten_snippets = []
+        for review, analysis in zip(reviews, analyses):
+            if analysis.is_gluten_related:
                 snippet = GlutenSnippet(
-                    text=snippet_text,
+                    text=_make_snippet(review.get("text", ""), analysis),
                     rating=review.get("rating", 0),
-                    sentiment=sentiment,
+                    sentiment=analysis.sentiment,
                     publishedAt=None  # Could parse from review data if available
                 )
                 gluten_snippets.append(snippet)
@@ -243,71 +252,601 @@ async def get_place_details(
             positive_count, negative_count, total_gluten_reviews
         )
         
-        # Create gluten signal data
-        gluten_signal = {
-            "confidence": int(confidence),
-            "glutenReviewCount": total_gluten_reviews,
-            "positiveGlutenReviews": positive_count,
-            "negativeGlutenReviews": negative_count,
-            "positivityRate": positive_count / max(1, positive_count + negative_count)
-        }
-        
-        # Create place detail
-        place = PlaceDetail(
-            id=business["id"],
-            name=business["name"],
-            address=business["location"].get("address1", ""),
-            city=business["location"].get("city"),
-            state=business["location"].get("state"),
-            country=business["location"].get("country"),
-            lat=business["coordinates"]["latitude"],
-            lng=business["coordinates"]["longitude"],
-            rating=business.get("rating"),
-            userRatingsTotal=business.get("review_count"),
-            phone=business.get("phone"),
-            website=business.get("url"),
-            price=business.get("price"),
-            categories=business.get("categories"),
-            hours=None,  # Could be added if available
-            photos=None   # Could be added if available
+        return _place_detail_response(
+            business, confidence, positive_count, negative_count, total_gluten_reviews, gluten_snippets
         )
         
-        # Create links
-        links = {
-            "provider": business.get("url", ""),
-            "maps": f"https://maps.google.com/?q={business['coordinates']['latitude']},{business['coordinates']['longitude']}"
-        }
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Place details unavailable: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get place details: {str(e)}")
+
+def _place_detail_response(
+    business: Dict[str, Any],
+    confidence: float,
+    positive_count: int,
+    negative_count: int,
+    total_gluten_reviews: int,
+    gluten_snippets: List[GlutenSnippet],
+    served_from: str = "live"
+) -> PlaceDetailResponse:
+    """Build a place detail response from a business payload and its gluten counts."""
+    # Create gluten signal data
+    gluten_signal = {
+        "confidence": int(confidence),
+        "glutenReviewCount": total_gluten_reviews,
+        "positiveGlutenReviews": positive_count,
+        "negativeGlutenReviews": negative_count,
+        "positivityRate": positive_count / max(1, positive_count + negative_count)
+    }
+    
+    # Create place detail
+    place = PlaceDetail(
+        id=business["id"],
+        name=business["name"],
+        address=business["location"].get("address1", ""),
+        city=business["location"].get("city"),
+        state=business["location"].get("state"),
+        country=business["location"].get("country"),
+        lat=business["coordinates"]["latitude"],
+        lng=business["coordinates"]["longitude"],
+        rating=business.get("rating"),
+        userRatingsTotal=business.get("review_count"),
+        phone=business.get("phone"),
+        website=business.get("url"),
+        price=business.get("price"),
+        categories=business.get("categories"),
+        hours=None,  # Could be added if available
+        photos=None   # Could be added if available
+    )
+    
+    # Create links
+    links = {
+        "provider": business.get("url") or "",
+        "maps": f"https://maps.google.com/?q={business['coordinates']['latitude']},{business['coordinates']['longitude']}"
+    }
+    
+    return PlaceDetailResponse(
+        place=place,
+        glutenSignal=gluten_signal,
+        glutenSnippets=gluten_snippets[:10],  # Limit to top 10 snippets
+        links=links,
+        servedFrom=served_from
+    )
+
+def _reads_from_storage(use_mock: bool) -> bool:
+    """Whether stored places may answer a request (they only exist when persistence is on)."""
+    return not use_mock and persistence_writer is not None
+
+async def _load_stored(
+    db: AsyncSession,
+    candidates: List[Tuple[Dict[str, Any], float]],
+    use_mock: bool
+) -> Dict[str, StoredPlace]:
+    """
+    Load fresh stored signals for search candidates in one query.
+    
+    Places inside CACHE_STALE_GRACE_SECONDS past the TTL are included; they
+    are refreshed in the background when served.
+    
+    Args:
+        db: Database session
+        candidates: List of (business, distance_miles) pairs
+        use_mock: Mock requests never read storage
         
-        return PlaceDetailResponse(
-            place=place,
-            glutenSignal=gluten_signal,
-            glutenSnippets=gluten_snippets[:10],  # Limit to top 10 snippets
-            links=links
+    Returns:
+        Dict of business ID to (place, signal); empty if storage is unavailable
+    """
+    if not _reads_from_storage(use_mock) or not candidates:
+        return {}
+    
+    try:
+        return await fresh_places(
+            db,
+            [business["id"] for business, _ in candidates],
+            settings.CACHE_TTL_SECONDS,
+            settings.CACHE_STALE_GRACE_SECONDS
         )
-        
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get place details: {str(e)}")
+        logger.warning("Stored place lookup failed, serving live data: %s", e)
+        return {}
+
+async def _load_stored_detail(db: AsyncSession, place_id: str, use_mock: bool):
+    """Load a fresh stored place with its signal and gluten reviews, or None."""
+    if not _reads_from_storage(use_mock):
+        return None
+    
+    try:
+        return await fresh_place_detail(
+            db, place_id, settings.CACHE_TTL_SECONDS, settings.CACHE_STALE_GRACE_SECONDS
+        )
+    except Exception as e:
+        logger.warning("Stored place lookup failed for %s, serving live data: %s", place_id, e)
+        return None
 
-def _generate_gluten_summary(reviews: list) -> str:
-    """Generate a summary of gluten-related reviews."""
+async def _refresh_stored_place(place_id: str, business: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Fetch a stored place's reviews again at background priority and queue them for storage.
+    
+    Args:
+        place_id: Yelp business ID
+        business: Business payload, fetched again if not given
+    """
+    if business is None:
+        business = await yelp_provider.get_business_details(place_id, priority=Priority.BACKGROUND)
+        if not business:
+            return
+    
+    reviews = await yelp_provider.get_business_reviews(place_id, priority=Priority.BACKGROUND)
     if not reviews:
-        return "No gluten-related reviews found."
+        # Keep the stored row stale rather than marking a failed fetch as fresh
+        return
+    
+    analyses = await _analyze_reviews(reviews)
+    persistence_writer.enqueue(business, reviews, analyses)
+
+async def _stored_place_detail(place, signal, reviews) -> PlaceDetailResponse:
+    """Build a place detail response from stored rows."""
+    # Snippet windows need keyword offsets, which the analysis cache usually
+    # still holds from when the reviews were stored
+    texts = [review.text or "" for review in reviews]
+    analyses = await review_analyzer.analyze_batch(texts)
+    gluten_snippets = [
+        GlutenSnippet(
+            text=_make_snippet(text, analysis),
+            rating=review.rating or 0,
+            sentiment=review.gluten_sentiment or "neutral",
+            publishedAt=review.published_at
+        )
+        for review, text, analysis in zip(reviews, texts, analyses)
+    ]
     
+    return _place_detail_response(
+        business_from_place(place),
+        signal.confidence or 0,
+        signal.positive_gluten_reviews or 0,
+        signal.negative_gluten_reviews or 0,
+        signal.gluten_review_count or 0,
+        gluten_snippets,
+        served_from="storage"
+    )
+
+async def _geocode_center(request: SearchRequest) -> Coordinates:
+    """Geocode the search location, rejecting addresses that can't be resolved."""
+    coords = await geocoding_provider.geocode_address(request.query)
+    if not coords:
+        raise HTTPException(status_code=400, detail="Could not geocode the provided address")
+    
+    lat, lng = coords
+    return Coordinates(lat=lat, lng=lng)
+
+def _search_cache_key(request: SearchRequest) -> str:
+    return (request.cuisine or "").strip().lower()
+
+def _cached_results(
+    request: SearchRequest,
+    center: Coordinates,
+    use_mock: bool
+) -> Optional[List[SearchResult]]:
+    """
+    Answer a search from the search result cache when a recent search contains it.
+    
+    Args:
+        request: Search parameters
+        center: Geocoded search center
+        use_mock: Mock searches are never cached
+        
+    Returns:
+        Results with distances from this center, or None on a miss
+    """
+    if use_mock or search_result_cache is None:
+        return None
+    
+    matches = search_result_cache.get(center.lat, center.lng, request.radiusMiles, _search_cache_key(request))
+    if matches is None:
+        return None
+    
+    return [
+        result.model_copy(update={"distanceMiles": round(distance_miles, 1)})
+        for result, distance_miles in matches
+    ]
+
+def _cache_results(
+    request: SearchRequest,
+    center: Coordinates,
+    candidates: List[Tuple[Dict[str, Any], float]],
+    results: List[SearchResult],
+    complete: bool,
+    use_mock: bool
+) -> None:
+    """Store a finished search's results with their coordinates in the search result cache."""
+    if use_mock or search_result_cache is None:
+        return
+    
+    search_result_cache.put(
+        center.lat,
+        center.lng,
+        request.radiusMiles,
+        _search_cache_key(request),
+        [
+            (result, business["coordinates"]["latitude"], business["coordinates"]["longitude"])
+            for (business, _), result in zip(candidates, results)
+        ],
+        complete
+    )
+
+async def _find_candidates(
+    request: SearchRequest,
+    center: Coordinates,
+    use_mock: bool,
+    db: Optional[AsyncSession] = None
+) -> Tuple[List[Tuple[Dict[str, Any], float]], bool, bool]:
+    """
+    Find businesses within the radius of the search center.
+    
+    When Yelp's daily quota is exhausted, fresh stored places in the circle
+    are used instead and scored from their stored signals. When a cuisine
+    search matches none of the businesses in the circle, all of them are
+    returned with the fallback flag set, and callers keep only the
+    CUISINE_FALLBACK_RESULTS best-ranked once they are scored.
+    
+    Args:
+        request: Search parameters
+        center: Geocoded search center
+        use_mock: Use mock data instead of the Yelp API
+        db: Database session for the stored place fallback
+        
+    Returns:
+        Tuple of (list of (business, distance_miles) pairs, whether every
+        matching business in the circle is included, whether the cuisine
+        fallback is in use)
+    """
+    lat, lng = center.lat, center.lng
+    
+    # Convert radius from miles to meters for Yelp API
+    radius_meters = int(request.radiusMiles * 1609.34)
+    
+    # Get cuisine search terms and categories
+    search_term = None
+    categories = []
+    if request.cuisine:
+        search_term = cuisine_mapper.get_primary_search_term(request.cuisine)
+        categories = cuisine_mapper.get_cuisine_categories(request.cuisine)
+    
+    # Search for businesses, letting Yelp filter by category when we know it
+    if use_mock:
+        businesses = yelp_provider._mock_search_businesses(lat, lng, search_term)
+        candidates = _within_radius(businesses, lat, lng, request.radiusMiles)
+        complete = True
+    else:
+        term = None if categories else search_term
+        query_key = ",".join(sorted(categories)) if categories else f"term:{term or ''}"
+        
+        candidates = None
+        if place_index is not None:
+            candidates = place_index.covered_businesses(lat, lng, request.radiusMiles, query_key)
+            # The index only answers ground a search covered, so fewer places
+            # than one page of results means none were cut off
+            complete = candidates is not None and len(candidates) < YELP_SEARCH_LIMIT
+        
+        if candidates is None:
+            try:
+                businesses = await yelp_provider.search_businesses(
+                    latitude=lat,
+                    longitude=lng,
+                    radius_meters=radius_meters,
+                    term=term,
+                    categories=categories or None,
+                    limit=YELP_SEARCH_LIMIT
+                )
+            except QuotaExceededError:
+                candidates = await _stored_candidates(db, lat, lng, request.radiusMiles)
+                if not candidates:
+                    raise
+                # Stored places are only those some earlier search happened to return
+                complete = False
+            else:
+                if place_index is not None:
+                    place_index.record_search(
+                        lat, lng, request.radiusMiles, query_key, businesses, YELP_SEARCH_LIMIT
+                    )
+                candidates = _within_radius(businesses, lat, lng, request.radiusMiles)
+                complete = len(businesses) < YELP_SEARCH_LIMIT
+    
+    # Apply cuisine filter on the search payload's categories so that
+    # filtered-out businesses never have their reviews fetched
+    fallback = False
+    if request.cuisine:
+        matching = [
+            (business, distance_miles) for business, distance_miles in candidates
+            if cuisine_mapper.is_cuisine_match(
+                business["name"],
+                [cat["alias"] for cat in business.get("categories", [])],
+                request.cuisine
+            )
+        ]
+        
+        # If no strong matches, score everything and return the top results anyway
+        fallback = not matching and bool(candidates)
+        complete = complete and not fallback
+        candidates = matching or candidates
+    
+    max_fetches = max(0, settings.SEARCH_MAX_REVIEW_FETCHES)
+    return candidates[:max_fetches], complete and len(candidates) <= max_fetches, fallback
+
+async def _stored_candidates(
+    db: Optional[AsyncSession],
+    lat: float,
+    lng: float,
+    radius_miles: float
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Find fresh stored places with a signal inside the circle, nearest first.
+    
+    Args:
+        db: Database session
+        lat, lng: Search center
+        radius_miles: Search radius in miles
+    
+    Returns:
+        List of (business, distance_miles) pairs; empty if storage is unavailable
+    """
+    if db is None or not _reads_from_storage(False):
+        return []
+    
+    try:
+        matches = await places_within_radius(
+            db, lat, lng, radius_miles,
+            limit=YELP_SEARCH_LIMIT,
+            fetched_since=freshness_cutoff(settings.CACHE_TTL_SECONDS + settings.CACHE_STALE_GRACE_SECONDS)
+        )
+    except Exception as e:
+        logger.warning("Stored place radius lookup failed: %s", e)
+        return []
+    
+    return [(business_from_place(place), distance_miles) for place, _, distance_miles in matches]
+
+def _within_radius(
+    businesses: List[Dict[str, Any]],
+    lat: float,
+    lng: float,
+    radius_miles: float
+) -> List[Tuple[Dict[str, Any], float]]:
+    """Pair businesses with their distance, discarding out-of-radius ones."""
+    indices, distances = points_within_radius(
+        lat, lng,
+        [business["coordinates"]["latitude"] for business in businesses],
+        [business["coordinates"]["longitude"] for business in businesses],
+        radius_miles
+    )
+    return [
+        (businesses[index], float(distance_miles))
+        for index, distance_miles in zip(indices, distances)
+    ]
+
+async def _score_businesses(
+    candidates: List[Tuple[Dict[str, Any], float]],
+    use_mock: bool,
+    stored: Optional[Dict[str, StoredPlace]] = None
+) -> AsyncIterator[Tuple[int, SearchResult]]:
+    """
+    Fetch reviews and score businesses concurrently.
+    
+    Review fetches are bounded by SEARCH_REVIEW_CONCURRENCY. Results are
+    yielded as soon as each business is scored, so callers receive them in
+    completion order together with their index in ``candidates``. A business
+    whose review fetch fails is scored as having no reviews. Businesses
+    with a fresh stored signal are scored from it without fetching reviews;
+    stale ones are also refreshed in the background.
+    
+    Args:
+        candidates: List of (business, distance_miles) pairs within the radius
+        use_mock: Use mock reviews instead of the Yelp API
+        stored: Fresh stored (place, signal) pairs by business ID
+        
+    Yields:
+        Tuples of (candidate index, search result)
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.SEARCH_REVIEW_CONCURRENCY))
+    
+    # One LLM budget for the whole search, not per business
+    deadline = asyncio.get_running_loop().time() + settings.LLM_DEADLINE_SECONDS
+    
+    stored = stored or {}
+    
+    async def score(index: int, business: Dict[str, Any], distance_miles: float):
+        if business["id"] in stored:
+            place, signal = stored[business["id"]]
+            if is_stale(place, settings.CACHE_TTL_SECONDS):
+                stored_place_refresher.schedule(
+                    business["id"], lambda: _refresh_stored_place(business["id"], business)
+                )
+            return index, _search_result(
+                business,
+                distance_miles,
+                signal.confidence or 0,
+                signal.positive_gluten_reviews or 0,
+                signal.negative_gluten_reviews or 0,
+                signal.gluten_review_count or 0,
+                served_from="storage"
+            )
+        
+        async with semaphore:
+            if use_mock:
+                reviews = yelp_provider._mock_business_reviews(business["id"])
+            else:
+                try:
+                    reviews = await yelp_provider.get_business_reviews(business["id"])
+                except QuotaExceededError:
+                    raise
+                except Exception as e:
+                    # One failed fetch shouldn't fail the search; score it as having no reviews
+                    logger.warning("Review fetch failed for %s: %s", business["id"], e)
+                    reviews = []
+        
+        return index, await _build_search_result(
+            business, distance_miles, reviews, deadline, persist=not use_mock
+        )
+    
+    tasks = [
+        asyncio.create_task(score(index, business, distance_miles))
+        for index, (business, distance_miles) in enumerate(candidates)
+    ]
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Don't leave fetches running if the consumer stops early
+        for task in tasks:
+            task.cancel()
+
+def _rank_results(results: List[SearchResult]) -> List[SearchResult]:
+    """Sort results by confidence (descending) then distance (ascending)."""
+    return sorted(results, key=lambda x: (-x.confidence, x.distanceMiles))
+
+def _top_ranked(
+    candidates: List[Tuple[Dict[str, Any], float]],
+    results: List[SearchResult],
+    limit: int
+) -> Tuple[List[Tuple[Dict[str, Any], float]], List[SearchResult]]:
+    """Keep the best-ranked results, with their candidates, in business order."""
+    ranked = sorted(range(len(results)), key=lambda i: (-results[i].confidence, results[i].distanceMiles))
+    kept = sorted(ranked[:limit])
+    return [candidates[i] for i in kept], [results[i] for i in kept]
+
+async def _build_search_result(
+    business: Dict[str, Any],
+    distance_miles: float,
+    reviews: List[Dict[str, Any]],
+    deadline: float,
+    persist: bool = False
+) -> SearchResult:
+    """Analyze a business's reviews and build its search result, optionally queueing them for storage."""
+    # Analyze each review once for gluten keywords and sentiment
+    analyses = await _analyze_reviews(reviews, deadline)
+    positive_count, negative_count, total_gluten_reviews = _count_sentiments(analyses)
+    
+    # Keep the stored row stale rather than marking a failed fetch as fresh
+    if persist and persistence_writer is not None and reviews:
+        persistence_writer.enqueue(business, reviews, analyses)
+    
+    # Calculate confidence score
+    confidence = calculate_confidence_score(
+        positive_count, negative_count, total_gluten_reviews
+    )
+    
+    return _search_result(
+        business, distance_miles, confidence, positive_count, negative_count, total_gluten_reviews
+    )
+
+def _search_result(
+    business: Dict[str, Any],
+    distance_miles: float,
+    confidence: float,
+    positive_count: int,
+    negative_count: int,
+    total_gluten_reviews: int,
+    served_from: str = "live"
+) -> SearchResult:
+    """Build a search result from a business payload and its gluten counts."""
+    # Generate summary from gluten review counts
+    summary = _generate_gluten_summary(positive_count, negative_count, total_gluten_reviews)
+    
+    # Create links
+    links = RestaurantLinks(
+        provider=business.get("url") or "",
+        maps=f"https://maps.google.com/?q={business['coordinates']['latitude']},{business['coordinates']['longitude']}"
+    )
+    
+    return SearchResult(
+        placeId=business["id"],
+        name=business["name"],
+        distanceMiles=round(distance_miles, 1),
+        confidence=int(confidence),
+        glutenReviewCount=total_gluten_reviews,
+        positiveGlutenReviews=positive_count,
+        negativeGlutenReviews=negative_count,
+        summary=summary,
+        address=business["location"].get("address1", ""),
+        rating=business.get("rating"),
+        userRatingsTotal=business.get("review_count"),
+        links=links,
+        servedFrom=served_from
+    )
+
+def _encode_frame(event: str, data: Dict[str, Any], use_sse: bool) -> str:
+    """Encode a streaming search frame as an SSE event or an NDJSON line."""
+    payload = json.dumps(data)
+    if use_sse:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+async def _analyze_reviews(
+    reviews: List[Dict[str, Any]],
+    deadline: Optional[float] = None
+) -> List[ReviewAnalysis]:
+    """
+    Analyze reviews with the rule-based analyzer, then let the LLM settle ambiguous ones.
+    
+    Args:
+        reviews: Provider reviews
+        deadline: Event loop time after which rule-based verdicts are kept (None waits for the LLM)
+        
+    Returns:
+        Analyses in review order
+    """
+    texts = [review.get("text", "") for review in reviews]
+    analyses = await review_analyzer.analyze_batch(texts)
+    return await llm_classifier.refine(texts, analyses, deadline)
+
+def _count_sentiments(analyses: List[ReviewAnalysis]) -> Tuple[int, int, int]:
+    """
+    Count gluten-related reviews by sentiment.
+    
+    Args:
+        analyses: Review analyses
+        
+    Returns:
+        Tuple of (positive, negative, total gluten-related reviews)
+    """
     positive_count = 0
     negative_count = 0
+    total = 0
     
-    for review in reviews:
-        sentiment = sentiment_analyzer.analyze_sentiment(review.get("text", ""))
-        if sentiment == "positive":
+    for analysis in analyses:
+        if not analysis.is_gluten_related:
+            continue
+        
+        total += 1
+        if analysis.sentiment == "positive":
             positive_count += 1
-        elif sentiment == "negative":
+        elif analysis.sentiment == "negative":
             negative_count += 1
     
-    total = len(reviews)
+    return positive_count, negative_count, total
+
+def _make_snippet(text: str, analysis: ReviewAnalysis, length: int = 200) -> str:
+    """Cut a snippet of the review, moving the window to the first keyword if needed."""
+    if len(text) <= length:
+        return text
+    
+    first = analysis.matches[0] if analysis.matches else None
+    if first is None or first.end <= length:
+        return text[:length] + "..."
+    
+    start = max(0, first.start - length // 4)
+    end = start + length
+    return "..." + text[start:end] + ("..." if end < len(text) else "")
+
+def _generate_gluten_summary(positive_count: int, negative_count: int, total: int) -> str:
+    """Generate a summary of gluten-related review counts."""
+    if total == 0:
+        return "No gluten-related reviews found."
     
     if positive_count > negative_count:
         return f"Mostly positive gluten reviews ({positive_count}/{total} positive)"
     elif negative_count > positive_count:
         return f"Mostly negative gluten reviews ({negative_count}/{total} negative)"
     else:
-        return f"Mixed gluten reviews ({positive_count} positive, {negative_count} negative out of {total})" 
\ No newline at end of file
+        return f"Mixed gluten reviews ({positive_count} positive, {negative_count} negative out of {total})"
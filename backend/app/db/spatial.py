@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from app.core.config import settings
+from app.db.types import Geography
+from app.models.gluten_signal import GlutenSignal
+from app.models.place import Place
+from app.util.distance import get_bounding_box, points_within_radius
+
+METERS_PER_MILE = 1609.344
+
+PlaceMatch = Tuple[Place, Optional[GlutenSignal], float]
+
+def search_point(lat: float, lng: float):
+    """Build a geography point expression for the given coordinates."""
+    return cast(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326), Geography("Point", 4326))
+
+def spatial_query(
+    lat: float,
+    lng: float,
+    radius_miles: Optional[float] = None,
+    limit: Optional[int] = None,
+    fetched_since: Optional[datetime] = None
+) -> Select:
+    """
+    Build a query for stored places near a point, nearest first.
+    
+    Places are selected with ST_DWithin and ordered with the ``<->`` KNN
+    operator, both on the indexed ``places.location`` column, and come with
+    their gluten signal (if any) and distance in miles. Distances are on the
+    sphere, matching haversine_distance.
+    
+    Args:
+        lat, lng: Center coordinates
+        radius_miles: Only include places within this radius
+        limit: Maximum number of places
+        fetched_since: Only include scored places fetched at or after this time
+    
+    Returns:
+        Select yielding (Place, GlutenSignal or None, distance_miles) rows
+    """
+    point = search_point(lat, lng)
+    distance_miles = (func.ST_Distance(Place.location, point, False) / METERS_PER_MILE).label("distance_miles")
+    
+    query = (
+        select(Place, GlutenSignal, distance_miles)
+        .outerjoin(GlutenSignal, GlutenSignal.place_id == Place.id)
+        .order_by(Place.location.op("<->")(point))
+    )
+    if radius_miles is not None:
+        query = query.where(func.ST_DWithin(Place.location, point, radius_miles * METERS_PER_MILE, False))
+    if fetched_since is not None:
+        query = query.where(Place.last_fetched_at >= fetched_since, GlutenSignal.place_id.isnot(None))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+async def places_within_radius(
+    db: AsyncSession,
+    lat: float,
+    lng: float,
+    radius_miles: float,
+    limit: Optional[int] = None,
+    use_postgis: Optional[bool] = None,
+    fetched_since: Optional[datetime] = None
+) -> List[PlaceMatch]:
+    """
+    Find stored places within a radius, nearest first.
+    
+    Without PostGIS, rows in the bounding box are filtered by haversine
+    distance in Python.
+    
+    Args:
+        db: Database session
+        lat, lng: Center coordinates
+        radius_miles: Radius in miles
+        limit: Maximum number of places
+        use_postgis: Query the geography column (defaults to POSTGIS_ENABLED)
+        fetched_since: Only include scored places fetched at or after this time
+    
+    Returns:
+        List of (place, gluten signal or None, distance_miles)
+    """
+    if use_postgis is None:
+        use_postgis = settings.POSTGIS_ENABLED
+    
+    if use_postgis:
+        result = await db.execute(spatial_query(lat, lng, radius_miles, limit, fetched_since))
+        return [(place, signal, float(distance)) for place, signal, distance in result.all()]
+    
+    min_lat, max_lat, min_lon, max_lon = get_bounding_box(lat, lng, radius_miles)
+    query = (
+        select(Place, GlutenSignal)
+        .outerjoin(GlutenSignal, GlutenSignal.place_id == Place.id)
+        .where(and_(
+            Place.lat.between(min_lat, max_lat),
+            Place.lng.between(min_lon, max_lon)
+        ))
+    )
+    if fetched_since is not None:
+        query = query.where(Place.last_fetched_at >= fetched_since, GlutenSignal.place_id.isnot(None))
+    rows = (await db.execute(query)).all()
+    
+    indices, distances = points_within_radius(
+        lat, lng, [place.lat for place, _ in rows], [place.lng for place, _ in rows], radius_miles
+    )
+    matches = sorted(
+        ((rows[index][0], rows[index][1], float(distance)) for index, distance in zip(indices, distances)),
+        key=lambda match: match[2]
+    )
+    return matches[:limit] if limit is not None else matches
+
+async def nearest_places(
+    db: AsyncSession,
+    lat: float,
+    lng: float,
+    k: int,
+    max_radius_miles: Optional[float] = None
+) -> List[PlaceMatch]:
+    """
+    Find the k stored places nearest to a point with a KNN index scan.
+    
+    Args:
+        db: Database session
+        lat, lng: Center coordinates
+        k: Number of places
+        max_radius_miles: Optionally ignore places beyond this distance
+    
+    Returns:
+        List of (place, gluten signal or None, distance_miles), nearest first
+    """
+    result = await db.execute(spatial_query(lat, lng, max_radius_miles, k))
+    return [(place, signal, float(distance)) for place, signal, distance in result.all()]
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.gluten_signal import GlutenSignal
+from app.models.place import Place
+from app.models.review import Review
+
+StoredPlace = Tuple[Place, GlutenSignal]
+
+def freshness_cutoff(ttl_seconds: int, now: Optional[datetime] = None) -> datetime:
+    """Oldest last_fetched_at that still counts as fresh."""
+    return (now or datetime.now(timezone.utc)) - timedelta(seconds=ttl_seconds)
+
+def is_stale(place: Place, ttl_seconds: int, now: Optional[datetime] = None) -> bool:
+    """Whether a stored place was fetched longer ago than the TTL."""
+    return place.last_fetched_at is None or place.last_fetched_at < freshness_cutoff(ttl_seconds, now)
+
+async def fresh_places(
+    db: AsyncSession,
+    provider_ids: Iterable[str],
+    ttl_seconds: int,
+    grace_seconds: int = 0
+) -> Dict[str, StoredPlace]:
+    """
+    Load stored places and their signals fetched within the TTL.
+    
+    Places without a signal were never scored and are left out. Places up
+    to ``grace_seconds`` past the TTL are included too; callers serving
+    them should check is_stale() and refresh.
+    
+    Args:
+        db: Database session
+        provider_ids: Provider business IDs
+        ttl_seconds: Freshness window
+        grace_seconds: Extra age allowed for stale-while-revalidate
+    
+    Returns:
+        Dict of provider ID to (place, signal) for fresh places
+    """
+    provider_ids = list(provider_ids)
+    if not provider_ids:
+        return {}
+    
+    result = await db.execute(
+        select(Place, GlutenSignal)
+        .join(GlutenSignal, GlutenSignal.place_id == Place.id)
+        .where(
+            Place.provider_id.in_(provider_ids),
+            Place.last_fetched_at >= freshness_cutoff(ttl_seconds + grace_seconds)
+        )
+    )
+    return {place.provider_id: (place, signal) for place, signal in result.all()}
+
+async def fresh_place_detail(
+    db: AsyncSession,
+    provider_id: str,
+    ttl_seconds: int,
+    grace_seconds: int = 0,
+    snippet_limit: int = 10
+) -> Optional[Tuple[Place, GlutenSignal, List[Review]]]:
+    """
+    Load a fresh stored place with its signal and newest gluten-related reviews.
+    
+    Args:
+        db: Database session
+        provider_id: Provider business ID
+        ttl_seconds: Freshness window
+        grace_seconds: Extra age allowed for stale-while-revalidate
+        snippet_limit: Maximum number of reviews
+    
+    Returns:
+        Tuple of (place, signal, reviews), or None if missing or stale
+    """
+    stored = (await fresh_places(db, [provider_id], ttl_seconds, grace_seconds)).get(provider_id)
+    if stored is None:
+        return None
+    
+    place, signal = stored
+    result = await db.execute(
+        select(Review)
+        .where(Review.place_id == place.id, Review.is_gluten_related.is_(True))
+        .order_by(Review.published_at.desc().nulls_last())
+        .limit(snippet_limit)
+    )
+    return place, signal, list(result.scalars().all())
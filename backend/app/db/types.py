@@ -0,0 +1,13 @@
+from sqlalchemy.types import UserDefinedType
+
+class Geography(UserDefinedType):
+    """PostGIS geography column type (longitude/latitude on WGS 84)."""
+    
+    cache_ok = True
+    
+    def __init__(self, geometry_type: str = "Point", srid: int = 4326):
+        self.geometry_type = geometry_type
+        self.srid = srid
+    
+    def get_col_spec(self, **kw) -> str:
+        return f"geography({self.geometry_type}, {self.srid})"
@@ -0,0 +1,326 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.models.place import Place
+from app.models.review import Review
+from app.nlp.analysis import ReviewAnalysis
+from app.scoring.incremental import stamp_review_analysis, upsert_gluten_signals
+
+# Rows per INSERT, keeping bind parameters under the driver's 32767 limit
+INSERT_CHUNK_SIZE = 1000
+
+# Fields search payloads don't carry; an upsert from a search keeps stored values
+_DETAIL_FIELDS = ("phone", "hours", "photos")
+
+def parse_review_time(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a Yelp review timestamp ("YYYY-MM-DD HH:MM:SS").
+    
+    Args:
+        value: Provider timestamp
+    
+    Returns:
+        Timezone-aware datetime, or None if missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+def place_values(business: Dict[str, Any], fetched_at: datetime) -> Dict[str, Any]:
+    """
+    Map a Yelp business payload to ``places`` column values.
+    
+    Args:
+        business: Search or details payload
+        fetched_at: Time the payload was fetched
+    
+    Returns:
+        Column values keyed by column name
+    """
+    location = business.get("location") or {}
+    return {
+        "provider_id": business["id"],
+        "name": business["name"],
+        "lat": business["coordinates"]["latitude"],
+        "lng": business["coordinates"]["longitude"],
+        "address": location.get("address1"),
+        "city": location.get("city"),
+        "state": location.get("state"),
+        "country": location.get("country"),
+        "rating": business.get("rating"),
+        "user_ratings_total": business.get("review_count"),
+        "phone": business.get("phone") or None,
+        "website": business.get("url"),
+        "categories": business.get("categories"),
+        "price": business.get("price"),
+        "hours": business.get("hours"),
+        "photos": business.get("photos"),
+        "last_fetched_at": fetched_at
+    }
+
+def review_values(review: Dict[str, Any], place_id, analysis: ReviewAnalysis) -> Dict[str, Any]:
+    """
+    Map a Yelp review payload and its analysis to ``reviews`` column values.
+    
+    Args:
+        review: Provider review
+        place_id: Place primary key
+        analysis: Analysis of the review's text
+    
+    Returns:
+        Column values keyed by column name
+    """
+    stamped = stamp_review_analysis(Review(), analysis)
+    return {
+        "place_id": place_id,
+        "review_id": review["id"],
+        "rating": review.get("rating"),
+        "text": review.get("text"),
+        "published_at": parse_review_time(review.get("time_created")),
+        "raw": review,
+        "is_gluten_related": stamped.is_gluten_related,
+        "gluten_sentiment": stamped.gluten_sentiment
+    }
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+class PersistenceWriter:
+    """
+    Write-behind persistence of places, reviews and gluten signals.
+    
+    Routes enqueue what they fetched and analyzed without waiting. A
+    background task flushes the buffer when it reaches the batch size or
+    the flush interval passes: places are upserted by provider ID, reviews
+    are inserted once per review ID, and each place's signal is updated
+    from the reviews that were actually new. A failed flush puts its batch
+    back in the buffer for the next one, up to max_retries times.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 2.0,
+        max_pending: int = 20000,
+        max_retries: int = 3
+    ):
+        self._session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.max_retries = max(0, max_retries)
+        
+        self._places: Dict[str, Dict[str, Any]] = {}
+        self._reviews: Dict[str, Tuple[str, Dict[str, Any], ReviewAnalysis]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._failed_flushes = 0
+        
+        self.flushes = 0
+        self.places_written = 0
+        self.reviews_written = 0
+        self.signals_updated = 0
+        self.errors = 0
+        self.retried = 0
+        self.dropped = 0
+    
+    @property
+    def session_factory(self) -> Callable[[], Any]:
+        if self._session_factory is None:
+            from app.db.base import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+    
+    @property
+    def pending(self) -> int:
+        return len(self._places) + len(self._reviews)
+    
+    def enqueue(
+        self,
+        business: Dict[str, Any],
+        reviews: Iterable[Dict[str, Any]] = (),
+        analyses: Iterable[ReviewAnalysis] = ()
+    ) -> None:
+        """
+        Buffer a business and its analyzed reviews for the next flush.
+        
+        Args:
+            business: Yelp business payload
+            reviews: Provider reviews
+            analyses: Analyses in the same order as ``reviews``
+        """
+        if self.pending >= self.max_pending:
+            self.dropped += 1
+            return
+        
+        # A details payload enriches a search payload buffered earlier
+        self._places[business["id"]] = {**self._places.get(business["id"], {}), **business}
+        for review, analysis in zip(reviews, analyses):
+            if review.get("id"):
+                self._reviews[review["id"]] = (business["id"], review, analysis)
+        
+        if self.pending >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background task after a final flush."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+    
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+    
+    async def flush(self) -> int:
+        """
+        Write everything buffered so far in one transaction.
+        
+        A failed flush is logged and its batch put back in the buffer, behind
+        anything enqueued since, so the next flush retries it. After
+        max_retries failed flushes in a row the batch is dropped; the data is
+        fetched again on a later search.
+        
+        Returns:
+            Number of buffered items written
+        """
+        if not self.pending:
+            return 0
+        
+        places, self._places = self._places, {}
+        reviews, self._reviews = self._reviews, {}
+        
+        try:
+            async with self.session_factory() as db:
+                written = await self._write(db, places, reviews)
+                await db.commit()
+        except Exception as e:
+            self.errors += 1
+            self._failed_flushes += 1
+            print(f"Persistence flush failed for {len(places)} places and {len(reviews)} reviews: {e}")
+            self._requeue(places, reviews)
+            return 0
+        
+        self._failed_flushes = 0
+        self.flushes += 1
+        return written
+    
+    def _requeue(
+        self,
+        places: Dict[str, Dict[str, Any]],
+        reviews: Dict[str, Tuple[str, Dict[str, Any], ReviewAnalysis]]
+    ) -> None:
+        if self._failed_flushes > self.max_retries:
+            self._failed_flushes = 0
+            self.dropped += len(places)
+            return
+        
+        # Payloads enqueued since the failed flush are newer and win
+        self.retried += 1
+        for provider_id, business in places.items():
+            self._places[provider_id] = {**business, **self._places.get(provider_id, {})}
+        for review_id, entry in reviews.items():
+            self._reviews.setdefault(review_id, entry)
+    
+    async def _write(
+        self,
+        db,
+        places: Dict[str, Dict[str, Any]],
+        reviews: Dict[str, Tuple[str, Dict[str, Any], ReviewAnalysis]]
+    ) -> int:
+        fetched_at = datetime.now(timezone.utc)
+        
+        # Upsert places, keeping detail-only fields a search payload lacks
+        place_ids = {}
+        for chunk in _chunks([place_values(business, fetched_at) for business in places.values()], INSERT_CHUNK_SIZE):
+            statement = insert(Place).values(chunk)
+            updates = {
+                name: statement.excluded[name]
+                for name in chunk[0]
+                if name not in ("provider_id", *_DETAIL_FIELDS)
+            }
+            for name in _DETAIL_FIELDS:
+                updates[name] = func.coalesce(statement.excluded[name], getattr(Place, name))
+            statement = statement.on_conflict_do_update(
+                index_elements=["provider_id"], set_=updates
+            ).returning(Place.id, Place.provider_id)
+            
+            result = await db.execute(statement)
+            place_ids.update({provider_id: place_id for place_id, provider_id in result.all()})
+        self.places_written += len(places)
+        
+        # Insert reviews not seen before; RETURNING yields only the new ones
+        rows = [
+            review_values(review, place_ids[provider_id], analysis)
+            for provider_id, review, analysis in reviews.values()
+        ]
+        added = defaultdict(list)
+        for chunk in _chunks(rows, INSERT_CHUNK_SIZE):
+            statement = insert(Review).values(chunk).on_conflict_do_nothing(
+                index_elements=["review_id"]
+            ).returning(Review.review_id, Review.place_id)
+            
+            result = await db.execute(statement)
+            by_review_id = {row["review_id"]: row for row in chunk}
+            for review_id, place_id in result.all():
+                row = by_review_id[review_id]
+                added[place_id].append(Review(
+                    review_id=review_id,
+                    published_at=row["published_at"],
+                    is_gluten_related=row["is_gluten_related"],
+                    gluten_sentiment=row["gluten_sentiment"]
+                ))
+        self.reviews_written += sum(len(new_reviews) for new_reviews in added.values())
+        
+        # Counters are added in the database, so concurrent workers can't lose updates
+        self.signals_updated += await upsert_gluten_signals(db, added, fetched_at)
+        
+        return len(places) + len(reviews)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        return {
+            "running": self._task is not None,
+            "pending": self.pending,
+            "flushes": self.flushes,
+            "places_written": self.places_written,
+            "reviews_written": self.reviews_written,
+            "signals_updated": self.signals_updated,
+            "errors": self.errors,
+            "retried": self.retried,
+            "dropped": self.dropped
+        }
+
+# Global instance
+persistence_writer = PersistenceWriter(
+    batch_size=settings.PERSISTENCE_BATCH_SIZE,
+    flush_interval_seconds=settings.PERSISTENCE_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.PERSISTENCE_MAX_PENDING,
+    max_retries=settings.PERSISTENCE_MAX_RETRIES
+) if settings.PERSISTENCE_ENABLED else None
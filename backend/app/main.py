@@ -1,10 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import settings
-from app.api.routes import router as api_router
+from app.api.routes import router as api_router, stored_place_refresher
+from app.db.writer import persistence_writer
+from app.providers.http import http_clients
+from app.providers.ratelimit import rate_limiters
+from app.providers.yelp import yelp_provider
+from app.providers.geocode import geocoding_provider
+from app.providers.place_index import place_index
+from app.providers.search_cache import search_result_cache
+from app.nlp.analysis import review_analyzer
+from app.nlp.executor import analysis_executor
+from app.nlp.llm import llm_classifier
 
 # Configure logging
 logging.basicConfig(
@@ -12,13 +23,42 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open long-lived resources on startup and release them on shutdown."""
+    await http_clients.startup()
+    if place_index is not None and not settings.MOCK_MODE_ENABLED:
+        try:
+            await place_index.load_from_db()
+        except Exception as e:
+            print(f"Could not load the place index from the database: {e}")
+    if persistence_writer is not None:
+        await persistence_writer.start()
+    try:
+        yield
+    finally:
+        await yelp_provider.refresher.shutdown()
+        await stored_place_refresher.shutdown()
+        if persistence_writer is not None:
+            await persistence_writer.stop()
+        await http_clients.shutdown()
+        await rate_limiters.shutdown()
+        if yelp_provider.cache is not None:
+            yelp_provider.cache.close()
+        geocoding_provider.cache.close()
+        geocoding_provider.local.close()
+        if review_analyzer.cache is not None:
+            await review_analyzer.cache.aclose()
+        analysis_executor.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title="SafeBites API",
     description="API for finding gluten-friendly restaurants",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -54,6 +94,39 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "service": "safebites-api"}
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime statistics for upstream connection pools, rate limits and caches."""
+    caches = {
+        "geocode": geocoding_provider.cache.stats(),
+        "gazetteer": geocoding_provider.local.stats()
+    }
+    if review_analyzer.cache is not None:
+        caches["review_analysis"] = review_analyzer.cache.stats()
+    if yelp_provider.cache is not None:
+        caches["yelp_responses"] = yelp_provider.cache.stats()
+    if place_index is not None:
+        caches["place_index"] = place_index.stats()
+    if search_result_cache is not None:
+        caches["search_results"] = search_result_cache.stats()
+    
+    return {
+        "http": http_clients.stats(),
+        "rate_limits": rate_limiters.stats(),
+        "caches": caches,
+        "analysis_executor": analysis_executor.stats(),
+        "llm": llm_classifier.stats(),
+        "background_refresh": {
+            "yelp": yelp_provider.refresher.stats(),
+            "stored_places": stored_place_refresher.stats()
+        },
+        "single_flight": {
+            "opencage": geocoding_provider.flights.stats(),
+            "yelp": yelp_provider.flights.stats()
+        },
+        "persistence": persistence_writer.stats() if persistence_writer is not None else None
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
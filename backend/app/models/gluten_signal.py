@@ -18,6 +18,13 @@ class GlutenSignal(Base):
     confidence = Column(Float, default=0.0)
     last_scored_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Exponentially decayed counts as of decay_reference_at (see app.scoring.decay)
+    decayed_positive = Column(Float, default=0.0)
+    decayed_negative = Column(Float, default=0.0)
+    decayed_total = Column(Float, default=0.0)
+    decay_reference_at = Column(DateTime(timezone=True))
+    decayed_confidence = Column(Float, default=0.0)  # As of last_scored_at
+    
     # Relationship
     place = relationship("Place", back_populates="gluten_signal")
     
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Float, Integer, DateTime, Text, UniqueConstraint
+from sqlalchemy import Column, Computed, String, Float, Integer, DateTime, Text, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.db.base import Base
+from app.db.types import Geography
 import uuid
 
 class Place(Base):
@@ -15,6 +16,13 @@ class Place(Base):
     name = Column(String, nullable=False)
     lat = Column(Float, nullable=False)
     lng = Column(Float, nullable=False)
+    
+    # Generated from lat/lng so spatial queries can use the GIST index (see app.db.spatial)
+    location = deferred(Column(
+        Geography("Point", 4326),
+        Computed("ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography", persisted=True)
+    ))
+    
     address = Column(Text)
     city = Column(String)
     state = Column(String)
@@ -37,6 +45,7 @@ class Place(Base):
     
     __table_args__ = (
         UniqueConstraint('provider_id', name='uq_place_provider_id'),
+        Index('idx_places_location', 'location', postgresql_using='gist'),
     )
     
     def __repr__(self):
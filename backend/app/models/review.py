@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -18,8 +18,16 @@ class Review(Base):
     published_at = Column(DateTime(timezone=True))
     raw = Column(JSONB)  # Store complete review data from provider
     
+    # Analysis results, kept so signals can be updated without re-analyzing
+    is_gluten_related = Column(Boolean, default=False, nullable=False)
+    gluten_sentiment = Column(String)  # positive, negative or neutral; NULL if not gluten related
+    
     # Relationship
     place = relationship("Place", back_populates="reviews")
     
+    __table_args__ = (
+        UniqueConstraint('review_id', name='uq_review_review_id'),
+    )
+    
     def __repr__(self):
         return f"<Review(id={self.id}, place_id={self.place_id}, rating={self.rating})>" 
\ No newline at end of file
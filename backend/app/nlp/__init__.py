@@ -2,5 +2,6 @@
 
 from .keywords import gluten_detector
 from .sentiment import sentiment_analyzer
+from .analysis import ReviewAnalysis, review_analyzer
 
-__all__ = ['gluten_detector', 'sentiment_analyzer'] 
\ No newline at end of file
+__all__ = ['gluten_detector', 'sentiment_analyzer', 'ReviewAnalysis', 'review_analyzer']
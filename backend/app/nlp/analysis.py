@@ -0,0 +1,182 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.nlp.cache import AnalysisCache, RedisAnalysisStore
+from app.nlp.executor import AnalysisExecutor, analysis_executor
+from app.nlp.keywords import GlutenKeywordDetector, KeywordMatch, gluten_detector
+from app.nlp.sentiment import (
+    GlutenSentimentAnalyzer, IndicatorContribution, SentimentType, sentiment_analyzer
+)
+
+# Bump when the analysis logic changes in a way the lexicons don't capture
+ANALYSIS_FORMAT_VERSION = 1
+
+@dataclass(frozen=True)
+class ReviewAnalysis:
+    """Result of analyzing a single review for gluten safety."""
+    keywords: Tuple[str, ...]  # Unique matched keywords
+    matches: Tuple[KeywordMatch, ...]  # Every keyword occurrence with offsets
+    sentiment: SentimentType
+    contributions: Tuple[IndicatorContribution, ...] = ()  # Safety indicators behind the sentiment
+    
+    @property
+    def is_gluten_related(self) -> bool:
+        """Whether the review mentions any gluten-related keyword."""
+        return len(self.matches) > 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReviewAnalysis":
+        """Rebuild an analysis serialized with to_dict."""
+        return cls(
+            keywords=tuple(data["keywords"]),
+            matches=tuple(KeywordMatch(**match) for match in data["matches"]),
+            sentiment=data["sentiment"],
+            contributions=tuple(IndicatorContribution(**c) for c in data.get("contributions", ()))
+        )
+
+def _create_cache() -> AnalysisCache:
+    store = None
+    if settings.ANALYSIS_CACHE_BACKEND == "redis":
+        try:
+            store = RedisAnalysisStore(settings.REDIS_URL)
+        except Exception as e:
+            print(f"Redis analysis cache unavailable, using in-process cache only: {e}")
+    
+    return AnalysisCache(
+        lru_size=settings.ANALYSIS_CACHE_SIZE,
+        ttl_seconds=settings.ANALYSIS_CACHE_TTL_SECONDS,
+        store=store
+    )
+
+class ReviewAnalyzer:
+    """Runs keyword detection and sentiment analysis once per review."""
+    
+    def __init__(
+        self,
+        detector: GlutenKeywordDetector = gluten_detector,
+        analyzer: GlutenSentimentAnalyzer = sentiment_analyzer,
+        cache: Optional[AnalysisCache] = None,
+        executor: Optional[AnalysisExecutor] = None
+    ):
+        self.detector = detector
+        self.analyzer = analyzer
+        self.cache = cache
+        self.executor = executor
+        self.lexicon_version = self._lexicon_version()
+    
+    def _lexicon_version(self) -> str:
+        """Hash of everything that determines an analysis, used to scope cache keys."""
+        lexicon = {
+            "format": ANALYSIS_FORMAT_VERSION,
+            "keywords": sorted(self.detector.gluten_keywords),
+            "positive": sorted(self.analyzer.positive_indicators),
+            "negative": sorted(self.analyzer.negative_indicators),
+            "negations": sorted(self.analyzer.negation_words),
+            "negation_window": self.analyzer.negation_window,
+            "scope_breakers": sorted(self.analyzer.scope_breakers)
+        }
+        raw = json.dumps(lexicon, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+    
+    def analyze(self, text: str) -> ReviewAnalysis:
+        """
+        Analyze a review's text.
+        
+        Sentiment is only computed for gluten-related reviews; other reviews
+        are reported as neutral since they never contribute to scoring.
+        
+        Args:
+            text: Review text
+            
+        Returns:
+            Review analysis
+        """
+        matches = self.detector.detect_matches(text)
+        if not matches:
+            return ReviewAnalysis(keywords=(), matches=(), sentiment="neutral")
+        
+        keywords = tuple(dict.fromkeys(match.text for match in matches))
+        contributions = self.analyzer.analyze_contributions(text)
+        
+        return ReviewAnalysis(
+            keywords=keywords,
+            matches=tuple(matches),
+            sentiment=self.analyzer.classify(contributions),
+            contributions=tuple(contributions)
+        )
+    
+    def analyze_many(self, texts: List[str]) -> List[ReviewAnalysis]:
+        """
+        Analyze a batch of review texts, reusing in-process cached results.
+        
+        Args:
+            texts: Review texts
+            
+        Returns:
+            Analyses in the same order as ``texts``
+        """
+        if self.cache is None:
+            return [self.analyze(text) for text in texts]
+        
+        results = []
+        for text in texts:
+            key = self.cache.make_key(self.lexicon_version, text)
+            analysis = self.cache.get(key)
+            if analysis is None:
+                analysis = self.analyze(text)
+                self.cache.set(key, analysis)
+            results.append(analysis)
+        return results
+    
+    async def analyze_batch(self, texts: List[str]) -> List[ReviewAnalysis]:
+        """
+        Analyze a batch of review texts, consulting the shared cache as well.
+        
+        Args:
+            texts: Review texts
+            
+        Returns:
+            Analyses in the same order as ``texts``
+        """
+        if self.cache is None:
+            return await self._analyze_uncached(texts)
+        
+        keys = [self.cache.make_key(self.lexicon_version, text) for text in texts]
+        found: Dict[str, ReviewAnalysis] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            analysis = self.cache.get(key)
+            if analysis is not None:
+                found[key] = analysis
+            else:
+                missing[key] = text
+        
+        for key, data in (await self.cache.get_shared(list(missing))).items():
+            found[key] = ReviewAnalysis.from_dict(data)
+            self.cache.set(key, found[key])
+            del missing[key]
+        
+        computed = {}
+        analyses = await self._analyze_uncached(list(missing.values()))
+        for key, analysis in zip(missing, analyses):
+            found[key] = analysis
+            self.cache.set(key, analysis)
+            computed[key] = analysis.to_dict()
+        await self.cache.set_shared(computed)
+        
+        return [found[key] for key in keys]
+    
+    async def _analyze_uncached(self, texts: List[str]) -> List[ReviewAnalysis]:
+        """Analyze texts on the executor, or inline if there is none."""
+        if self.executor is None:
+            return [self.analyze(text) for text in texts]
+        return await self.executor.analyze(self, texts)
+
+# Global instance
+review_analyzer = ReviewAnalyzer(cache=_create_cache(), executor=analysis_executor)
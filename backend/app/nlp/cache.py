@@ -0,0 +1,112 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from app.util.lru import LRUCache
+
+def text_digest(text: str) -> str:
+    """Content hash of a review text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class RedisAnalysisStore:
+    """Analysis results in Redis, shared by every worker using the same REDIS_URL."""
+    
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        
+        self.client = redis.from_url(url)
+    
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        values = await self.client.mget(keys)
+        return [value.decode("utf-8") if value is not None else None for value in values]
+    
+    async def set_many(self, items: Dict[str, str], ttl_seconds: int) -> None:
+        pipe = self.client.pipeline()
+        for key, value in items.items():
+            pipe.set(key, value, ex=ttl_seconds)
+        await pipe.execute()
+    
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+class AnalysisCache:
+    """
+    Content-addressed cache of review analyses.
+    
+    Keys combine the lexicon version with a hash of the review text, so any
+    change to the keyword or indicator sets misses every earlier entry. Entries
+    live in a bounded in-process LRU, backed by an optional shared store.
+    """
+    
+    def __init__(self, lru_size: int, ttl_seconds: int, store: Optional[RedisAnalysisStore] = None):
+        self.memory = LRUCache(lru_size)
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        
+        self.shared_hits = 0
+        self.shared_errors = 0
+    
+    @staticmethod
+    def make_key(lexicon_version: str, text: str) -> str:
+        return f"analysis:{lexicon_version}:{text_digest(text)}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get an analysis from the in-process LRU."""
+        return self.memory.get(key)
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store an analysis in the in-process LRU."""
+        self.memory.set(key, value)
+    
+    async def get_shared(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up serialized analyses in the shared store.
+        
+        Args:
+            keys: Cache keys missing from the LRU
+        
+        Returns:
+            Mapping of key to stored analysis for the keys that were found
+        """
+        if self.store is None or not keys:
+            return {}
+        
+        try:
+            values = await self.store.get_many(keys)
+        except Exception as e:
+            self.shared_errors += 1
+            print(f"Shared analysis cache read failed: {e}")
+            return {}
+        
+        found = {}
+        for key, value in zip(keys, values):
+            if value is not None:
+                found[key] = json.loads(value)
+        
+        self.shared_hits += len(found)
+        return found
+    
+    async def set_shared(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """Write serialized analyses to the shared store."""
+        if self.store is None or not items:
+            return
+        
+        try:
+            await self.store.set_many(
+                {key: json.dumps(value) for key, value in items.items()}, self.ttl_seconds
+            )
+        except Exception as e:
+            self.shared_errors += 1
+            print(f"Shared analysis cache write failed: {e}")
+    
+    async def aclose(self) -> None:
+        if self.store is not None:
+            await self.store.aclose()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            **self.memory.stats(),
+            "shared": self.store is not None,
+            "shared_hits": self.shared_hits,
+            "shared_errors": self.shared_errors
+        }
@@ -0,0 +1,202 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.nlp.analysis import ReviewAnalysis, ReviewAnalyzer
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+_worker_analyzer: Optional["ReviewAnalyzer"] = None
+
+def _analyze_in_worker(texts: List[str]) -> List["ReviewAnalysis"]:
+    """Analyze texts in a worker process with that process's own analyzer."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        from app.nlp.analysis import ReviewAnalyzer
+        _worker_analyzer = ReviewAnalyzer()
+    return [_worker_analyzer.analyze(text) for text in texts]
+
+class AnalysisExecutor:
+    """
+    Runs CPU-bound review analysis off the event loop.
+    
+    Batches are split into chunks and submitted to a thread or process pool.
+    Batches smaller than the inline threshold run directly on the event loop,
+    where dispatch overhead would outweigh the work. Small batches submitted
+    within a short window (a search scoring each business's few reviews as
+    they arrive) are first combined, so together they can reach the pool.
+    """
+    
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int = 4,
+        inline_threshold: int = 20,
+        chunk_size: int = 50,
+        batch_window_seconds: float = 0.005
+    ):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown analysis executor mode '{mode}', expected one of {EXECUTOR_MODES}")
+        
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.inline_threshold = inline_threshold
+        self.chunk_size = max(1, chunk_size)
+        self.batch_window_seconds = batch_window_seconds
+        self._pool: Optional[Executor] = None
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple["ReviewAnalyzer", List[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        
+        self.inline_batches = 0
+        self.offloaded_batches = 0
+        self.offloaded_texts = 0
+        self.combined_calls = 0
+    
+    @property
+    def pool(self) -> Executor:
+        """The worker pool, created on first use."""
+        if self._pool is None:
+            if self.mode == "process":
+                # Spawned workers don't inherit the parent's event loop or open connections
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="analysis"
+                )
+        return self._pool
+    
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Reset batching state when first used on a new event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._pending = []
+            self._pending_texts = 0
+            self._flush_handle = None
+            self._tasks = set()
+        return loop
+    
+    async def analyze(self, analyzer: "ReviewAnalyzer", texts: List[str]) -> List["ReviewAnalysis"]:
+        """
+        Analyze review texts, offloading large batches to the pool.
+        
+        Batches under the inline threshold wait up to the batch window to be
+        combined with other small batches. Process workers use the default
+        lexicons, not a customized analyzer's.
+        
+        Args:
+            analyzer: Analyzer used inline and in thread workers
+            texts: Review texts
+        
+        Returns:
+            Analyses in the same order as ``texts``
+        """
+        if not texts:
+            return []
+        if self.mode == "inline" or len(texts) >= self.inline_threshold or self.batch_window_seconds <= 0:
+            return await self._run(analyzer, texts)
+        
+        loop = self._bind_loop()
+        future = loop.create_future()
+        self._pending.append((analyzer, texts, future))
+        self._pending_texts += len(texts)
+        
+        if self._pending_texts >= self.chunk_size * self.max_workers:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window_seconds, self._flush)
+        return await future
+    
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        # Only batches for the same analyzer can share a run
+        batches: Dict[int, List[Tuple["ReviewAnalyzer", List[str], asyncio.Future]]] = {}
+        for entry in self._pending:
+            batches.setdefault(id(entry[0]), []).append(entry)
+        self._pending = []
+        self._pending_texts = 0
+        
+        for batch in batches.values():
+            task = asyncio.ensure_future(self._run_combined(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_combined(self, batch: List[Tuple["ReviewAnalyzer", List[str], asyncio.Future]]) -> None:
+        self.combined_calls += len(batch)
+        texts = [text for _, batch_texts, _ in batch for text in batch_texts]
+        try:
+            results = await self._run(batch[0][0], texts)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        start = 0
+        for _, batch_texts, future in batch:
+            if not future.done():
+                future.set_result(results[start:start + len(batch_texts)])
+            start += len(batch_texts)
+    
+    async def _run(self, analyzer: "ReviewAnalyzer", texts: List[str]) -> List["ReviewAnalysis"]:
+        """Analyze a batch inline or on the pool, depending on its size."""
+        if self.mode == "inline" or len(texts) < self.inline_threshold:
+            self.inline_batches += 1
+            return [analyzer.analyze(text) for text in texts]
+        
+        self.offloaded_batches += 1
+        self.offloaded_texts += len(texts)
+        
+        loop = asyncio.get_running_loop()
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        if self.mode == "process":
+            futures = [loop.run_in_executor(self.pool, _analyze_in_worker, chunk) for chunk in chunks]
+        else:
+            futures = [
+                loop.run_in_executor(self.pool, lambda chunk=chunk: [analyzer.analyze(text) for text in chunk])
+                for chunk in chunks
+            ]
+        
+        results = []
+        for chunk_results in await asyncio.gather(*futures):
+            results.extend(chunk_results)
+        return results
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get executor statistics."""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "inline_threshold": self.inline_threshold,
+            "inline_batches": self.inline_batches,
+            "offloaded_batches": self.offloaded_batches,
+            "offloaded_texts": self.offloaded_texts,
+            "combined_calls": self.combined_calls
+        }
+
+# Global instance
+analysis_executor = AnalysisExecutor(
+    mode=settings.ANALYSIS_EXECUTOR,
+    max_workers=settings.ANALYSIS_EXECUTOR_WORKERS,
+    inline_threshold=settings.ANALYSIS_INLINE_THRESHOLD,
+    chunk_size=settings.ANALYSIS_CHUNK_SIZE,
+    batch_window_seconds=settings.ANALYSIS_BATCH_WINDOW_MS / 1000
+)
@@ -1,6 +1,18 @@
 import re
+from dataclasses import dataclass
 from typing import List, Set
 
+@dataclass(frozen=True)
+class KeywordMatch:
+    """A gluten keyword occurrence in a piece of text."""
+    text: str  # Matched text, preserving original case
+    start: int
+    end: int
+
+def _is_word_char(text: str, index: int) -> bool:
+    """Check whether the character at index is a regex word character."""
+    return index < len(text) and (text[index].isalnum() or text[index] == "_")
+
 class GlutenKeywordDetector:
     """Detector for gluten-related keywords in text."""
     
@@ -31,35 +43,58 @@ class GlutenKeywordDetector:
             "allergen information", "allergen protocol"
         }
         
-        # Compile regex patterns for word boundary matching
-        self.patterns = []
-        for keyword in self.gluten_keywords:
-            # Create case-insensitive pattern with word boundaries
-            pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-            self.patterns.append(pattern)
+        # One combined pattern, longest keywords first, so a single scan finds the
+        # longest keyword starting at each word boundary. The lookahead keeps the
+        # match zero-width, so keywords starting inside a longer match are still found.
+        self._keywords_by_length = sorted(
+            {keyword.lower() for keyword in self.gluten_keywords}, key=len, reverse=True
+        )
+        alternation = "|".join(re.escape(keyword) for keyword in self._keywords_by_length)
+        self.pattern = re.compile(r'\b(?=(' + alternation + r')\b)', re.IGNORECASE)
+        self._keyword_set = set(self._keywords_by_length)
+        self._keyword_lengths = sorted({len(keyword) for keyword in self._keyword_set}, reverse=True)
     
-    def detect_keywords(self, text: str) -> List[str]:
+    def detect_matches(self, text: str) -> List[KeywordMatch]:
         """
-        Detect gluten-related keywords in text.
+        Find every gluten keyword occurrence in text with its offsets.
         
         Args:
             text: Text to analyze
             
         Returns:
-            List of detected keywords
+            List of keyword matches ordered by start offset, longest first
         """
         if not text:
             return []
         
-        detected = []
-        text_lower = text.lower()
-        
-        for pattern in self.patterns:
-            if pattern.search(text):
-                # Extract the actual matched keyword (preserving original case)
-                matches = pattern.findall(text)
-                detected.extend(matches)
+        matches = []
+        for match in self.pattern.finditer(text):
+            start, longest = match.start(1), match.group(1)
+            matches.append(KeywordMatch(text=longest, start=start, end=match.end(1)))
+            
+            # Shorter keywords at the same offset are prefixes of the longest match
+            # (e.g., "gluten free" inside "gluten free menu")
+            lowered = longest.lower()
+            for length in self._keyword_lengths:
+                if length >= len(longest):
+                    continue
+                end = start + length
+                if lowered[:length] in self._keyword_set and not _is_word_char(text, end):
+                    matches.append(KeywordMatch(text=text[start:end], start=start, end=end))
+        return matches
+    
+    def detect_keywords(self, text: str) -> List[str]:
+        """
+        Detect gluten-related keywords in text.
         
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            List of detected keywords
+        """
+        # Extract the actual matched keywords (preserving original case)
+        detected = [match.text for match in self.detect_matches(text)]
         return list(set(detected))  # Remove duplicates
     
     def has_gluten_keywords(self, text: str) -> bool:
@@ -72,7 +107,11 @@ class GlutenKeywordDetector:
         Returns:
             True if gluten keywords are found, False otherwise
         """
-        return len(self.detect_keywords(text)) > 0
+        if not text:
+            return False
+        
+        # Stops at the first keyword instead of collecting them all
+        return self.pattern.search(text) is not None
     
     def get_keyword_count(self, text: str) -> int:
         """
@@ -0,0 +1,265 @@
+import asyncio
+import dataclasses
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.nlp.analysis import ReviewAnalysis
+from app.nlp.cache import text_digest
+from app.nlp.sentiment import SentimentType
+from app.providers.http import http_clients
+from app.util.lru import LRUCache
+
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+
+SYSTEM_PROMPT = """You classify restaurant reviews for gluten safety.
+Focus ONLY on gluten-related safety concerns, not general food quality.
+
+The user message is a JSON array of reviews. Classify each one as:
+- "positive" if it indicates the restaurant is safe for gluten-free/celiac diners
+- "negative" if it indicates the restaurant is NOT safe for gluten-free/celiac diners
+- "neutral" if it mentions gluten but doesn't clearly indicate safety or lack thereof
+
+Respond with only a JSON array of labels, one per review, in the same order."""
+
+def _parse_labels(content: str, expected: int) -> List[Optional[SentimentType]]:
+    """Parse a JSON array of labels from a completion, tolerating code fences."""
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.strip("`")
+        content = content[content.find("["):]
+    
+    labels = json.loads(content)
+    if not isinstance(labels, list) or len(labels) != expected:
+        raise ValueError(f"expected {expected} labels, got {labels!r}")
+    
+    return [
+        label.strip().lower() if isinstance(label, str) and label.strip().lower() in SENTIMENT_LABELS else None
+        for label in labels
+    ]
+
+class LLMClassifier:
+    """
+    Micro-batched LLM sentiment classification for ambiguous reviews.
+    
+    Reviews submitted within a short window (or until a batch fills up) are
+    sent together in one chat completion request, in-flight requests are
+    bounded, and verdicts are cached by text hash.
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = "https://api.openai.com/v1",
+        model: str = "gpt-3.5-turbo",
+        batch_size: int = 20,
+        batch_window_seconds: float = 0.02,
+        max_concurrency: int = 4,
+        cache_size: int = 10000,
+        client: Optional[Any] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.batch_window_seconds = batch_window_seconds
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = LRUCache(cache_size)
+        
+        # Any client with an httpx-style post(); the pooled client by default
+        self.http = client if client is not None else http_clients.register(
+            "openai", f"{self.base_url}/models" if api_key else None
+        )
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        
+        self.requests = 0
+        self.reviews_sent = 0
+        self.errors = 0
+        self.fallbacks = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key)
+    
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Reset batching state when first used on a new event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._pending = []
+            self._in_flight = {}
+            self._flush_handle = None
+            self._tasks = set()
+        return loop
+    
+    def submit(self, text: str) -> asyncio.Future:
+        """
+        Queue a review for classification.
+        
+        Args:
+            text: Review text
+        
+        Returns:
+            Future resolving to the LLM's label, or None if classification failed
+        """
+        loop = self._bind_loop()
+        key = text_digest(text)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            future = loop.create_future()
+            future.set_result(cached)
+            return future
+        
+        if key in self._in_flight:
+            return self._in_flight[key]
+        
+        future = loop.create_future()
+        self._in_flight[key] = future
+        self._pending.append((key, text, future))
+        
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window_seconds, self._flush)
+        return future
+    
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        while self._pending:
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[str, str, asyncio.Future]]) -> None:
+        try:
+            async with self._semaphore:
+                labels = await self._request([text for _, text, _ in batch])
+        except Exception as e:
+            self.errors += 1
+            print(f"LLM classification failed for {len(batch)} reviews: {e}")
+            labels = [None] * len(batch)
+        
+        for (key, _, future), label in zip(batch, labels):
+            if label is not None:
+                self.cache.set(key, label)
+            self._in_flight.pop(key, None)
+            if not future.done():
+                future.set_result(label)
+    
+    async def _request(self, texts: List[str]) -> List[Optional[SentimentType]]:
+        """Classify a batch of reviews with one chat completion request."""
+        self.requests += 1
+        self.reviews_sent += len(texts)
+        
+        response = await self.http.post(
+            f"{self.base_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": self.model,
+                "temperature": 0,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": json.dumps(texts)}
+                ]
+            }
+        )
+        response.raise_for_status()
+        
+        content = response.json()["choices"][0]["message"]["content"]
+        return _parse_labels(content, len(texts))
+    
+    async def classify_batch(self, texts: List[str]) -> List[Optional[SentimentType]]:
+        """
+        Classify reviews, waiting for every verdict.
+        
+        Args:
+            texts: Review texts
+        
+        Returns:
+            Labels in the same order as ``texts`` (None where classification failed)
+        """
+        if not self.enabled or not texts:
+            return [None] * len(texts)
+        
+        # Futures are shared with other callers classifying the same text, so
+        # cancelling this call must not cancel them
+        return list(await asyncio.gather(*(asyncio.shield(self.submit(text)) for text in texts)))
+    
+    async def refine(
+        self,
+        texts: List[str],
+        analyses: List[ReviewAnalysis],
+        deadline: Optional[float] = None
+    ) -> List[ReviewAnalysis]:
+        """
+        Replace rule-based verdicts on ambiguous reviews with LLM verdicts.
+        
+        Ambiguous reviews are gluten-related reviews the rules scored neutral
+        (no indicators, or a tie). Reviews still unclassified at the deadline
+        keep their rule-based result; their requests keep running and fill
+        the cache for later searches.
+        
+        Args:
+            texts: Review texts
+            analyses: Rule-based analyses in the same order
+            deadline: Event loop time (loop.time()) after which to stop waiting
+        
+        Returns:
+            Analyses with LLM verdicts applied where available
+        """
+        if not self.enabled:
+            return analyses
+        
+        ambiguous = [
+            index for index, analysis in enumerate(analyses)
+            if analysis.is_gluten_related and analysis.sentiment == "neutral"
+        ]
+        if not ambiguous:
+            return analyses
+        
+        futures = {index: self.submit(texts[index]) for index in ambiguous}
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+        await asyncio.wait(set(futures.values()), timeout=timeout)
+        
+        refined = list(analyses)
+        for index, future in futures.items():
+            if not future.done():
+                self.fallbacks += 1
+            elif future.result() is not None:
+                refined[index] = dataclasses.replace(analyses[index], sentiment=future.result())
+        return refined
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get classifier statistics."""
+        return {
+            "enabled": self.enabled,
+            "requests": self.requests,
+            "reviews_sent": self.reviews_sent,
+            "errors": self.errors,
+            "fallbacks": self.fallbacks,
+            "cache": self.cache.stats()
+        }
+
+# Global instance
+llm_classifier = LLMClassifier(
+    api_key=settings.OPENAI_API_KEY if settings.LLM_ENABLED else None,
+    base_url=settings.OPENAI_BASE_URL,
+    model=settings.LLM_MODEL,
+    batch_size=settings.LLM_BATCH_SIZE,
+    batch_window_seconds=settings.LLM_BATCH_WINDOW_MS / 1000,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    cache_size=settings.LLM_CACHE_SIZE
+)
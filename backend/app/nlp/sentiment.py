@@ -1,9 +1,23 @@
 import re
-from typing import Literal, Optional
-from app.core.config import settings
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Tuple
 
 SentimentType = Literal["positive", "negative", "neutral"]
 
+# Words, keeping contractions like "didn't" whole, and clause punctuation.
+# Hyphens and slashes separate words, so "cross-contamination" matches "cross contamination".
+_TOKEN_PATTERN = re.compile(r"[^\W_]+(?:['’][^\W_]+)*|[.!?;:,]")
+
+@dataclass(frozen=True)
+class IndicatorContribution:
+    """One safety indicator found in a review and its effect on the score."""
+    phrase: str  # Indicator phrase from the lexicon
+    polarity: SentimentType  # Polarity of the phrase on its own
+    negated: bool  # Whether a preceding negation flipped it
+    weight: int  # +1 toward positive, -1 toward negative
+    start: int
+    end: int
+
 class GlutenSentimentAnalyzer:
     """Analyzer for gluten safety sentiment in reviews."""
     
@@ -40,48 +54,111 @@ class GlutenSentimentAnalyzer:
             "don't", "didn't", "hasn't", "haven't", "hadn't"
         }
         
-        # Compile patterns
-        self.positive_patterns = [re.compile(r'\b' + re.escape(phrase) + r'\b', re.IGNORECASE) 
-                                for phrase in self.positive_indicators]
-        self.negative_patterns = [re.compile(r'\b' + re.escape(phrase) + r'\b', re.IGNORECASE) 
-                                for phrase in self.negative_indicators]
-        self.negation_pattern = re.compile(r'\b(' + '|'.join(self.negation_words) + r')\b', re.IGNORECASE)
+        # A negation flips indicators starting within this many tokens after it,
+        # unless punctuation or a contrasting word ends the clause first
+        self.negation_window = 3
+        self.scope_breakers = {"but", "however", "although", "though", "yet"}
+        
+        # Token trie over both lexicons, so one left-to-right pass finds the
+        # longest indicator starting at each token
+        self._trie: Dict[str, dict] = {}
+        for polarity, phrases in (("positive", self.positive_indicators), ("negative", self.negative_indicators)):
+            for phrase in phrases:
+                node = self._trie
+                for token in _tokenize_phrase(phrase):
+                    node = node.setdefault(token, {})
+                node[None] = (phrase, polarity)
     
-    def analyze_sentiment(self, text: str) -> SentimentType:
+    def analyze_contributions(self, text: str) -> List[IndicatorContribution]:
         """
-        Analyze gluten safety sentiment in text.
+        Find every safety indicator in text with its negation-adjusted weight.
         
         Args:
             text: Text to analyze
             
         Returns:
-            Sentiment classification: positive, negative, or neutral
+            Indicator contributions in text order
         """
         if not text:
-            return "neutral"
+            return []
         
-        text_lower = text.lower()
+        tokens = [
+            (match.group().lower().replace("\u2019", "'"), match.start(), match.end())
+            for match in _TOKEN_PATTERN.finditer(text)
+        ]
         
-        # Count positive and negative indicators
-        positive_count = sum(1 for pattern in self.positive_patterns if pattern.search(text))
-        negative_count = sum(1 for pattern in self.negative_patterns if pattern.search(text))
+        contributions = []
+        last_negation = None  # Token index of the most recent negation in this clause
+        i = 0
+        while i < len(tokens):
+            token = tokens[i][0]
+            
+            # Longest indicator starting at this token
+            node, found, j = self._trie, None, i
+            while j < len(tokens) and tokens[j][0] in node:
+                node = node[tokens[j][0]]
+                j += 1
+                if None in node:
+                    found = (node[None], j)
+            
+            if found is not None:
+                (phrase, polarity), j = found
+                negated = last_negation is not None and i - last_negation <= self.negation_window
+                weight = 1 if polarity == "positive" else -1
+                contributions.append(IndicatorContribution(
+                    phrase=phrase,
+                    polarity=polarity,
+                    negated=negated,
+                    weight=-weight if negated else weight,
+                    start=tokens[i][1],
+                    end=tokens[j - 1][2]
+                ))
+                last_negation = None
+                i = j
+                continue
+            
+            if token in self.negation_words:
+                last_negation = i
+            elif not token[0].isalnum() or token in self.scope_breakers:
+                last_negation = None
+            i += 1
         
-        # Check for negations that might flip sentiment
-        negations = len(self.negation_pattern.findall(text))
+        return contributions
+    
+    def classify(self, contributions: List[IndicatorContribution]) -> SentimentType:
+        """
+        Classify sentiment from indicator contributions.
         
-        # Simple rule: if more negative indicators, classify as negative
-        # If more positive indicators, classify as positive
-        # If equal or no indicators, classify as neutral
-        if negative_count > positive_count:
+        Args:
+            contributions: Output of analyze_contributions
+            
+        Returns:
+            Sentiment classification: positive, negative, or neutral
+        """
+        score = sum(contribution.weight for contribution in contributions)
+        
+        if score < 0:
             return "negative"
-        elif positive_count > negative_count:
+        elif score > 0:
             return "positive"
         else:
             return "neutral"
     
+    def analyze_sentiment(self, text: str) -> SentimentType:
+        """
+        Analyze gluten safety sentiment in text.
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Sentiment classification: positive, negative, or neutral
+        """
+        return self.classify(self.analyze_contributions(text))
+    
     async def classify_with_llm(self, text: str) -> Optional[SentimentType]:
         """
-        Classify sentiment using OpenAI LLM if available.
+        Classify sentiment using the LLM classifier if enabled.
         
         Args:
             text: Text to analyze
@@ -89,44 +166,9 @@ class GlutenSentimentAnalyzer:
         Returns:
             Sentiment classification or None if LLM unavailable
         """
-        if not settings.OPENAI_API_KEY:
-            return None
+        from app.nlp.llm import llm_classifier
         
-        try:
-            import openai
-            
-            prompt = f"""
-            Analyze the following restaurant review for gluten safety sentiment.
-            Focus ONLY on gluten-related safety concerns, not general food quality.
-            
-            Review: "{text}"
-            
-            Classify as:
-            - "positive" if the review indicates the restaurant is safe for gluten-free/celiac diners
-            - "negative" if the review indicates the restaurant is NOT safe for gluten-free/celiac diners
-            - "neutral" if the review mentions gluten but doesn't clearly indicate safety or lack thereof
-            
-            Respond with only: positive, negative, or neutral
-            """
-            
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=10,
-                temperature=0
-            )
-            
-            result = response.choices[0].message.content.strip().lower()
-            
-            if result in ["positive", "negative", "neutral"]:
-                return result
-            else:
-                return None
-                
-        except Exception as e:
-            # Log error and fall back to rule-based
-            print(f"LLM classification failed: {e}")
-            return None
+        return (await llm_classifier.classify_batch([text]))[0]
     
     def get_sentiment_score(self, text: str) -> float:
         """
@@ -147,5 +189,9 @@ class GlutenSentimentAnalyzer:
         else:
             return 0.0
 
+def _tokenize_phrase(phrase: str) -> Tuple[str, ...]:
+    """Split a lexicon phrase the same way review text is tokenized."""
+    return tuple(match.group().lower() for match in _TOKEN_PATTERN.finditer(phrase))
+
 # Global instance
 sentiment_analyzer = GlutenSentimentAnalyzer() 
\ No newline at end of file
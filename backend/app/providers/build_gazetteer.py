@@ -0,0 +1,77 @@
+"""
+Build the offline gazetteer used by app.providers.gazetteer.
+
+Usage:
+    python -m app.providers.build_gazetteer US.txt gazetteer.bin
+
+US.txt is the GeoNames postal code dump from
+https://download.geonames.org/export/zip/US.zip
+"""
+
+import argparse
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.providers.gazetteer import HEADER, KEY_SIZE, MAGIC, RECORD, ZIP_PATTERN
+from app.providers.geocache import normalize_address
+
+def _read_geonames_postal(path: str) -> Iterable[Tuple[str, str, str, float, float]]:
+    """Yield (postal_code, place_name, state_code, lat, lng) from a GeoNames postal dump."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 11 or not fields[9] or not fields[10]:
+                continue
+            yield fields[1], fields[2], fields[4], float(fields[9]), float(fields[10])
+
+def build_gazetteer(source: str, output: str) -> int:
+    """
+    Build a gazetteer file from a GeoNames postal code dump.
+    
+    ZIP codes map to their own coordinates; each "City, ST" maps to the
+    centroid of its ZIP codes.
+    
+    Args:
+        source: Path to the tab-separated GeoNames postal code file
+        output: Path of the gazetteer file to write
+    
+    Returns:
+        Number of records written
+    """
+    records: Dict[bytes, Tuple[float, float]] = {}
+    cities: Dict[bytes, List[float]] = {}
+    
+    for postal_code, place_name, state_code, lat, lng in _read_geonames_postal(source):
+        zip_match = ZIP_PATTERN.match(postal_code)
+        if zip_match:
+            records[f"zip:{zip_match.group(1)}".encode("utf-8")] = (lat, lng)
+        
+        if place_name and state_code:
+            key = f"city:{normalize_address(f'{place_name}, {state_code}')}".encode("utf-8")
+            totals = cities.setdefault(key, [0.0, 0.0, 0])
+            totals[0] += lat
+            totals[1] += lng
+            totals[2] += 1
+    
+    for key, (lat_sum, lng_sum, count) in cities.items():
+        records[key] = (lat_sum / count, lng_sum / count)
+    
+    keys = sorted(key for key in records if len(key) <= KEY_SIZE)
+    
+    with open(output, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(keys)))
+        for key in keys:
+            lat, lng = records[key]
+            f.write(RECORD.pack(key, lat, lng))
+    
+    return len(keys)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build a SafeBites gazetteer from a GeoNames postal code dump")
+    parser.add_argument("source", help="GeoNames postal code file (e.g., US.txt)")
+    parser.add_argument("output", help="Gazetteer file to write")
+    args = parser.parse_args(argv)
+    
+    count = build_gazetteer(args.source, args.output)
+    print(f"Wrote {count} records to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached value with its storage and expiry times (UNIX seconds)."""
+    value: Any
+    stored_at: float
+    expires_at: float
+    
+    @property
+    def is_expired(self) -> bool:
+        return time.time() >= self.expires_at
+    
+    def is_servable(self, grace_seconds: float) -> bool:
+        """Whether the entry is fresh or at most grace_seconds past expiry."""
+        return time.time() < self.expires_at + grace_seconds
+
+def make_cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a cache key from an endpoint and normalized request parameters.
+    
+    Parameters set to None are dropped, keys are sorted and list values are
+    sorted, so equivalent requests share a key regardless of argument order.
+    
+    Args:
+        endpoint: API endpoint path
+        params: Query parameters
+    
+    Returns:
+        Hex digest cache key
+    """
+    normalized = {}
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = sorted(str(v) for v in value)
+        normalized[name] = value
+    
+    raw = json.dumps({"endpoint": endpoint, "params": normalized}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class PersistentCache:
+    """
+    SQLite-backed JSON cache with per-entry TTL and LRU size eviction.
+    
+    The database is opened lazily on first use, so importing a module that
+    owns a cache never touches the filesystem. All SQLite work runs in a
+    thread so the event loop is not blocked.
+    """
+    
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int, stale_grace_seconds: int = 0):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stale_grace_seconds = stale_grace_seconds
+        
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._count = 0
+        
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+            self._count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            self._conn = conn
+        return self._conn
+    
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, stored_at, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            return CacheEntry(value=json.loads(row[0]), stored_at=row[1], expires_at=row[2])
+    
+    def _set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        now = time.time()
+        payload = json.dumps(value)
+        
+        with self._lock:
+            conn = self._connect()
+            exists = conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO entries (key, value, stored_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, payload, now, now + ttl_seconds, now)
+            )
+            if not exists:
+                self._count += 1
+            
+            if self._count > self.max_entries:
+                self._evict(conn, now)
+            conn.commit()
+    
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop entries past their grace window, then least recently used ones, down to max_entries."""
+        removed = conn.execute(
+            "DELETE FROM entries WHERE expires_at <= ?", (now - self.stale_grace_seconds,)
+        ).rowcount
+        
+        excess = self._count - removed - self.max_entries
+        if excess > 0:
+            removed += conn.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (excess,)
+            ).rowcount
+        
+        self._count -= removed
+        self.evictions += removed
+    
+    async def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up an entry, including expired ones that haven't been evicted yet.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cache entry or None if not stored
+        """
+        try:
+            return await asyncio.to_thread(self._get_entry, key)
+        except Exception as e:
+            print(f"Cache read failed for {self.path}: {e}")
+            return None
+    
+    async def lookup(self, key: str, allow_expired: bool = False) -> Optional[CacheEntry]:
+        """
+        Look up an entry and count the hit or miss.
+        
+        Entries less than ``stale_grace_seconds`` past expiry are hits too;
+        callers serving them should check ``is_expired`` and revalidate.
+        
+        Args:
+            key: Cache key
+            allow_expired: Treat expired entries as hits (e.g., when quota is low)
+        
+        Returns:
+            Cache entry or None on a miss
+        """
+        entry = await self.get_entry(key)
+        if entry is None or not (allow_expired or entry.is_servable(self.stale_grace_seconds)):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        if entry.is_expired:
+            self.stale_hits += 1
+        return entry
+    
+    async def get(self, key: str, allow_expired: bool = False) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            allow_expired: Return expired entries too (e.g., when quota is low)
+        
+        Returns:
+            Cached value or None on a miss
+        """
+        entry = await self.lookup(key, allow_expired)
+        return entry.value if entry is not None else None
+    
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """
+        Store a JSON-serializable value.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Entry lifetime, defaulting to the cache TTL
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        try:
+            await asyncio.to_thread(self._set, key, value, ttl)
+        except Exception as e:
+            print(f"Cache write failed for {self.path}: {e}")
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
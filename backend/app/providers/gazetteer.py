@@ -0,0 +1,169 @@
+"""
+Offline gazetteer for geocoding without a network call.
+
+The gazetteer file is a sorted array of fixed-size records that is memory
+mapped and binary searched, so lookups cost microseconds and the file is
+shared between worker processes through the page cache.
+
+Build one from a GeoNames postal code dump (e.g., US.txt from
+https://download.geonames.org/export/zip/US.zip):
+    
+    python -m app.providers.build_gazetteer US.txt gazetteer.bin
+"""
+
+import mmap
+import re
+import struct
+from typing import Optional, Tuple
+from app.providers.geocache import US_STATE_ABBREVIATIONS, normalize_address
+
+MAGIC = b"SBGAZ001"
+HEADER = struct.Struct("<8sI")  # magic, record count
+KEY_SIZE = 48
+RECORD = struct.Struct(f"<{KEY_SIZE}sff")  # null-padded key, lat, lng
+
+_COORDINATES_PATTERN = re.compile(r"^\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+ZIP_PATTERN = re.compile(r"^\s*(\d{5})(?:-\d{4})?\s*$")
+_STATE_CODES = set(US_STATE_ABBREVIATIONS.values())
+
+def parse_coordinates(query: str) -> Optional[Tuple[float, float]]:
+    """
+    Parse a "lat,lng" query.
+    
+    Args:
+        query: Search query
+    
+    Returns:
+        Tuple of (latitude, longitude) or None if the query isn't coordinates
+    """
+    match = _COORDINATES_PATTERN.match(query)
+    if not match:
+        return None
+    
+    lat, lng = float(match.group(1)), float(match.group(2))
+    if -90 <= lat <= 90 and -180 <= lng <= 180:
+        return (lat, lng)
+    return None
+
+def gazetteer_key(query: str) -> Optional[str]:
+    """
+    Map a ZIP code or "City, ST" query to its gazetteer key.
+    
+    Args:
+        query: Search query
+    
+    Returns:
+        Gazetteer key or None if the query isn't a ZIP code or city/state pair
+    """
+    match = ZIP_PATTERN.match(query)
+    if match:
+        return f"zip:{match.group(1)}"
+    
+    normalized = normalize_address(query)
+    parts = normalized.rsplit(" ", 1)
+    if len(parts) == 2 and parts[1] in _STATE_CODES:
+        return f"city:{normalized}"
+    return None
+
+class Gazetteer:
+    """Read-only, memory-mapped gazetteer file."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a gazetteer file")
+    
+    def _key_at(self, index: int) -> bytes:
+        offset = HEADER.size + index * RECORD.size
+        return self._map[offset:offset + KEY_SIZE].rstrip(b"\0")
+    
+    def lookup(self, key: str) -> Optional[Tuple[float, float]]:
+        """
+        Look up coordinates by key.
+        
+        Args:
+            key: Gazetteer key (see gazetteer_key)
+        
+        Returns:
+            Tuple of (latitude, longitude) or None if not found
+        """
+        target = key.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        
+        if lo < self.count and self._key_at(lo) == target:
+            _, lat, lng = RECORD.unpack_from(self._map, HEADER.size + lo * RECORD.size)
+            return (lat, lng)
+        return None
+    
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+class LocalGeocoder:
+    """Answers coordinate, ZIP code and "City, ST" queries without a network call."""
+    
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._gazetteer: Optional[Gazetteer] = None
+        self._load_failed = False
+        
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def gazetteer(self) -> Optional[Gazetteer]:
+        """The gazetteer, opened on first use if a path is configured."""
+        if self._gazetteer is None and self.path and not self._load_failed:
+            try:
+                self._gazetteer = Gazetteer(self.path)
+            except Exception as e:
+                print(f"Failed to open gazetteer {self.path}: {e}")
+                self._load_failed = True
+        return self._gazetteer
+    
+    def geocode(self, query: str) -> Optional[Tuple[float, float]]:
+        """
+        Resolve a query locally.
+        
+        Args:
+            query: Search query
+        
+        Returns:
+            Tuple of (latitude, longitude) or None if the local index can't resolve it
+        """
+        coords = parse_coordinates(query)
+        
+        if coords is None and self.gazetteer is not None:
+            key = gazetteer_key(query)
+            if key is not None:
+                coords = self.gazetteer.lookup(key)
+        
+        if coords is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return coords
+    
+    def close(self) -> None:
+        if self._gazetteer is not None:
+            self._gazetteer.close()
+            self._gazetteer = None
+    
+    def stats(self):
+        return {
+            "loaded": self._gazetteer is not None,
+            "records": self._gazetteer.count if self._gazetteer is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses
+        }
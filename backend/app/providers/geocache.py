@@ -0,0 +1,131 @@
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+from app.providers.cache import PersistentCache
+from app.util.lru import LRUCache
+
+US_STATE_ABBREVIATIONS = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar",
+    "california": "ca", "colorado": "co", "connecticut": "ct", "delaware": "de",
+    "district of columbia": "dc", "florida": "fl", "georgia": "ga", "hawaii": "hi",
+    "idaho": "id", "illinois": "il", "indiana": "in", "iowa": "ia",
+    "kansas": "ks", "kentucky": "ky", "louisiana": "la", "maine": "me",
+    "maryland": "md", "massachusetts": "ma", "michigan": "mi", "minnesota": "mn",
+    "mississippi": "ms", "missouri": "mo", "montana": "mt", "nebraska": "ne",
+    "nevada": "nv", "new hampshire": "nh", "new jersey": "nj", "new mexico": "nm",
+    "new york": "ny", "north carolina": "nc", "north dakota": "nd", "ohio": "oh",
+    "oklahoma": "ok", "oregon": "or", "pennsylvania": "pa", "rhode island": "ri",
+    "south carolina": "sc", "south dakota": "sd", "tennessee": "tn", "texas": "tx",
+    "utah": "ut", "vermont": "vt", "virginia": "va", "washington": "wa",
+    "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy"
+}
+
+# Only the final state component is abbreviated, so street and city names
+# like "Pennsylvania Ave" or "Washington St" keep their spelling. Longest
+# names first so "west virginia" wins over "virginia"; a state name must
+# follow another word and may be followed by a ZIP code.
+_STATE_SUFFIX_PATTERN = re.compile(
+    r'(?<=\s)(' + '|'.join(sorted(US_STATE_ABBREVIATIONS, key=len, reverse=True)) + r')'
+    r'(?=(?:\s\d{5}(?:-\d{4})?)?$)'
+)
+_PUNCTUATION_PATTERN = re.compile(r"[^\w\s-]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_COUNTRY_SUFFIX_PATTERN = re.compile(r"\s+(usa|us|united states( of america)?)$")
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize a free-form address so equivalent queries share a cache key.
+    
+    Lowercases, strips punctuation, collapses whitespace, drops a trailing
+    country name and abbreviates a trailing US state name, so "Atlanta,
+    Georgia, USA" and "atlanta ga" normalize to the same string. State names
+    elsewhere in the address, or making up the whole address, are kept.
+    
+    Args:
+        address: Address to normalize
+        
+    Returns:
+        Normalized address
+    """
+    text = address.lower()
+    text = _PUNCTUATION_PATTERN.sub(" ", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text).strip()
+    text = _COUNTRY_SUFFIX_PATTERN.sub("", text)
+    text = _STATE_SUFFIX_PATTERN.sub(lambda match: US_STATE_ABBREVIATIONS[match.group(1)], text, count=1)
+    return text
+
+def quantize_coordinates(lat: float, lng: float, precision: int) -> str:
+    """
+    Round coordinates to a fixed number of decimals for use as a cache key.
+    
+    Args:
+        lat, lng: Coordinates
+        precision: Decimal places to keep (4 is roughly 11 meters)
+        
+    Returns:
+        Quantized "lat,lng" string
+    """
+    return f"{round(lat, precision):.{precision}f},{round(lng, precision):.{precision}f}"
+
+class GeocodeCache:
+    """Two-tier geocode cache: a bounded in-process LRU in front of a persistent store."""
+    
+    def __init__(
+        self,
+        store: Optional[PersistentCache],
+        lru_size: int,
+        ttl_seconds: int,
+        negative_ttl_seconds: int
+    ):
+        self.store = store
+        self.lru = LRUCache(lru_size)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+    
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached geocode.
+        
+        Args:
+            key: Normalized cache key
+            
+        Returns:
+            Tuple of (hit, value). A hit with value None is a cached failed lookup.
+        """
+        entry = self.lru.get(key)
+        if entry is not None:
+            return True, entry["result"]
+        
+        if self.store is not None:
+            cached = await self.store.lookup(key)
+            if cached is not None:
+                self.lru.set(key, cached.value, max(0.0, cached.expires_at - time.time()))
+                return True, cached.value["result"]
+        
+        return False, None
+    
+    async def set(self, key: str, result: Any) -> None:
+        """
+        Cache a geocode result. None results are cached with the short negative TTL.
+        
+        Args:
+            key: Normalized cache key
+            result: JSON-serializable result, or None for a failed lookup
+        """
+        ttl = self.ttl_seconds if result is not None else self.negative_ttl_seconds
+        entry = {"result": result}
+        
+        self.lru.set(key, entry, ttl)
+        if self.store is not None:
+            await self.store.set(key, entry, ttl)
+    
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get statistics for both tiers."""
+        return {
+            "memory": self.lru.stats(),
+            "persistent": self.store.stats() if self.store is not None else None
+        }
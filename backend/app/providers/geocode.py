@@ -1,7 +1,12 @@
-import httpx
-import asyncio
+import os
 from typing import Optional, Tuple
 from app.core.config import settings
+from app.providers.cache import PersistentCache
+from app.providers.gazetteer import LocalGeocoder
+from app.providers.geocache import GeocodeCache, normalize_address, quantize_coordinates
+from app.providers.http import http_clients
+from app.providers.ratelimit import Priority, QuotaExceededError, rate_limiters
+from app.util.singleflight import SingleFlight
 
 class GeocodingProvider:
     """Provider for geocoding addresses to coordinates."""
@@ -9,43 +14,92 @@ class GeocodingProvider:
     def __init__(self):
         self.api_key = settings.OPENCAGE_API_KEY
         self.base_url = "https://api.opencagedata.com/geocode/v1/json"
+        self.http = http_clients.register(
+            "opencage", "https://api.opencagedata.com/" if self.api_key else None
+        )
+        self.rate_limiter = rate_limiters.register(
+            "opencage", settings.OPENCAGE_RATE_LIMIT_PER_SECOND, settings.OPENCAGE_RATE_LIMIT
+        )
+        self.local = LocalGeocoder(settings.GAZETTEER_PATH)
+        self.cache = GeocodeCache(
+            PersistentCache(
+                os.path.join(settings.CACHE_DIR, "geocode.sqlite3"),
+                ttl_seconds=settings.GEOCODE_CACHE_TTL_SECONDS,
+                max_entries=settings.GEOCODE_CACHE_MAX_ENTRIES
+            ) if settings.GEOCODE_CACHE_ENABLED else None,
+            lru_size=settings.GEOCODE_CACHE_LRU_SIZE if settings.GEOCODE_CACHE_ENABLED else 0,
+            ttl_seconds=settings.GEOCODE_CACHE_TTL_SECONDS,
+            negative_ttl_seconds=settings.GEOCODE_NEGATIVE_TTL_SECONDS
+        )
+        self.flights = SingleFlight("opencage")
     
-    async def geocode_address(self, address: str) -> Optional[Tuple[float, float]]:
+    async def geocode_address(
+        self,
+        address: str,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Optional[Tuple[float, float]]:
         """
         Geocode an address to latitude and longitude.
         
         Args:
             address: Address to geocode
+            priority: Rate limiting priority class
             
         Returns:
             Tuple of (latitude, longitude) or None if geocoding failed
         """
+        # Coordinates, ZIP codes and "City, ST" resolve locally without a network call
+        local = self.local.geocode(address)
+        if local is not None:
+            return local
+        
         if not self.api_key:
             # Fallback to mock coordinates for development
             return self._mock_geocode(address)
         
+        # Concurrent lookups of equivalent addresses share one cache check and request
+        cache_key = f"forward:{normalize_address(address)}"
+        return await self.flights.do(cache_key, lambda: self._geocode_remote(address, cache_key, priority))
+    
+    async def _geocode_remote(
+        self,
+        address: str,
+        cache_key: str,
+        priority: Priority
+    ) -> Optional[Tuple[float, float]]:
+        """Geocode an address through the cache and OpenCage."""
+        hit, cached = await self.cache.get(cache_key)
+        if hit:
+            return tuple(cached) if cached else None
+        
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "q": address,
-                    "key": self.api_key,
-                    "limit": 1,
-                    "no_annotations": 1
-                }
-                
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if data["results"]:
-                    result = data["results"][0]
-                    lat = result["geometry"]["lat"]
-                    lng = result["geometry"]["lng"]
-                    return (lat, lng)
-                
-                return None
+            await self.rate_limiter.acquire(priority)
+            
+            params = {
+                "q": address,
+                "key": self.api_key,
+                "limit": 1,
+                "no_annotations": 1
+            }
+            
+            response = await self.http.get(self.base_url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if data["results"]:
+                result = data["results"][0]
+                lat = result["geometry"]["lat"]
+                lng = result["geometry"]["lng"]
+                await self.cache.set(cache_key, [lat, lng])
+                return (lat, lng)
+            
+            # Remember failed lookups briefly
+            await self.cache.set(cache_key, None)
+            return None
                 
+        except QuotaExceededError:
+            raise
         except Exception as e:
             print(f"Geocoding failed for '{address}': {e}")
             return None
@@ -63,12 +117,18 @@ class GeocodingProvider:
         # Return Atlanta, GA coordinates as default
         return (33.7490, -84.3880)
     
-    async def reverse_geocode(self, lat: float, lng: float) -> Optional[str]:
+    async def reverse_geocode(
+        self,
+        lat: float,
+        lng: float,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Optional[str]:
         """
         Reverse geocode coordinates to address.
         
         Args:
             lat, lng: Coordinates
+            priority: Rate limiting priority class
             
         Returns:
             Formatted address or None if reverse geocoding failed
@@ -76,26 +136,37 @@ class GeocodingProvider:
         if not self.api_key:
             return None
         
+        cache_key = f"reverse:{quantize_coordinates(lat, lng, settings.GEOCODE_REVERSE_PRECISION)}"
+        hit, cached = await self.cache.get(cache_key)
+        if hit:
+            return cached
+        
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "q": f"{lat},{lng}",
-                    "key": self.api_key,
-                    "limit": 1,
-                    "no_annotations": 1
-                }
-                
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if data["results"]:
-                    result = data["results"][0]
-                    return result["formatted"]
-                
-                return None
+            await self.rate_limiter.acquire(priority)
+            
+            params = {
+                "q": f"{lat},{lng}",
+                "key": self.api_key,
+                "limit": 1,
+                "no_annotations": 1
+            }
+            
+            response = await self.http.get(self.base_url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if data["results"]:
+                result = data["results"][0]
+                await self.cache.set(cache_key, result["formatted"])
+                return result["formatted"]
+            
+            # Remember failed lookups briefly
+            await self.cache.set(cache_key, None)
+            return None
                 
+        except QuotaExceededError:
+            raise
         except Exception as e:
             print(f"Reverse geocoding failed for ({lat}, {lng}): {e}")
             return None
@@ -0,0 +1,205 @@
+import httpx
+import asyncio
+import importlib.util
+from typing import Dict, Any, Optional
+from app.core.config import settings
+
+def _http2_available() -> bool:
+    """Check whether HTTP/2 was requested and the optional h2 package is installed."""
+    if not settings.HTTP2_ENABLED:
+        return False
+    
+    if importlib.util.find_spec("h2") is None:
+        print("HTTP2_ENABLED is set but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    
+    return True
+
+class PooledClient:
+    """Long-lived, keep-alive HTTP client for a single upstream API."""
+    
+    def __init__(self, name: str, warmup_url: Optional[str] = None):
+        self.name = name
+        self.warmup_url = warmup_url
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Counters exposed through stats()
+        self.requests = 0
+        self.in_flight = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.errors = 0
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying client, created on first use if startup hasn't run."""
+        self.open()
+        return self._client
+    
+    def open(self) -> None:
+        """Create the underlying client if it doesn't exist yet."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+        )
+        timeout = httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+            pool=settings.HTTP_POOL_TIMEOUT_SECONDS
+        )
+        return httpx.AsyncClient(limits=limits, timeout=timeout, http2=_http2_available())
+    
+    def _request_slots(self) -> asyncio.Semaphore:
+        """One slot per pooled connection, for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(settings.HTTP_MAX_CONNECTIONS)
+            self._slots_loop = loop
+        return self._slots
+    
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the pool.
+        
+        At most HTTP_MAX_CONNECTIONS requests are in flight; later ones wait
+        up to HTTP_POOL_TIMEOUT_SECONDS for a slot and are counted in waits.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed through to httpx
+        
+        Returns:
+            The HTTP response
+        """
+        self.requests += 1
+        slots = self._request_slots()
+        
+        if slots.locked():
+            self.waits += 1
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                await asyncio.wait_for(slots.acquire(), settings.HTTP_POOL_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                self.errors += 1
+                raise httpx.PoolTimeout(f"No free {self.name} connection within {settings.HTTP_POOL_TIMEOUT_SECONDS}s")
+            finally:
+                self.wait_seconds += loop.time() - started
+        else:
+            await slots.acquire()
+        
+        self.in_flight += 1
+        try:
+            return await self.client.request(method, url, **kwargs)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            slots.release()
+    
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """Send a GET request through the pool."""
+        return await self.request("GET", url, **kwargs)
+    
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """Send a POST request through the pool."""
+        return await self.request("POST", url, **kwargs)
+    
+    async def warm_up(self, connections: int) -> None:
+        """
+        Open connections ahead of the first real request.
+        
+        Args:
+            connections: Number of concurrent connections to open
+        """
+        if not self.warmup_url or connections <= 0:
+            return
+        
+        async def touch():
+            try:
+                await self.client.head(self.warmup_url)
+            except Exception as e:
+                print(f"Connection warm-up failed for {self.name}: {e}")
+        
+        await asyncio.gather(*(touch() for _ in range(connections)))
+    
+    async def aclose(self) -> None:
+        """Close the client and all pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+        
+        Idle keep-alive connections are not reported: httpx does not expose
+        its connection pool, and counting them would mean reading private
+        transport state that can change between releases.
+        
+        Returns:
+            Dictionary with request counters and the in-flight limit
+        """
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_in_flight": settings.HTTP_MAX_CONNECTIONS,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "errors": self.errors
+        }
+
+class HTTPClientRegistry:
+    """Process-wide registry of pooled clients, opened and closed with the app."""
+    
+    def __init__(self):
+        self._clients: Dict[str, PooledClient] = {}
+    
+    def register(self, name: str, warmup_url: Optional[str] = None) -> PooledClient:
+        """
+        Get or create the pooled client for an upstream.
+        
+        Args:
+            name: Upstream name (e.g., "yelp")
+            warmup_url: URL to touch when pre-warming, or None to skip warm-up
+        
+        Returns:
+            Pooled client
+        """
+        if name not in self._clients:
+            self._clients[name] = PooledClient(name, warmup_url)
+        elif warmup_url:
+            self._clients[name].warmup_url = warmup_url
+        return self._clients[name]
+    
+    async def startup(self) -> None:
+        """Create clients and pre-warm connections."""
+        for pooled in self._clients.values():
+            pooled.open()
+        
+        await asyncio.gather(*(
+            pooled.warm_up(settings.HTTP_PREWARM_CONNECTIONS)
+            for pooled in self._clients.values()
+        ))
+    
+    async def shutdown(self) -> None:
+        """Close all clients."""
+        for pooled in self._clients.values():
+            await pooled.aclose()
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for every registered client."""
+        return {name: pooled.stats() for name, pooled in self._clients.items()}
+
+# Global instance
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,314 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.util import geohash
+from app.util.distance import get_bounding_box, haversine_distance, points_within_radius
+
+# Identical-query tolerance for searches that hit the Yelp result limit
+SAME_CENTER_MILES = 0.05
+
+def business_from_place(place: Any) -> Dict[str, Any]:
+    """
+    Build a Yelp-style business payload from a stored place.
+    
+    Args:
+        place: Place row
+    
+    Returns:
+        Business dict with the fields the search pipeline reads
+    """
+    return {
+        "id": place.provider_id,
+        "name": place.name,
+        "coordinates": {"latitude": place.lat, "longitude": place.lng},
+        "location": {
+            "address1": place.address or "",
+            "city": place.city,
+            "state": place.state,
+            "country": place.country
+        },
+        "rating": place.rating,
+        "review_count": place.user_ratings_total,
+        "phone": place.phone,
+        "url": place.website,
+        "price": place.price,
+        "categories": place.categories or []
+    }
+
+class PlaceIndex:
+    """
+    In-memory geohash index over every place seen so far.
+    
+    Places are bucketed by geohash cell. Radius queries visit the cells under
+    the query's bounding box and cut candidates by exact distance. Each Yelp
+    search is also recorded as covered ground: a later search whose circle
+    lies inside a fresh, complete earlier search (one that returned fewer
+    results than the limit) for the same query key is answered from the index.
+    """
+    
+    def __init__(
+        self,
+        precision: int = 5,
+        coverage_precision: int = 3,
+        ttl_seconds: int = 86400
+    ):
+        self.precision = precision
+        self.coverage_precision = coverage_precision
+        self.ttl_seconds = ttl_seconds
+        
+        self._cells: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._place_cells: Dict[str, str] = {}
+        self._coverage: Dict[str, List[Dict[str, Any]]] = {}
+        
+        self.loaded = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._place_cells)
+    
+    def add_businesses(self, businesses: Iterable[Dict[str, Any]], key: Optional[str] = None) -> int:
+        """
+        Add or refresh businesses.
+        
+        Args:
+            businesses: Yelp-style business payloads
+            key: Query key the businesses were returned for, if any
+        
+        Returns:
+            Number of businesses indexed
+        """
+        count = 0
+        now = time.time()
+        for business in businesses:
+            coordinates = business.get("coordinates") or {}
+            lat, lng = coordinates.get("latitude"), coordinates.get("longitude")
+            if lat is None or lng is None:
+                continue
+            
+            place_id = business["id"]
+            cell = geohash.encode(lat, lng, self.precision)
+            previous_cell = self._place_cells.get(place_id)
+            
+            keys: Set[str] = set()
+            if previous_cell is not None:
+                entry = self._cells[previous_cell].pop(place_id)
+                keys = entry["keys"]
+                if not self._cells[previous_cell]:
+                    del self._cells[previous_cell]
+            if key is not None:
+                keys.add(key)
+            
+            # Search payloads carry a distance from that search's center
+            payload = {field: value for field, value in business.items() if field != "distance"}
+            self._cells.setdefault(cell, {})[place_id] = {
+                "business": payload,
+                "lat": lat,
+                "lng": lng,
+                "keys": keys,
+                "updated_at": now
+            }
+            self._place_cells[place_id] = cell
+            count += 1
+        return count
+    
+    def get(self, place_id: str) -> Optional[Dict[str, Any]]:
+        """Get an indexed business by ID."""
+        cell = self._place_cells.get(place_id)
+        if cell is None:
+            return None
+        return self._cells[cell][place_id]["business"]
+    
+    def within_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        key: Optional[str] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find indexed places within a radius.
+        
+        Args:
+            lat, lng: Center coordinates
+            radius_miles: Radius in miles
+            key: Only include places returned for this query key
+        
+        Returns:
+            List of (business, distance_miles) pairs, nearest first
+        """
+        min_lat, max_lat, min_lon, max_lon = get_bounding_box(lat, lng, radius_miles)
+        entries = []
+        for cell in geohash.cells_covering(min_lat, max_lat, min_lon, max_lon, self.precision):
+            for entry in self._cells.get(cell, {}).values():
+                if key is None or key in entry["keys"]:
+                    entries.append(entry)
+        
+        indices, distances = points_within_radius(
+            lat, lng,
+            [entry["lat"] for entry in entries],
+            [entry["lng"] for entry in entries],
+            radius_miles
+        )
+        found = [
+            (entries[index]["business"], float(distance_miles))
+            for index, distance_miles in zip(indices, distances)
+        ]
+        found.sort(key=lambda item: item[1])
+        return found
+    
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int,
+        max_radius_miles: float = 50.0,
+        key: Optional[str] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find the k nearest indexed places.
+        
+        The search radius starts at about one cell and doubles until k places
+        are found or the maximum radius is reached.
+        
+        Args:
+            lat, lng: Center coordinates
+            k: Number of places to return
+            max_radius_miles: Give up beyond this distance
+            key: Only include places returned for this query key
+        
+        Returns:
+            Up to k (business, distance_miles) pairs, nearest first
+        """
+        if k <= 0 or not self._place_cells:
+            return []
+        
+        lat_step, _ = geohash.cell_size(self.precision)
+        radius = min(max_radius_miles, lat_step * 69.0)
+        while True:
+            found = self.within_radius(lat, lng, radius, key)
+            if len(found) >= k or radius >= max_radius_miles:
+                return found[:k]
+            radius = min(max_radius_miles, radius * 2)
+    
+    def record_search(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        key: str,
+        businesses: List[Dict[str, Any]],
+        limit: int
+    ) -> None:
+        """
+        Index a Yelp search's results and remember the area it covered.
+        
+        Args:
+            lat, lng: Search center
+            radius_miles: Search radius in miles
+            key: Query key (see the search routes)
+            businesses: Returned businesses
+            limit: Result limit the search was made with
+        """
+        self.add_businesses(businesses, key)
+        
+        now = time.time()
+        record = {
+            "key": key,
+            "lat": lat,
+            "lng": lng,
+            "radius": radius_miles,
+            "complete": len(businesses) < limit,
+            "recorded_at": now
+        }
+        
+        # File the record under every coarse cell its circle touches, so a
+        # lookup only needs the cell of the query center
+        min_lat, max_lat, min_lon, max_lon = get_bounding_box(lat, lng, radius_miles)
+        for cell in geohash.cells_covering(min_lat, max_lat, min_lon, max_lon, self.coverage_precision):
+            records = [
+                existing for existing in self._coverage.get(cell, [])
+                if now - existing["recorded_at"] < self.ttl_seconds
+            ]
+            records.append(record)
+            self._coverage[cell] = records
+    
+    def _covering_record(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        key: str
+    ) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        cell = geohash.encode(lat, lng, self.coverage_precision)
+        for record in reversed(self._coverage.get(cell, [])):
+            if record["key"] != key or now - record["recorded_at"] >= self.ttl_seconds:
+                continue
+            
+            offset = haversine_distance(lat, lng, record["lat"], record["lng"])
+            if record["complete"]:
+                if offset + radius_miles <= record["radius"]:
+                    return record
+            elif offset <= SAME_CENTER_MILES and abs(radius_miles - record["radius"]) <= SAME_CENTER_MILES:
+                # A truncated search only stands in for the same search
+                return record
+        return None
+    
+    def covered_businesses(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        key: str
+    ) -> Optional[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Answer a search from the index if an earlier search covered its area.
+        
+        Args:
+            lat, lng: Search center
+            radius_miles: Search radius in miles
+            key: Query key
+        
+        Returns:
+            List of (business, distance_miles) pairs nearest first, or None
+            if the area has not been fully searched recently
+        """
+        if self._covering_record(lat, lng, radius_miles, key) is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return self.within_radius(lat, lng, radius_miles, key)
+    
+    async def load_from_db(self) -> int:
+        """
+        Index every stored place.
+        
+        Returns:
+            Number of places loaded
+        """
+        from sqlalchemy import select
+        from app.db.base import AsyncSessionLocal
+        from app.models.place import Place
+        
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(Place))
+            places = result.scalars().all()
+        
+        self.loaded = self.add_businesses(business_from_place(place) for place in places)
+        return self.loaded
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            "places": len(self._place_cells),
+            "cells": len(self._cells),
+            "coverage_records": len({id(record) for records in self._coverage.values() for record in records}),
+            "loaded": self.loaded,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+# Global instance
+place_index = PlaceIndex(ttl_seconds=settings.CACHE_TTL_SECONDS) if settings.PLACE_INDEX_ENABLED else None
@@ -0,0 +1,263 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Dict, Any, Optional, Tuple
+from app.core.config import settings
+
+class Priority(IntEnum):
+    """Request priority classes, highest first."""
+    INTERACTIVE = 0  # A user is waiting on the response
+    BACKGROUND = 1  # Refreshes and prefetches that can be deferred
+
+class QuotaExceededError(Exception):
+    """Raised when an upstream's daily request budget is spent."""
+    
+    def __init__(self, name: str, used: int, limit: int):
+        self.name = name
+        self.used = used
+        self.limit = limit
+        super().__init__(f"{name} daily quota exhausted ({used}/{limit} requests)")
+
+# Token bucket for the Redis backend, mirroring MemoryRateLimitBackend.take_token.
+# Returns the seconds to wait before a token is available (0 when one was taken).
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 60)
+return tostring(wait)
+"""
+
+class MemoryRateLimitBackend:
+    """In-process limiter state, private to one worker."""
+    
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._counts: Dict[str, int] = {}
+    
+    async def take_token(self, key: str, rate: float, burst: float) -> float:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + max(0.0, now - ts) * rate)
+        
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        
+        self._buckets[key] = (tokens, now)
+        return wait
+    
+    async def incr_count(self, key: str, ttl_seconds: int) -> int:
+        # Drop counters for previous days so memory stays bounded
+        prefix = key.rsplit(":", 1)[0]
+        for stale in [k for k in self._counts if k.startswith(prefix) and k != key]:
+            del self._counts[stale]
+        
+        self._counts[key] = self._counts.get(key, 0) + 1
+        return self._counts[key]
+    
+    async def decr_count(self, key: str) -> int:
+        self._counts[key] = max(0, self._counts.get(key, 0) - 1)
+        return self._counts[key]
+    
+    async def aclose(self) -> None:
+        pass
+
+class RedisRateLimitBackend:
+    """Limiter state in Redis, shared by every worker using the same REDIS_URL."""
+    
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        
+        self.client = redis.from_url(url)
+        self._script = self.client.register_script(_TOKEN_BUCKET_SCRIPT)
+    
+    async def take_token(self, key: str, rate: float, burst: float) -> float:
+        wait = await self._script(keys=[f"ratelimit:{key}:bucket"], args=[rate, burst, time.time()])
+        return float(wait)
+    
+    async def incr_count(self, key: str, ttl_seconds: int) -> int:
+        pipe = self.client.pipeline()
+        pipe.incr(f"ratelimit:{key}")
+        pipe.expire(f"ratelimit:{key}", ttl_seconds)
+        count, _ = await pipe.execute()
+        return int(count)
+    
+    async def decr_count(self, key: str) -> int:
+        return int(await self.client.decr(f"ratelimit:{key}"))
+    
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+class RateLimiter:
+    """Per-second token bucket plus daily quota accounting for one upstream."""
+    
+    def __init__(
+        self,
+        name: str,
+        per_second: float,
+        daily_limit: int,
+        registry: "RateLimiterRegistry"
+    ):
+        self.name = name
+        self.per_second = per_second
+        self.daily_limit = daily_limit
+        self.registry = registry
+        
+        # Share of the daily quota that background requests may not touch
+        self.background_reserve = int(daily_limit * settings.RATE_LIMIT_INTERACTIVE_RESERVE)
+        self.quota_low_threshold = int(daily_limit * settings.RATE_LIMIT_QUOTA_LOW_FRACTION)
+        
+        self._used_today = 0
+        self._interactive_waiting = 0
+        self.granted = 0
+        self.throttled = 0
+        self.rejected = 0
+    
+    def _day_key(self) -> str:
+        return f"{self.name}:daily:{datetime.now(timezone.utc).strftime('%Y%m%d')}"
+    
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """
+        Wait for a request slot.
+        
+        Background requests yield to waiting interactive requests and may not
+        spend the share of the daily quota reserved for interactive traffic.
+        The daily slot is reserved with an atomic increment before waiting,
+        so concurrent callers (and workers sharing Redis) can't overshoot the
+        quota; it is handed back if the request is rejected or abandoned.
+        
+        Args:
+            priority: Priority class of the request
+        
+        Raises:
+            QuotaExceededError: If the daily budget for this priority is spent
+        """
+        day_key = self._day_key()
+        limit = self.daily_limit
+        if priority == Priority.BACKGROUND:
+            limit -= self.background_reserve
+        
+        used = await self.registry.call("incr_count", day_key, 2 * 86400)
+        if used > limit:
+            self._used_today = await self.registry.call("decr_count", day_key)
+            self.rejected += 1
+            raise QuotaExceededError(self.name, self._used_today, limit)
+        self._used_today = used
+        
+        if priority == Priority.INTERACTIVE:
+            self._interactive_waiting += 1
+        try:
+            while True:
+                if priority == Priority.BACKGROUND and self._interactive_waiting:
+                    wait = 1 / self.per_second
+                else:
+                    wait = await self.registry.call(
+                        "take_token", self.name, self.per_second, max(1.0, self.per_second)
+                    )
+                
+                if wait <= 0:
+                    break
+                
+                self.throttled += 1
+                await asyncio.sleep(wait)
+        except BaseException:
+            # The request never went out, so give its slot back
+            self._used_today = await asyncio.shield(self.registry.call("decr_count", day_key))
+            raise
+        finally:
+            if priority == Priority.INTERACTIVE:
+                self._interactive_waiting -= 1
+        
+        self.granted += 1
+    
+    @property
+    def remaining_today(self) -> int:
+        """Requests left today, as of the last acquire on this worker."""
+        return max(0, self.daily_limit - self._used_today)
+    
+    def is_quota_low(self) -> bool:
+        """Early signal that callers should prefer cached data."""
+        return self.remaining_today <= self.quota_low_threshold
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        return {
+            "per_second": self.per_second,
+            "daily_limit": self.daily_limit,
+            "used_today": self._used_today,
+            "remaining_today": self.remaining_today,
+            "quota_low": self.is_quota_low(),
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "rejected": self.rejected
+        }
+
+class RateLimiterRegistry:
+    """Process-wide rate limiters sharing one state backend."""
+    
+    def __init__(self):
+        self.backend = self._create_backend()
+        self._limiters: Dict[str, RateLimiter] = {}
+    
+    def _create_backend(self):
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            try:
+                return RedisRateLimitBackend(settings.REDIS_URL)
+            except Exception as e:
+                print(f"Redis rate limit backend unavailable, using in-memory limits: {e}")
+        return MemoryRateLimitBackend()
+    
+    async def call(self, method: str, *args):
+        """Call a backend method, falling back to in-memory state if Redis fails."""
+        try:
+            return await getattr(self.backend, method)(*args)
+        except Exception as e:
+            if isinstance(self.backend, MemoryRateLimitBackend):
+                raise
+            print(f"Redis rate limit backend failed, using in-memory limits: {e}")
+            self.backend = MemoryRateLimitBackend()
+            return await getattr(self.backend, method)(*args)
+    
+    def register(self, name: str, per_second: float, daily_limit: int) -> RateLimiter:
+        """
+        Get or create the limiter for an upstream.
+        
+        Args:
+            name: Upstream name (e.g., "yelp")
+            per_second: Sustained requests per second
+            daily_limit: Requests allowed per UTC day
+        
+        Returns:
+            Rate limiter
+        """
+        if name not in self._limiters:
+            self._limiters[name] = RateLimiter(name, per_second, daily_limit, self)
+        return self._limiters[name]
+    
+    def get(self, name: str) -> Optional[RateLimiter]:
+        return self._limiters.get(name)
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for every registered limiter."""
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+    
+    async def shutdown(self) -> None:
+        await self.backend.aclose()
+
+# Global instance
+rate_limiters = RateLimiterRegistry()
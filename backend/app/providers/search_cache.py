@@ -0,0 +1,155 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.providers.place_index import SAME_CENTER_MILES
+from app.util import geohash
+from app.util.distance import calculate_distance_miles
+from app.util.lru import LRUCache
+
+class SearchResultCache:
+    """
+    Scored search results keyed by a quantized center and the cuisine.
+    
+    Each search is stored under the geohash cell of its center. A later
+    search whose circle lies inside a fresh, complete stored search for the
+    same cuisine is answered by cutting that search's results to the new
+    circle, so "Atlanta, GA" at 25 miles also answers 5 and 10 miles, and the
+    same search from a nearby address in the same block reuses it. Searches
+    that were cut off (Yelp's result limit, the review fetch cap or the
+    cuisine fallback) only answer the same search again.
+    """
+    
+    def __init__(
+        self,
+        precision: int = 6,
+        ttl_seconds: int = 600,
+        max_cells: int = 4096,
+        max_entries_per_cell: int = 8
+    ):
+        self.precision = precision
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_cell = max_entries_per_cell
+        self._cells = LRUCache(max_cells)
+        
+        self.hits = 0
+        self.contained_hits = 0
+        self.misses = 0
+    
+    def put(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        key: str,
+        results: List[Tuple[Any, float, float]],
+        complete: bool
+    ) -> None:
+        """
+        Store a search's scored results.
+        
+        Args:
+            lat, lng: Search center
+            radius_miles: Search radius in miles
+            key: Normalized cuisine
+            results: List of (result, lat, lng) for every scored place
+            complete: Whether every place in the circle was scored
+        """
+        now = time.time()
+        cell_key = (geohash.encode(lat, lng, self.precision), key)
+        entries = [entry for entry in self._cells.get(cell_key, []) if entry["expires_at"] > now]
+        entries.append({
+            "lat": lat,
+            "lng": lng,
+            "radius": radius_miles,
+            "complete": complete,
+            "results": results,
+            "expires_at": now + self.ttl_seconds
+        })
+        self._cells.set(cell_key, entries[-self.max_entries_per_cell:])
+    
+    def _containing_entry(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        key: str
+    ) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        lat_step, lon_step = geohash.cell_size(self.precision)
+        
+        # The center's cell and its neighbors, so a boundary between two
+        # nearby addresses doesn't cause a miss
+        cells = geohash.cells_covering(
+            lat - lat_step, lat + lat_step, lng - lon_step, lng + lon_step, self.precision
+        )
+        
+        best = None
+        for cell in cells:
+            for entry in self._cells.get((cell, key), []):
+                if entry["expires_at"] <= now:
+                    continue
+                
+                offset = calculate_distance_miles(lat, lng, entry["lat"], entry["lng"])
+                same_search = offset <= SAME_CENTER_MILES and abs(radius_miles - entry["radius"]) <= SAME_CENTER_MILES
+                if entry["complete"]:
+                    # Only an identical search may reach past the stored circle;
+                    # anything else must lie inside it, since places outside
+                    # were never scored
+                    contained = same_search or offset + radius_miles <= entry["radius"]
+                else:
+                    contained = same_search
+                
+                if contained and (best is None or entry["radius"] < best["radius"]):
+                    best = entry
+        return best
+    
+    def get(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        key: str
+    ) -> Optional[List[Tuple[Any, float]]]:
+        """
+        Answer a search from a stored search whose circle contains it.
+        
+        Args:
+            lat, lng: Search center
+            radius_miles: Search radius in miles
+            key: Normalized cuisine
+        
+        Returns:
+            List of (result, distance_miles) pairs inside the circle, or None
+            on a miss
+        """
+        entry = self._containing_entry(lat, lng, radius_miles, key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        if radius_miles < entry["radius"]:
+            self.contained_hits += 1
+        
+        matches = []
+        for result, place_lat, place_lng in entry["results"]:
+            distance_miles = calculate_distance_miles(lat, lng, place_lat, place_lng)
+            if distance_miles <= radius_miles:
+                matches.append((result, distance_miles))
+        return matches
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "cells": len(self._cells),
+            "hits": self.hits,
+            "contained_hits": self.contained_hits,
+            "misses": self.misses
+        }
+
+# Global instance
+search_result_cache = SearchResultCache(
+    precision=settings.SEARCH_CACHE_GEOHASH_PRECISION,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+    max_cells=settings.SEARCH_CACHE_MAX_CELLS
+) if settings.SEARCH_CACHE_ENABLED else None
@@ -1,7 +1,11 @@
-import httpx
-import asyncio
+import os
 from typing import List, Dict, Any, Optional
 from app.core.config import settings
+from app.providers.cache import PersistentCache, make_cache_key
+from app.providers.http import http_clients
+from app.providers.ratelimit import Priority, QuotaExceededError, rate_limiters
+from app.util.refresh import BackgroundRefresher
+from app.util.singleflight import SingleFlight
 
 class YelpProvider:
     """Provider for Yelp Fusion API."""
@@ -13,6 +17,95 @@ class YelpProvider:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         } if self.api_key else {}
+        self.http = http_clients.register("yelp", self.base_url if self.api_key else None)
+        self.rate_limiter = rate_limiters.register(
+            "yelp", settings.YELP_RATE_LIMIT_PER_SECOND, settings.YELP_RATE_LIMIT
+        )
+        self.cache = PersistentCache(
+            os.path.join(settings.CACHE_DIR, "yelp_responses.sqlite3"),
+            ttl_seconds=settings.CACHE_TTL_SECONDS,
+            max_entries=settings.YELP_CACHE_MAX_ENTRIES,
+            stale_grace_seconds=settings.CACHE_STALE_GRACE_SECONDS
+        ) if settings.YELP_CACHE_ENABLED else None
+        self.refresher = BackgroundRefresher("yelp")
+        self.flights = SingleFlight("yelp")
+    
+    def is_quota_low(self) -> bool:
+        """Whether the daily Yelp quota is nearly spent and cached data should be preferred."""
+        return self.rate_limiter.is_quota_low()
+    
+    async def _get_json(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Dict[str, Any]:
+        """
+        GET a Yelp endpoint, serving from the response cache when possible.
+        
+        Interactive requests are served stale entries inside the cache's grace
+        window immediately, and one background request refreshes the entry.
+        Background requests always revalidate stale entries themselves.
+        Expired cache entries are still served while the daily quota is low.
+        
+        Args:
+            endpoint: API path (e.g., "/businesses/search")
+            params: Query parameters
+            priority: Rate limiting priority class
+            
+        Returns:
+            Decoded JSON response
+        """
+        key = make_cache_key(endpoint, params)
+        if self.cache is not None:
+            quota_low = self.is_quota_low()
+            cached = await self.cache.lookup(key, allow_expired=quota_low)
+            if cached is not None and not cached.is_expired:
+                return cached.value
+            
+            if cached is not None and (quota_low or priority == Priority.INTERACTIVE):
+                if not quota_low:
+                    self.refresher.schedule(
+                        key, lambda: self._fetch_json(key, endpoint, params, Priority.BACKGROUND)
+                    )
+                return cached.value
+        
+        return await self._fetch_json(key, endpoint, params, priority)
+    
+    async def _fetch_json(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        priority: Priority
+    ) -> Dict[str, Any]:
+        """
+        Fetch an endpoint from Yelp and store the response in the cache.
+        
+        Identical concurrent fetches share one upstream request.
+        """
+        return await self.flights.do(key, lambda: self._request_json(key, endpoint, params, priority))
+    
+    async def _request_json(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        priority: Priority
+    ) -> Dict[str, Any]:
+        await self.rate_limiter.acquire(priority)
+        
+        response = await self.http.get(
+            f"{self.base_url}{endpoint}",
+            headers=self.headers,
+            params=params
+        )
+        response.raise_for_status()
+        
+        data = response.json()
+        if self.cache is not None:
+            await self.cache.set(key, data)
+        return data
     
     async def search_businesses(
         self,
@@ -21,7 +114,8 @@ class YelpProvider:
         radius_meters: int,
         term: Optional[str] = None,
         categories: Optional[List[str]] = None,
-        limit: int = 50
+        limit: int = 50,
+        priority: Priority = Priority.INTERACTIVE
     ) -> List[Dict[str, Any]]:
         """
         Search for businesses using Yelp Fusion API.
@@ -32,6 +126,7 @@ class YelpProvider:
             term: Search term (e.g., "pizza")
             categories: List of category aliases
             limit: Maximum number of results
+            priority: Rate limiting priority class
             
         Returns:
             List of business data
@@ -40,41 +135,40 @@ class YelpProvider:
             return self._mock_search_businesses(latitude, longitude, term)
         
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "radius": radius_meters,
-                    "limit": limit,
-                    "sort_by": "rating"
-                }
-                
-                if term:
-                    params["term"] = term
-                
-                if categories:
-                    params["categories"] = ",".join(categories)
-                
-                response = await client.get(
-                    f"{self.base_url}/businesses/search",
-                    headers=self.headers,
-                    params=params
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                return data.get("businesses", [])
-                
+            params = {
+                "latitude": latitude,
+                "longitude": longitude,
+                "radius": radius_meters,
+                "limit": limit,
+                "sort_by": "rating"
+            }
+            
+            if term:
+                params["term"] = term
+            
+            if categories:
+                params["categories"] = ",".join(sorted(categories))
+            
+            data = await self._get_json("/businesses/search", params, priority)
+            return data.get("businesses", [])
+            
+        except QuotaExceededError:
+            raise
         except Exception as e:
             print(f"Yelp search failed: {e}")
             return []
     
-    async def get_business_details(self, business_id: str) -> Optional[Dict[str, Any]]:
+    async def get_business_details(
+        self,
+        business_id: str,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Optional[Dict[str, Any]]:
         """
         Get detailed information about a business.
         
         Args:
             business_id: Yelp business ID
+            priority: Rate limiting priority class
             
         Returns:
             Business details or None if failed
@@ -83,15 +177,10 @@ class YelpProvider:
             return self._mock_business_details(business_id)
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/businesses/{business_id}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                
-                return response.json()
-                
+            return await self._get_json(f"/businesses/{business_id}", priority=priority)
+            
+        except QuotaExceededError:
+            raise
         except Exception as e:
             print(f"Failed to get business details for {business_id}: {e}")
             return None
@@ -99,7 +188,8 @@ class YelpProvider:
     async def get_business_reviews(
         self,
         business_id: str,
-        limit: int = 50
+        limit: int = 50,
+        priority: Priority = Priority.INTERACTIVE
     ) -> List[Dict[str, Any]]:
         """
         Get reviews for a business.
@@ -107,6 +197,7 @@ class YelpProvider:
         Args:
             business_id: Yelp business ID
             limit: Maximum number of reviews
+            priority: Rate limiting priority class
             
         Returns:
             List of review data
@@ -115,19 +206,13 @@ class YelpProvider:
             return self._mock_business_reviews(business_id)
         
         try:
-            async with httpx.AsyncClient() as client:
-                params = {"limit": limit}
-                
-                response = await client.get(
-                    f"{self.base_url}/businesses/{business_id}/reviews",
-                    headers=self.headers,
-                    params=params
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                return data.get("reviews", [])
-                
+            params = {"limit": limit}
+            
+            data = await self._get_json(f"/businesses/{business_id}/reviews", params, priority)
+            return data.get("reviews", [])
+            
+        except QuotaExceededError:
+            raise
         except Exception as e:
             print(f"Failed to get reviews for {business_id}: {e}")
             return []
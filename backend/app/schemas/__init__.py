@@ -1,9 +1,12 @@
 # Pydantic Schemas Package
 
-from .search import SearchRequest, SearchResponse, SearchResult, Coordinates, RestaurantLinks
+from .search import (
+    SearchRequest, SearchResponse, SearchResult, Coordinates, RestaurantLinks, SearchStreamComplete
+)
 from .place import PlaceDetail, PlaceDetailResponse, GlutenSnippet
 
 __all__ = [
     'SearchRequest', 'SearchResponse', 'SearchResult', 'Coordinates', 'RestaurantLinks',
+    'SearchStreamComplete',
     'PlaceDetail', 'PlaceDetailResponse', 'GlutenSnippet'
 ] 
\ No newline at end of file
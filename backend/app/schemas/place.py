@@ -33,4 +33,5 @@ class PlaceDetailResponse(BaseModel):
     place: PlaceDetail
     glutenSignal: Optional[Dict[str, Any]]
     glutenSnippets: List[GlutenSnippet]
-    links: Dict[str, str] 
\ No newline at end of file
+    links: Dict[str, str]
+    servedFrom: str = Field("live", description="live (fetched from the provider) or storage (stored place)") 
\ No newline at end of file
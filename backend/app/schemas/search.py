@@ -32,6 +32,7 @@ class SearchResult(BaseModel):
     rating: Optional[float]
     userRatingsTotal: Optional[int]
     links: RestaurantLinks
+    servedFrom: str = Field("live", description="live (scored from provider reviews) or storage (stored signal)")
 
 class SearchResponse(BaseModel):
     """Schema for search response."""
@@ -39,4 +40,12 @@ class SearchResponse(BaseModel):
     rankingExplainer: str = "Confidence = Wilson lower bound on gluten-safety sentiment + volume bonus"
     results: List[SearchResult]
     totalResults: int
-    searchTime: float = Field(..., description="Search time in seconds") 
\ No newline at end of file
+    searchTime: float = Field(..., description="Search time in seconds") 
+
+class SearchStreamComplete(BaseModel):
+    """Schema for the final frame of a streaming search."""
+    center: Coordinates
+    rankingExplainer: str = "Confidence = Wilson lower bound on gluten-safety sentiment + volume bonus"
+    order: List[str] = Field(..., description="Place IDs in final ranked order")
+    totalResults: int
+    searchTime: float = Field(..., description="Search time in seconds")
@@ -4,12 +4,20 @@ from .wilson import (
     wilson_confidence,
     calculate_volume_bonus,
     calculate_confidence_score,
-    get_confidence_breakdown
+    get_confidence_breakdown,
+    wilson_confidence_batch,
+    calculate_volume_bonus_batch,
+    calculate_confidence_score_batch,
+    get_confidence_breakdown_batch
 )
 
 __all__ = [
     'wilson_confidence',
     'calculate_volume_bonus', 
     'calculate_confidence_score',
-    'get_confidence_breakdown'
+    'get_confidence_breakdown',
+    'wilson_confidence_batch',
+    'calculate_volume_bonus_batch',
+    'calculate_confidence_score_batch',
+    'get_confidence_breakdown_batch'
 ] 
\ No newline at end of file
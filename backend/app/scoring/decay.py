@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from app.scoring.wilson import calculate_confidence_score
+
+def _as_utc(moment: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+def decay_factor(elapsed_seconds: float, half_life_seconds: float) -> float:
+    """
+    Weight remaining after elapsed_seconds with the given half-life.
+    
+    Args:
+        elapsed_seconds: Time since the event (negative values grow the weight)
+        half_life_seconds: Time for a weight to halve
+        
+    Returns:
+        Decay multiplier
+    """
+    return 0.5 ** (elapsed_seconds / half_life_seconds)
+
+@dataclass
+class DecayAccumulator:
+    """
+    Exponentially decayed review counts.
+    
+    Sums are stored as of reference_at. Adding a review only rescales the sums
+    when it is newer than the reference, so every update is O(1) and no review
+    is ever re-read.
+    """
+    positive: float = 0.0
+    negative: float = 0.0
+    total: float = 0.0
+    reference_at: Optional[datetime] = None
+    
+    def advance(self, moment: datetime, half_life_seconds: float) -> None:
+        """Move the reference time forward to moment, decaying the sums."""
+        moment = _as_utc(moment)
+        if self.reference_at is None:
+            self.reference_at = moment
+            return
+        
+        reference_at = _as_utc(self.reference_at)
+        if moment > reference_at:
+            factor = decay_factor((moment - reference_at).total_seconds(), half_life_seconds)
+            self.positive *= factor
+            self.negative *= factor
+            self.total *= factor
+            self.reference_at = moment
+    
+    def add(
+        self,
+        positive: int,
+        negative: int,
+        total: int,
+        created_at: datetime,
+        half_life_seconds: float,
+        sign: int = 1
+    ) -> None:
+        """
+        Add (or with sign=-1, remove) one review's counts.
+        
+        Args:
+            positive: 1 if the review is positive
+            negative: 1 if the review is negative
+            total: 1 if the review is gluten related
+            created_at: When the review was written
+            half_life_seconds: Decay half-life
+            sign: 1 to add, -1 to remove
+        """
+        self.advance(created_at, half_life_seconds)
+        age = (_as_utc(self.reference_at) - _as_utc(created_at)).total_seconds()
+        weight = sign * decay_factor(age, half_life_seconds)
+        
+        # Removing a review can leave float dust below zero
+        self.positive = max(0.0, self.positive + positive * weight)
+        self.negative = max(0.0, self.negative + negative * weight)
+        self.total = max(0.0, self.total + total * weight)
+    
+    def decayed_to(self, moment: datetime, half_life_seconds: float) -> "DecayAccumulator":
+        """Copy of the sums as of a later moment, leaving this accumulator unchanged."""
+        copy = DecayAccumulator(self.positive, self.negative, self.total, self.reference_at)
+        copy.advance(moment, half_life_seconds)
+        return copy
+    
+    def confidence(self, moment: datetime, half_life_seconds: float) -> float:
+        """
+        Recency-weighted confidence score as of moment.
+        
+        Args:
+            moment: Scoring time
+            half_life_seconds: Decay half-life
+            
+        Returns:
+            Confidence score from 0 to 100
+        """
+        decayed = self.decayed_to(moment, half_life_seconds)
+        return calculate_decayed_confidence_score(decayed.positive, decayed.negative, decayed.total)
+
+def calculate_decayed_confidence_score(
+    positive_weight: float,
+    negative_weight: float,
+    total_weight: float,
+    z: float = 1.96
+) -> float:
+    """
+    Confidence score over decayed review weights.
+    
+    The Wilson bound and volume bonus treat the weights as effective review
+    counts, so a review one half-life old counts as half a review.
+    
+    Args:
+        positive_weight: Decayed positive gluten reviews
+        negative_weight: Decayed negative gluten reviews
+        total_weight: Decayed gluten-related reviews
+        z: Z-score for confidence level
+        
+    Returns:
+        Confidence score from 0 to 100
+    """
+    return calculate_confidence_score(positive_weight, negative_weight, total_weight, z)
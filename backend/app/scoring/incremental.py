@@ -0,0 +1,285 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Float, case, cast, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.gluten_signal import GlutenSignal
+from app.models.review import Review
+from app.nlp.analysis import ReviewAnalysis
+from app.scoring.decay import DecayAccumulator
+from app.scoring.wilson import calculate_confidence_score
+
+def stamp_review_analysis(review: Review, analysis: ReviewAnalysis) -> Review:
+    """
+    Record a review's analysis on the row so later deltas don't re-analyze it.
+    
+    Args:
+        review: Review row
+        analysis: Analysis of the review's text
+    
+    Returns:
+        The same review
+    """
+    review.is_gluten_related = analysis.is_gluten_related
+    review.gluten_sentiment = analysis.sentiment if analysis.is_gluten_related else None
+    return review
+
+def review_counts(review: Review) -> Tuple[int, int, int]:
+    """
+    Get a review's contribution to the signal counters.
+    
+    Args:
+        review: Review row with stamped analysis
+    
+    Returns:
+        Tuple of (positive, negative, gluten_related) increments
+    """
+    if not review.is_gluten_related:
+        return 0, 0, 0
+    
+    return (
+        1 if review.gluten_sentiment == "positive" else 0,
+        1 if review.gluten_sentiment == "negative" else 0,
+        1
+    )
+
+def apply_review_delta(
+    signal: GlutenSignal,
+    added: Iterable[Review] = (),
+    removed: Iterable[Review] = (),
+    scored_at: Optional[datetime] = None
+) -> GlutenSignal:
+    """
+    Update a place's signal for newly seen and removed reviews.
+    
+    Only the counters touched by the delta change; confidence and positivity
+    rate are then recomputed from the counters in constant time. The decayed
+    counters are updated the same way, weighting each review by its age.
+    
+    Args:
+        signal: Signal to update in place
+        added: Newly stored reviews
+        removed: Reviews no longer returned by the provider
+        scored_at: Scoring time, defaulting to now
+    
+    Returns:
+        The updated signal
+    """
+    added, removed = list(added), list(removed)
+    scored_at = scored_at or datetime.now(timezone.utc)
+    half_life_seconds = settings.SCORE_HALF_LIFE_DAYS * 86400
+    
+    decayed = DecayAccumulator(
+        signal.decayed_positive or 0.0,
+        signal.decayed_negative or 0.0,
+        signal.decayed_total or 0.0,
+        signal.decay_reference_at
+    )
+    
+    positive = signal.positive_gluten_reviews or 0
+    negative = signal.negative_gluten_reviews or 0
+    total = signal.gluten_review_count or 0
+    
+    for sign, reviews in ((1, added), (-1, removed)):
+        for review in reviews:
+            review_positive, review_negative, review_total = review_counts(review)
+            positive += sign * review_positive
+            negative += sign * review_negative
+            total += sign * review_total
+            
+            if review_total:
+                decayed.add(
+                    review_positive, review_negative, review_total,
+                    review.published_at or scored_at, half_life_seconds, sign
+                )
+    
+    # Removing reviews that were never counted must not drive counters negative
+    signal.positive_gluten_reviews = max(0, positive)
+    signal.negative_gluten_reviews = max(0, negative)
+    signal.gluten_review_count = max(0, total)
+    
+    signal.decayed_positive = decayed.positive
+    signal.decayed_negative = decayed.negative
+    signal.decayed_total = decayed.total
+    signal.decay_reference_at = decayed.reference_at
+    
+    return rescore_signal(signal, scored_at)
+
+def rescore_signal(signal: GlutenSignal, scored_at: Optional[datetime] = None) -> GlutenSignal:
+    """
+    Recompute a signal's scores from its counters and decayed sums.
+    
+    Args:
+        signal: Signal to update in place
+        scored_at: Scoring time, defaulting to now
+    
+    Returns:
+        The updated signal
+    """
+    scored_at = scored_at or datetime.now(timezone.utc)
+    
+    polarized = (signal.positive_gluten_reviews or 0) + (signal.negative_gluten_reviews or 0)
+    signal.positivity_rate = (signal.positive_gluten_reviews or 0) / max(1, polarized)
+    signal.confidence = calculate_confidence_score(
+        signal.positive_gluten_reviews or 0,
+        signal.negative_gluten_reviews or 0,
+        signal.gluten_review_count or 0
+    )
+    signal.decayed_confidence = decayed_confidence_at(signal, scored_at)
+    
+    signal.last_scored_at = scored_at
+    return signal
+
+def decayed_confidence_at(signal: GlutenSignal, moment: Optional[datetime] = None) -> float:
+    """
+    Recency-weighted confidence of a stored signal, without touching its reviews.
+    
+    Args:
+        signal: Stored signal
+        moment: Scoring time, defaulting to now
+    
+    Returns:
+        Confidence score from 0 to 100
+    """
+    decayed = DecayAccumulator(
+        signal.decayed_positive or 0.0,
+        signal.decayed_negative or 0.0,
+        signal.decayed_total or 0.0,
+        signal.decay_reference_at
+    )
+    return decayed.confidence(moment or datetime.now(timezone.utc), settings.SCORE_HALF_LIFE_DAYS * 86400)
+
+async def update_gluten_signal(
+    db: AsyncSession,
+    place_id,
+    added: Iterable[Review] = (),
+    removed: Iterable[Review] = ()
+) -> GlutenSignal:
+    """
+    Apply a review delta to a place's stored signal, creating it if needed.
+    
+    The caller owns the transaction and commits.
+    
+    Args:
+        db: Database session
+        place_id: Place primary key
+        added: Newly stored reviews
+        removed: Reviews no longer returned by the provider
+    
+    Returns:
+        The updated signal
+    """
+    signal = await db.get(GlutenSignal, place_id)
+    if signal is None:
+        signal = _empty_signal(place_id)
+        db.add(signal)
+    
+    return apply_review_delta(signal, added, removed)
+
+# Counters summed by the signal upsert, and the decayed sums merged by it
+_COUNT_COLUMNS = ("gluten_review_count", "positive_gluten_reviews", "negative_gluten_reviews")
+_DECAYED_COLUMNS = ("decayed_positive", "decayed_negative", "decayed_total")
+
+def _empty_signal(place_id) -> GlutenSignal:
+    return GlutenSignal(
+        place_id=place_id,
+        gluten_review_count=0,
+        positive_gluten_reviews=0,
+        negative_gluten_reviews=0
+    )
+
+def signal_delta_values(place_id, added: Iterable[Review], scored_at: datetime) -> Dict[str, Any]:
+    """
+    Column values of a signal holding only the given reviews.
+    
+    Args:
+        place_id: Place primary key
+        added: Newly stored reviews
+        scored_at: Scoring time
+    
+    Returns:
+        Column values keyed by column name
+    """
+    delta = apply_review_delta(_empty_signal(place_id), added, scored_at=scored_at)
+    return {
+        column.name: getattr(delta, column.name)
+        for column in GlutenSignal.__table__.columns
+    }
+
+async def upsert_gluten_signals(
+    db: AsyncSession,
+    added_by_place: Dict[Any, List[Review]],
+    scored_at: Optional[datetime] = None
+) -> int:
+    """
+    Add newly stored reviews to their places' signals, creating them if needed.
+    
+    The counters are added in the database with one INSERT ... ON CONFLICT
+    (place_id) DO UPDATE, so concurrent writers never lose each other's
+    reviews. Decayed sums are merged at the later of the two reference times.
+    The upsert locks each row until the caller commits, so the scores
+    recomputed from the returned counters are written back without racing.
+    
+    Args:
+        db: Database session
+        added_by_place: Newly stored reviews by place primary key
+        scored_at: Scoring time, defaulting to now
+    
+    Returns:
+        Number of signals updated
+    """
+    scored_at = scored_at or datetime.now(timezone.utc)
+    rows = [
+        signal_delta_values(place_id, reviews, scored_at)
+        for place_id, reviews in added_by_place.items()
+        if reviews
+    ]
+    if not rows:
+        return 0
+    
+    half_life_seconds = settings.SCORE_HALF_LIFE_DAYS * 86400
+    statement = insert(GlutenSignal).values(rows)
+    stored, new = GlutenSignal.__table__.c, statement.excluded
+    
+    # Half-lives from the stored reference time to the new one
+    gap = cast(func.extract("epoch", new.decay_reference_at - stored.decay_reference_at), Float) / half_life_seconds
+    
+    def merged(name: str):
+        # Decay whichever sum is older to the newer reference time, then add
+        return case(
+            (
+                stored.decay_reference_at.is_(None) | new.decay_reference_at.is_(None),
+                func.coalesce(stored[name], 0.0) + func.coalesce(new[name], 0.0)
+            ),
+            (gap > 0, stored[name] * func.power(0.5, gap) + new[name]),
+            else_=stored[name] + new[name] * func.power(0.5, -gap)
+        )
+    
+    updates = {name: func.coalesce(stored[name], 0) + new[name] for name in _COUNT_COLUMNS}
+    updates.update({name: merged(name) for name in _DECAYED_COLUMNS})
+    updates["decay_reference_at"] = func.greatest(stored.decay_reference_at, new.decay_reference_at)
+    updates["last_scored_at"] = new.last_scored_at
+    
+    statement = statement.on_conflict_do_update(
+        index_elements=["place_id"], set_=updates
+    ).returning(
+        GlutenSignal.place_id,
+        *(getattr(GlutenSignal, name) for name in _COUNT_COLUMNS + _DECAYED_COLUMNS),
+        GlutenSignal.decay_reference_at
+    )
+    result = await db.execute(statement)
+    
+    scores = []
+    for row in result.all():
+        signal = rescore_signal(GlutenSignal(**row._mapping), scored_at)
+        scores.append({
+            "place_id": signal.place_id,
+            "positivity_rate": signal.positivity_rate,
+            "confidence": signal.confidence,
+            "decayed_confidence": signal.decayed_confidence
+        })
+    
+    if scores:
+        await db.execute(update(GlutenSignal), scores)
+    return len(scores)
@@ -1,5 +1,6 @@
 import math
-from typing import Tuple
+import numpy as np
+from typing import Dict, Tuple
 
 def wilson_confidence(phat: float, n: int, z: float = 1.96) -> float:
     """
@@ -125,4 +126,121 @@ def get_confidence_breakdown(
         "phat": phat,
         "polarized_reviews": polarized_reviews,
         "total_reviews": total_reviews
-    } 
\ No newline at end of file
+    }
+
+def _log10(values: np.ndarray) -> np.ndarray:
+    """
+    math.log10 applied element-wise.
+    
+    np.log10 can differ from math.log10 in the last bit; review counts take
+    few distinct values, so evaluating math.log10 once per distinct value
+    keeps batch results identical to the scalar functions.
+    """
+    unique, inverse = np.unique(values, return_inverse=True)
+    logs = np.array([math.log10(value) for value in unique], dtype=np.float64)
+    return logs[inverse].reshape(values.shape)
+
+def wilson_confidence_batch(phat: np.ndarray, n: np.ndarray, z: float = 1.96) -> np.ndarray:
+    """
+    Vectorized wilson_confidence.
+    
+    Args:
+        phat: Observed proportions of positive reviews
+        n: Total numbers of reviews
+        z: Z-score for confidence level (default 1.96 for 95% confidence)
+        
+    Returns:
+        Wilson lower bounds, matching wilson_confidence element-wise
+    """
+    phat = np.asarray(phat, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    valid = n > 0
+    safe_n = np.where(valid, n, 1.0)
+    
+    # Same operation order as the scalar version so results are identical
+    z2 = z * z
+    denom = 1 + z2 / safe_n
+    center = phat + z2 / (2 * safe_n)
+    margin = z * np.sqrt((phat * (1 - phat) + z2 / (4 * safe_n)) / safe_n)
+    lb = (center - margin) / denom
+    
+    return np.where(valid, np.clip(lb, 0.0, 1.0), 0.0)
+
+def calculate_volume_bonus_batch(n: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_volume_bonus.
+    
+    Args:
+        n: Numbers of reviews
+        
+    Returns:
+        Volume bonus scores (0 to 1)
+    """
+    n = np.asarray(n, dtype=np.float64)
+    valid = n > 0
+    bonus = np.minimum(1.0, np.maximum(0.0, _log10(np.where(valid, n, 0.0) + 1)) / 2.0)
+    return np.where(valid, bonus, 0.0)
+
+def get_confidence_breakdown_batch(
+    positive_reviews: np.ndarray,
+    negative_reviews: np.ndarray,
+    total_reviews: np.ndarray,
+    z: float = 1.96
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized get_confidence_breakdown.
+    
+    Args:
+        positive_reviews: Numbers of positive gluten reviews
+        negative_reviews: Numbers of negative gluten reviews
+        total_reviews: Total numbers of gluten-related reviews
+        z: Z-score for confidence level
+        
+    Returns:
+        Dictionary of arrays with the same keys as get_confidence_breakdown
+    """
+    positive_reviews = np.asarray(positive_reviews, dtype=np.int64)
+    negative_reviews = np.asarray(negative_reviews, dtype=np.int64)
+    total_reviews = np.asarray(total_reviews, dtype=np.int64)
+    
+    polarized_reviews = positive_reviews + negative_reviews
+    polarized = polarized_reviews > 0
+    
+    phat = np.where(polarized, positive_reviews / np.where(polarized, polarized_reviews, 1), 0.0)
+    wilson_lb = np.where(polarized, wilson_confidence_batch(phat, polarized_reviews, z), 0.0)
+    volume_bonus = np.where(polarized, calculate_volume_bonus_batch(total_reviews), 0.0)
+    
+    # Combine scores: 70% Wilson + 30% volume bonus, on a 0-100 scale
+    raw_score = 0.7 * wilson_lb + 0.3 * volume_bonus
+    confidence = np.round(100 * np.clip(raw_score, 0.0, 1.0))
+    confidence = np.where(polarized & (total_reviews > 0), confidence, 0.0)
+    
+    return {
+        "confidence": confidence,
+        "wilson_lower_bound": wilson_lb,
+        "volume_bonus": volume_bonus,
+        "phat": phat,
+        "polarized_reviews": np.where(polarized, polarized_reviews, 0),
+        "total_reviews": total_reviews
+    }
+
+def calculate_confidence_score_batch(
+    positive_reviews: np.ndarray,
+    negative_reviews: np.ndarray,
+    total_reviews: np.ndarray,
+    z: float = 1.96
+) -> np.ndarray:
+    """
+    Vectorized calculate_confidence_score.
+    
+    Args:
+        positive_reviews: Numbers of positive gluten reviews
+        negative_reviews: Numbers of negative gluten reviews
+        total_reviews: Total numbers of gluten-related reviews
+        z: Z-score for confidence level
+        
+    Returns:
+        Confidence scores from 0 to 100
+    """
+    return get_confidence_breakdown_batch(positive_reviews, negative_reviews, total_reviews, z)["confidence"]
+
@@ -4,14 +4,22 @@ from .distance import (
     haversine_distance,
     calculate_distance_miles,
     is_within_radius,
-    get_bounding_box
+    get_bounding_box,
+    haversine_distance_batch,
+    is_within_radius_batch,
+    points_within_radius
 )
 from .cuisine import cuisine_mapper
+from .lru import LRUCache
 
 __all__ = [
     'haversine_distance',
     'calculate_distance_miles',
     'is_within_radius',
     'get_bounding_box',
-    'cuisine_mapper'
+    'haversine_distance_batch',
+    'is_within_radius_batch',
+    'points_within_radius',
+    'cuisine_mapper',
+    'LRUCache'
 ] 
\ No newline at end of file
@@ -1,6 +1,8 @@
 import math
+import numpy as np
 from typing import Tuple, Optional
-from app.core.config import settings
+
+EARTH_RADIUS_MILES = 3959
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -23,7 +25,7 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     c = 2 * math.asin(math.sqrt(a))
     
     # Radius of Earth in miles
-    r = 3959
+    r = EARTH_RADIUS_MILES
     
     return c * r
 
@@ -31,25 +33,21 @@ def calculate_distance_miles(
     lat1: float, 
     lon1: float, 
     lat2: float, 
-    lon2: float,
-    use_postgis: bool = True
+    lon2: float
 ) -> float:
     """
     Calculate distance between two points in miles.
     
+    Queries over stored places run in PostGIS instead (app.db.spatial),
+    using the same spherical distance.
+    
     Args:
         lat1, lon1: First point coordinates
         lat2, lon2: Second point coordinates
-        use_postgis: Whether to use PostGIS if available
         
     Returns:
         Distance in miles
     """
-    if use_postgis and settings.POSTGIS_ENABLED:
-        # In a real implementation, this would use PostGIS ST_Distance
-        # For now, fall back to Haversine
-        pass
-    
     return haversine_distance(lat1, lon1, lat2, lon2)
 
 def is_within_radius(
@@ -57,8 +55,7 @@ def is_within_radius(
     center_lon: float,
     point_lat: float,
     point_lon: float,
-    radius_miles: float,
-    use_postgis: bool = True
+    radius_miles: float
 ) -> bool:
     """
     Check if a point is within the specified radius of a center point.
@@ -67,13 +64,12 @@ def is_within_radius(
         center_lat, center_lon: Center point coordinates
         point_lat, point_lon: Point to check coordinates
         radius_miles: Radius in miles
-        use_postgis: Whether to use PostGIS if available
         
     Returns:
         True if point is within radius, False otherwise
     """
     distance = calculate_distance_miles(
-        center_lat, center_lon, point_lat, point_lon, use_postgis
+        center_lat, center_lon, point_lat, point_lon
     )
     return distance <= radius_miles
 
@@ -104,4 +100,109 @@ def get_bounding_box(
     min_lon = center_lon - lon_delta
     max_lon = center_lon + lon_delta
     
-    return (min_lat, max_lat, min_lon, max_lon) 
\ No newline at end of file
+    return (min_lat, max_lat, min_lon, max_lon)
+
+def haversine_distance_batch(
+    center_lat: float,
+    center_lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized haversine_distance from one center to many points.
+    
+    Args:
+        center_lat, center_lon: Center point coordinates
+        lats, lons: Arrays of point coordinates
+        
+    Returns:
+        Array of distances in miles
+    """
+    lat1, lon1 = math.radians(center_lat), math.radians(center_lon)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lons, dtype=np.float64))
+    
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    
+    return c * EARTH_RADIUS_MILES
+
+def _bounding_box_mask(
+    center_lat: float,
+    center_lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    radius_miles: float
+) -> np.ndarray:
+    """
+    Cheap first-stage reject: points outside the circle's bounding box.
+    
+    Unlike get_bounding_box's flat-earth approximation, the bounds here are
+    exact on the sphere, so no point inside the radius is ever rejected.
+    Longitudes are compared modulo 360 to handle the antimeridian.
+    """
+    angular_radius = radius_miles / EARTH_RADIUS_MILES
+    lat_delta = math.degrees(angular_radius)
+    mask = np.abs(lats - center_lat) <= lat_delta
+    
+    # Near the poles the circle spans every longitude
+    if abs(center_lat) + lat_delta >= 90:
+        return mask
+    
+    lon_delta = math.degrees(math.asin(min(1.0, math.sin(angular_radius) / math.cos(math.radians(center_lat)))))
+    dlon = np.abs((lons - center_lon + 180.0) % 360.0 - 180.0)
+    return mask & (dlon <= lon_delta)
+
+def points_within_radius(
+    center_lat: float,
+    center_lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    radius_miles: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the points within a radius, computing distances only for points
+    that pass the bounding box check.
+    
+    Args:
+        center_lat, center_lon: Center point coordinates
+        lats, lons: Arrays of point coordinates
+        radius_miles: Radius in miles
+        
+    Returns:
+        Tuple of (indices of points within the radius in input order, their distances in miles)
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    
+    candidates = np.flatnonzero(_bounding_box_mask(center_lat, center_lon, lats, lons, radius_miles))
+    distances = haversine_distance_batch(center_lat, center_lon, lats[candidates], lons[candidates])
+    
+    within = distances <= radius_miles
+    return candidates[within], distances[within]
+
+def is_within_radius_batch(
+    center_lat: float,
+    center_lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    radius_miles: float
+) -> np.ndarray:
+    """
+    Vectorized is_within_radius.
+    
+    Args:
+        center_lat, center_lon: Center point coordinates
+        lats, lons: Arrays of point coordinates
+        radius_miles: Radius in miles
+        
+    Returns:
+        Boolean array, True for points within the radius
+    """
+    indices, _ = points_within_radius(center_lat, center_lon, lats, lons, radius_miles)
+    mask = np.zeros(np.shape(lats), dtype=bool)
+    mask[indices] = True
+    return mask
+
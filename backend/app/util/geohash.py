@@ -0,0 +1,118 @@
+from typing import List, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(_BASE32)}
+
+def encode(lat: float, lon: float, precision: int = 6) -> str:
+    """
+    Encode coordinates as a geohash.
+    
+    Args:
+        lat, lon: Coordinates
+        precision: Number of characters (5 ≈ 4.9 km cells, 6 ≈ 1.2 × 0.6 km)
+    
+    Returns:
+        Geohash string
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    
+    while len(chars) < precision:
+        rng, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    
+    return "".join(chars)
+
+def decode_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """
+    Get the bounds of a geohash cell.
+    
+    Args:
+        geohash: Geohash string
+    
+    Returns:
+        Tuple of (min_lat, max_lat, min_lon, max_lon)
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """
+    Get the size of cells at a precision.
+    
+    Args:
+        precision: Geohash length
+    
+    Returns:
+        Tuple of (lat_degrees, lon_degrees)
+    """
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+def cells_covering(
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+    precision: int
+) -> List[str]:
+    """
+    List the geohash cells that intersect a bounding box.
+    
+    Args:
+        min_lat, max_lat, min_lon, max_lon: Bounding box
+        precision: Geohash length
+    
+    Returns:
+        Geohashes of every intersecting cell
+    """
+    lat_step, lon_step = cell_size(precision)
+    min_lat, max_lat = max(-90.0, min_lat), min(90.0, max_lat)
+    if max_lon - min_lon >= 360.0:
+        min_lon, max_lon = -180.0, 180.0 - lon_step / 2
+    
+    # Snap to cell centers so every intersecting cell is visited exactly once
+    first_lat = (int((min_lat + 90.0) // lat_step) + 0.5) * lat_step - 90.0
+    first_lon = (int((min_lon + 180.0) // lon_step) + 0.5) * lon_step - 180.0
+    
+    cells = []
+    lat = first_lat
+    while lat - lat_step / 2 <= max_lat and lat < 90.0:
+        lon = first_lon
+        while lon - lon_step / 2 <= max_lon:
+            wrapped = (lon + 180.0) % 360.0 - 180.0
+            cells.append(encode(lat, wrapped, precision))
+            lon += lon_step
+        lat += lat_step
+    
+    return list(dict.fromkeys(cells))
@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+class LRUCache:
+    """Bounded in-process LRU cache with optional per-entry expiry."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        # key -> (value, monotonic expiry time or None)
+        self._entries: OrderedDict = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value and mark it as recently used.
+        
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+            
+        Returns:
+            Cached value or default
+        """
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return default
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Entry lifetime, or None to keep until evicted
+        """
+        if self.max_size <= 0:
+            return
+        
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
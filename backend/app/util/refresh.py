@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+class BackgroundRefresher:
+    """
+    Runs at most one background refresh per key.
+    
+    Used for stale-while-revalidate: a caller serving a stale value schedules
+    a refresh and returns immediately. Further schedules for the same key
+    are ignored until that refresh finishes.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: Dict[str, asyncio.Task] = {}
+        
+        self.scheduled = 0
+        self.coalesced = 0
+        self.failures = 0
+    
+    def schedule(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Start a background refresh unless one is already running for the key.
+        
+        Args:
+            key: Refresh key
+            refresh: Coroutine function performing the refresh
+        
+        Returns:
+            True if a refresh was started
+        """
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.coalesced += 1
+            return False
+        
+        self._tasks[key] = loop.create_task(self._run(key, refresh))
+        self.scheduled += 1
+        return True
+    
+    async def _run(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failures += 1
+            print(f"Background refresh failed for {self.name} {key}: {e}")
+        finally:
+            if self._tasks.get(key) is asyncio.current_task():
+                del self._tasks[key]
+    
+    def in_flight(self) -> int:
+        return sum(1 for task in self._tasks.values() if not task.done())
+    
+    async def shutdown(self) -> None:
+        """Cancel running refreshes."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get refresh statistics."""
+        return {
+            "in_flight": self.in_flight(),
+            "scheduled": self.scheduled,
+            "coalesced": self.coalesced,
+            "failures": self.failures
+        }
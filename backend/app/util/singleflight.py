@@ -0,0 +1,69 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one in-flight call.
+    
+    The first caller for a key starts the call; callers arriving while it
+    runs await the same task and get its result or exception. Nothing is
+    kept once the call finishes, so there is no staleness to trade off.
+    The task is shielded, so a cancelled caller doesn't cancel the call for
+    everyone else.
+    """
+    
+    def __init__(self, name: str, max_tracked_keys: int = 256):
+        self.name = name
+        self.max_tracked_keys = max_tracked_keys
+        self._flights: Dict[str, asyncio.Task] = {}
+        
+        self.calls = 0
+        self.coalesced = 0
+        self.coalesced_by_key: Counter = Counter()
+    
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call, or join the identical call already in flight.
+        
+        Args:
+            key: Normalized call key
+            call: Coroutine function performing the call
+        
+        Returns:
+            Result of the shared call
+        """
+        loop = asyncio.get_running_loop()
+        task = self._flights.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self._count_coalesced(key)
+        else:
+            task = loop.create_task(call())
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self._flights[key] = task
+            self.calls += 1
+        
+        return await asyncio.shield(task)
+    
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            task.exception()
+    
+    def _count_coalesced(self, key: str) -> None:
+        self.coalesced += 1
+        self.coalesced_by_key[key] += 1
+        if len(self.coalesced_by_key) > self.max_tracked_keys:
+            # Keep the hottest keys so the counter stays bounded
+            self.coalesced_by_key = Counter(dict(self.coalesced_by_key.most_common(self.max_tracked_keys // 2)))
+    
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Get coalescing statistics, including the most coalesced keys."""
+        return {
+            "in_flight": sum(1 for task in self._flights.values() if not task.done()),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "hot_keys": dict(self.coalesced_by_key.most_common(top))
+        }
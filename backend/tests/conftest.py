@@ -0,0 +1,21 @@
+import pytest
+from app.api import routes
+from app.providers.search_cache import SearchResultCache
+
+def make_business(business_id, lat=33.749, lng=-84.388, categories=(), **fields):
+    """Build a Yelp business payload; keyword arguments override or add top-level fields."""
+    return {
+        "id": business_id,
+        "name": business_id.title(),
+        "coordinates": {"latitude": lat, "longitude": lng},
+        "location": {"address1": "1 Main St", "city": "Atlanta", "state": "GA", "country": "US"},
+        "categories": [{"alias": alias, "title": alias.title()} for alias in categories],
+        "url": f"https://www.yelp.com/biz/{business_id}",
+        **fields
+    }
+
+@pytest.fixture(autouse=True)
+def isolated_search_cache(monkeypatch):
+    """Give every test an empty search result cache so searches never leak between tests."""
+    if routes.search_result_cache is not None:
+        monkeypatch.setattr(routes, "search_result_cache", SearchResultCache())
@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from app.nlp.analysis import ReviewAnalysis, ReviewAnalyzer
+from app.nlp.cache import AnalysisCache
+from app.nlp.keywords import GlutenKeywordDetector
+
+REVIEW = "Celiac safe kitchen, though they do not have a dedicated fryer."
+
+class DictStore:
+    """In-memory stand-in for the shared analysis store."""
+    
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.fail = fail
+    
+    async def get_many(self, keys):
+        if self.fail:
+            raise ConnectionError("store down")
+        return [self.data.get(key) for key in keys]
+    
+    async def set_many(self, items, ttl_seconds):
+        if self.fail:
+            raise ConnectionError("store down")
+        self.data.update(items)
+    
+    async def aclose(self):
+        pass
+
+class TestReviewAnalysisSerialization:
+    """Test analysis round trips through JSON-compatible dicts."""
+    
+    def test_round_trip(self):
+        """Test that from_dict(to_dict()) restores the analysis."""
+        analysis = ReviewAnalyzer().analyze(REVIEW)
+        assert analysis.contributions
+        assert ReviewAnalysis.from_dict(analysis.to_dict()) == analysis
+
+class TestAnalysisCache:
+    """Test content-addressed review analysis caching."""
+    
+    def test_repeat_texts_hit_cache(self):
+        """Test that repeated reviews are analyzed once."""
+        analyzer = ReviewAnalyzer(cache=AnalysisCache(lru_size=100, ttl_seconds=60))
+        first = analyzer.analyze_many([REVIEW, "Great tacos"])
+        second = analyzer.analyze_many([REVIEW, "Great tacos"])
+        
+        assert first == second
+        assert analyzer.cache.stats()["hits"] == 2
+        assert analyzer.cache.stats()["misses"] == 2
+    
+    def test_lexicon_change_invalidates(self):
+        """Test that changing the keyword set changes every cache key."""
+        cache = AnalysisCache(lru_size=100, ttl_seconds=60)
+        analyzer = ReviewAnalyzer(cache=cache)
+        
+        detector = GlutenKeywordDetector()
+        detector.gluten_keywords.add("wheat free")
+        extended = ReviewAnalyzer(detector=detector, cache=cache)
+        
+        assert extended.lexicon_version != analyzer.lexicon_version
+        assert cache.make_key(extended.lexicon_version, REVIEW) != cache.make_key(analyzer.lexicon_version, REVIEW)
+    
+    def test_shared_store(self):
+        """Test that a second worker reuses analyses from the shared store."""
+        store = DictStore()
+        worker_a = ReviewAnalyzer(cache=AnalysisCache(lru_size=100, ttl_seconds=60, store=store))
+        worker_b = ReviewAnalyzer(cache=AnalysisCache(lru_size=100, ttl_seconds=60, store=store))
+        
+        expected = asyncio.run(worker_a.analyze_batch([REVIEW]))
+        assert len(store.data) == 1
+        
+        assert asyncio.run(worker_b.analyze_batch([REVIEW])) == expected
+        assert worker_b.cache.stats()["shared_hits"] == 1
+    
+    def test_store_failure_falls_back(self):
+        """Test that a failing shared store doesn't fail analysis."""
+        analyzer = ReviewAnalyzer(cache=AnalysisCache(lru_size=100, ttl_seconds=60, store=DictStore(fail=True)))
+        results = asyncio.run(analyzer.analyze_batch([REVIEW, REVIEW]))
+        
+        assert results[0] == results[1] == ReviewAnalyzer().analyze(REVIEW)
+        assert analyzer.cache.stats()["shared_errors"] == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__])
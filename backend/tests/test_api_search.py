@@ -1,6 +1,13 @@
+import asyncio
+import json
 import pytest
 from fastapi.testclient import TestClient
+from app.api import routes
+from app.core.config import settings
 from app.main import app
+from app.nlp.analysis import ReviewAnalyzer
+from app.nlp.executor import AnalysisExecutor
+from conftest import make_business
 
 client = TestClient(app)
 
@@ -137,5 +144,198 @@ class TestHealthCheck:
         assert "version" in data
         assert "docs" in data
 
+def make_reviews(business_id, positive, negative):
+    safe = [{"id": f"{business_id}-p{i}", "text": "Dedicated gluten free fryer, celiac safe.", "rating": 5} for i in range(positive)]
+    unsafe = [{"id": f"{business_id}-n{i}", "text": "Got glutened, no gluten free options.", "rating": 1} for i in range(negative)]
+    return safe + unsafe
+
+def fake_search(monkeypatch, businesses, reviews_by_id, failing=(), concurrency=2):
+    """Route searches through a fake provider and track its calls and review fetch concurrency."""
+    state = {"active": 0, "peak": 0, "finished": [], "searches": []}
+    
+    async def geocode_address(query):
+        return 33.749, -84.388
+    
+    async def search_businesses(**kwargs):
+        state["searches"].append(kwargs)
+        return businesses
+    
+    async def get_business_reviews(business_id, **kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            # Later businesses finish first, so completion order differs from ranking
+            await asyncio.sleep(0.002 * (len(businesses) - len(state["finished"])))
+            if business_id in failing:
+                raise RuntimeError("upstream timeout")
+            return reviews_by_id[business_id]
+        finally:
+            state["active"] -= 1
+            state["finished"].append(business_id)
+    
+    monkeypatch.setattr(settings, "SEARCH_REVIEW_CONCURRENCY", concurrency)
+    monkeypatch.setattr(routes.geocoding_provider, "geocode_address", geocode_address)
+    monkeypatch.setattr(routes.yelp_provider, "search_businesses", search_businesses)
+    monkeypatch.setattr(routes.yelp_provider, "get_business_reviews", get_business_reviews)
+    monkeypatch.setattr(routes, "place_index", None)
+    monkeypatch.setattr(routes, "persistence_writer", None)
+    return state
+
+class TestSearchFanOut:
+    """Test the concurrent review fetches behind a search."""
+    
+    def test_concurrency_never_exceeds_limit(self, monkeypatch):
+        """Test that review fetches stay under SEARCH_REVIEW_CONCURRENCY."""
+        businesses = [make_business(f"place-{i}", 33.75 + i * 0.001) for i in range(8)]
+        reviews = {business["id"]: make_reviews(business["id"], 1, 0) for business in businesses}
+        state = fake_search(monkeypatch, businesses, reviews, concurrency=2)
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        response = local_client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        
+        assert response.status_code == 200
+        assert response.json()["totalResults"] == 8
+        assert len(state["finished"]) == 8
+        assert state["peak"] == 2
+    
+    def test_results_ranked_despite_completion_order(self, monkeypatch):
+        """Test that results come back ranked, not in the order fetches finished."""
+        counts = [(0, 2), (1, 1), (3, 0), (1, 0), (5, 0), (2, 1)]
+        businesses = [make_business(f"place-{i}", 33.75 + i * 0.001) for i in range(len(counts))]
+        reviews = {
+            business["id"]: make_reviews(business["id"], positive, negative)
+            for business, (positive, negative) in zip(businesses, counts)
+        }
+        state = fake_search(monkeypatch, businesses, reviews, concurrency=3)
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        response = local_client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        results = response.json()["results"]
+        order = [result["placeId"] for result in results]
+        ranked = sorted(results, key=lambda result: (-result["confidence"], result["distanceMiles"]))
+        
+        assert response.status_code == 200
+        assert order == [result["placeId"] for result in ranked]
+        assert order != state["finished"]
+        assert len({result["confidence"] for result in results}) > 1
+    
+    def test_failed_fetch_does_not_fail_search(self, monkeypatch):
+        """Test that one business whose reviews fail is scored without reviews."""
+        businesses = [make_business(f"place-{i}", 33.75 + i * 0.001) for i in range(4)]
+        reviews = {business["id"]: make_reviews(business["id"], 2, 0) for business in businesses}
+        fake_search(monkeypatch, businesses, reviews, failing={"place-2"})
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        response = local_client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        results = {result["placeId"]: result for result in response.json()["results"]}
+        
+        assert response.status_code == 200
+        assert set(results) == set(reviews)
+        assert results["place-2"]["glutenReviewCount"] == 0
+        assert results["place-0"]["glutenReviewCount"] == 2
+    
+    def test_realistic_search_reaches_pool(self, monkeypatch):
+        """Test that a search's per-business review batches are analyzed on the pool together."""
+        executor = AnalysisExecutor(mode="thread")
+        monkeypatch.setattr(routes, "review_analyzer", ReviewAnalyzer(executor=executor))
+        businesses = [make_business(f"place-{i}", 33.75 + i * 0.001) for i in range(10)]
+        # Yelp returns up to three reviews per business
+        reviews = {
+            business["id"]: [
+                {"id": f"{business['id']}-{n}", "text": f"Review {n} of {business['id']}: dedicated gluten free fryer.", "rating": 5}
+                for n in range(3)
+            ]
+            for business in businesses
+        }
+        fake_search(monkeypatch, businesses, reviews, concurrency=10)
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        try:
+            response = local_client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        finally:
+            executor.shutdown()
+        
+        assert response.status_code == 200
+        assert all(result["glutenReviewCount"] == 3 for result in response.json()["results"])
+        assert executor.inline_threshold == 20
+        assert executor.stats()["offloaded_texts"] == 30
+
+class TestCuisineFilter:
+    """Test cuisine searches against the search payload's categories."""
+    
+    def test_known_cuisine_sent_as_categories(self, monkeypatch):
+        """Test that a mapped cuisine is searched by category, not by term."""
+        state = fake_search(monkeypatch, [], {})
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        local_client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5, "cuisine": "Sushi"})
+        
+        assert state["searches"][0]["categories"] == ["sushi", "japanese"]
+        assert state["searches"][0]["term"] is None
+    
+    def test_unknown_cuisine_sent_as_term(self, monkeypatch):
+        """Test that a cuisine without a mapping falls back to a search term."""
+        state = fake_search(monkeypatch, [], {})
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        local_client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5, "cuisine": "ramen"})
+        
+        assert state["searches"][0]["categories"] is None
+        assert state["searches"][0]["term"] == "ramen"
+    
+    def test_non_matching_businesses_never_fetched(self, monkeypatch):
+        """Test that businesses filtered out by their payload categories have no reviews fetched."""
+        businesses = [
+            make_business("tokyo-bar", 33.750, categories=["sushi"]),
+            make_business("slice-shop", 33.751, categories=["pizza"]),
+            make_business("sushi-house", 33.752),
+            make_business("ramen-ya", 33.753, categories=["japanese", "ramen"])
+        ]
+        reviews = {business["id"]: make_reviews(business["id"], 1, 0) for business in businesses}
+        state = fake_search(monkeypatch, businesses, reviews)
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        response = local_client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5, "cuisine": "sushi"})
+        placed = {result["placeId"] for result in response.json()["results"]}
+        
+        assert response.status_code == 200
+        assert placed == {"tokyo-bar", "sushi-house", "ramen-ya"}
+        assert set(state["finished"]) == placed
+    
+    def test_no_match_returns_top_ranked(self, monkeypatch):
+        """Test that a cuisine matching nothing returns the five best-ranked businesses."""
+        counts = [(0, 2), (1, 1), (3, 0), (0, 1), (5, 0), (2, 0), (4, 0), (1, 0)]
+        businesses = [make_business(f"place-{i}", 33.75 + i * 0.001, categories=["pizza"]) for i in range(len(counts))]
+        reviews = {
+            business["id"]: make_reviews(business["id"], positive, negative)
+            for business, (positive, negative) in zip(businesses, counts)
+        }
+        state = fake_search(monkeypatch, businesses, reviews)
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        response = local_client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5, "cuisine": "sushi"})
+        order = [result["placeId"] for result in response.json()["results"]]
+        
+        assert response.status_code == 200
+        assert len(state["finished"]) == 8
+        assert order == ["place-4", "place-6", "place-2", "place-5", "place-7"]
+    
+    def test_no_match_streams_only_top_ranked(self, monkeypatch):
+        """Test that the stream sends just the fallback results."""
+        counts = [(0, 2), (1, 1), (3, 0), (0, 1), (5, 0), (2, 0), (4, 0), (1, 0)]
+        businesses = [make_business(f"place-{i}", 33.75 + i * 0.001, categories=["pizza"]) for i in range(len(counts))]
+        reviews = {
+            business["id"]: make_reviews(business["id"], positive, negative)
+            for business, (positive, negative) in zip(businesses, counts)
+        }
+        fake_search(monkeypatch, businesses, reviews)
+        local_client = TestClient(app, base_url="http://localhost")
+        
+        response = local_client.post("/api/search/stream", json={"query": "Atlanta, GA", "radiusMiles": 5, "cuisine": "sushi"})
+        frames = [json.loads(line) for line in response.text.splitlines() if line]
+        
+        assert [frame["event"] for frame in frames] == ["result"] * 5 + ["complete"]
+        assert frames[-1]["data"]["order"] == ["place-4", "place-6", "place-2", "place-5", "place-7"]
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
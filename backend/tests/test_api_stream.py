@@ -0,0 +1,71 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app, base_url="http://localhost")
+
+class TestSearchStreamAPI:
+    """Test the streaming search API endpoint."""
+    
+    def test_ndjson_stream(self):
+        """Test that results stream as NDJSON and end with a complete frame."""
+        search_data = {
+            "query": "Atlanta, GA",
+            "radiusMiles": 10
+        }
+        
+        response = client.post("/api/search/stream?mock=1", json=search_data)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+        frames = [json.loads(line) for line in response.text.splitlines() if line]
+        events = [frame["event"] for frame in frames]
+        
+        assert events[-1] == "complete"
+        assert events.count("result") == len(frames) - 1
+        
+        streamed_ids = {frame["data"]["placeId"] for frame in frames[:-1]}
+        complete = frames[-1]["data"]
+        assert set(complete["order"]) == streamed_ids
+        assert complete["totalResults"] == len(complete["order"])
+        assert "center" in complete
+        assert "searchTime" in complete
+    
+    def test_stream_order_matches_search(self):
+        """Test that the final frame order matches the non-streaming endpoint."""
+        search_data = {
+            "query": "Atlanta, GA",
+            "radiusMiles": 10,
+            "cuisine": "pizza"
+        }
+        
+        search = client.post("/api/search?mock=1", json=search_data).json()
+        response = client.post("/api/search/stream?mock=1", json=search_data)
+        
+        complete = json.loads(response.text.splitlines()[-1])["data"]
+        assert complete["order"] == [result["placeId"] for result in search["results"]]
+    
+    def test_sse_stream(self):
+        """Test Server-Sent Events negotiation via the Accept header."""
+        search_data = {
+            "query": "Atlanta, GA",
+            "radiusMiles": 10
+        }
+        
+        response = client.post(
+            "/api/search/stream?mock=1",
+            json=search_data,
+            headers={"Accept": "text/event-stream"}
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        
+        events = [line[len("event: "):] for line in response.text.splitlines() if line.startswith("event: ")]
+        assert events[-1] == "complete"
+        assert "result" in events
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,79 @@
+import asyncio
+import time
+import pytest
+from app.providers.cache import PersistentCache, make_cache_key
+
+class TestCacheKey:
+    """Test cache key normalization."""
+    
+    def test_param_order_ignored(self):
+        """Test that parameter order doesn't change the key."""
+        key_a = make_cache_key("/businesses/search", {"latitude": 1.0, "longitude": 2.0})
+        key_b = make_cache_key("/businesses/search", {"longitude": 2.0, "latitude": 1.0})
+        assert key_a == key_b
+    
+    def test_none_params_dropped(self):
+        """Test that unset parameters don't change the key."""
+        key_a = make_cache_key("/businesses/search", {"term": None, "limit": 50})
+        key_b = make_cache_key("/businesses/search", {"limit": 50})
+        assert key_a == key_b
+    
+    def test_endpoint_distinguishes_keys(self):
+        """Test that different endpoints never share a key."""
+        assert make_cache_key("/businesses/a") != make_cache_key("/businesses/b")
+
+class TestPersistentCache:
+    """Test the SQLite-backed response cache."""
+    
+    def test_set_and_get(self, tmp_path):
+        """Test a round trip and hit/miss counters."""
+        cache = PersistentCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_entries=10)
+        
+        async def run():
+            assert await cache.get("key") is None
+            await cache.set("key", {"reviews": [{"id": "r1"}]})
+            return await cache.get("key")
+        
+        assert asyncio.run(run()) == {"reviews": [{"id": "r1"}]}
+        assert cache.hits == 1
+        assert cache.misses == 1
+    
+    def test_expired_entries(self, tmp_path):
+        """Test that expired entries miss unless explicitly allowed."""
+        cache = PersistentCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_entries=10)
+        
+        async def run():
+            await cache.set("key", [1, 2, 3], ttl_seconds=0)
+            return await cache.get("key"), await cache.get("key", allow_expired=True)
+        
+        fresh, stale = asyncio.run(run())
+        assert fresh is None
+        assert stale == [1, 2, 3]
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entries are evicted past max_entries."""
+        cache = PersistentCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_entries=2)
+        
+        async def run():
+            await cache.set("a", 1)
+            await cache.set("b", 2)
+            time.sleep(0.01)
+            await cache.get("a")
+            await cache.set("c", 3)
+            return [await cache.get(key) for key in ("a", "b", "c")]
+        
+        assert asyncio.run(run()) == [1, None, 3]
+        assert cache.evictions == 1
+    
+    def test_survives_restart(self, tmp_path):
+        """Test that entries persist across cache instances."""
+        path = str(tmp_path / "cache.sqlite3")
+        first = PersistentCache(path, ttl_seconds=60, max_entries=10)
+        asyncio.run(first.set("key", "value"))
+        first.close()
+        
+        second = PersistentCache(path, ttl_seconds=60, max_entries=10)
+        assert asyncio.run(second.get("key")) == "value"
+
+if __name__ == "__main__":
+    pytest.main([__file__])
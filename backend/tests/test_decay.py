@@ -0,0 +1,91 @@
+import itertools
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.models.gluten_signal import GlutenSignal
+from app.models.review import Review
+from app.scoring.decay import DecayAccumulator, calculate_decayed_confidence_score, decay_factor
+from app.scoring.incremental import apply_review_delta, decayed_confidence_at
+from app.scoring.wilson import calculate_confidence_score
+
+DAY = 86400
+HALF_LIFE = 365 * DAY
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+def make_review(sentiment: str, days_old: float) -> Review:
+    return Review(
+        review_id=str(uuid.uuid4()),
+        is_gluten_related=True,
+        gluten_sentiment=sentiment,
+        published_at=NOW - timedelta(days=days_old)
+    )
+
+class TestDecayAccumulator:
+    """Test exponentially decayed review counts."""
+    
+    def test_half_life(self):
+        """Test that a review loses half its weight per half-life."""
+        assert decay_factor(HALF_LIFE, HALF_LIFE) == 0.5
+        assert decay_factor(0, HALF_LIFE) == 1.0
+    
+    def test_order_independent(self):
+        """Test that sums don't depend on the order reviews arrive in."""
+        events = [(1, 0, 1, NOW - timedelta(days=d)) for d in (0, 100, 400, 1000)]
+        expected = sum(decay_factor((NOW - at).total_seconds(), HALF_LIFE) for *_, at in events)
+        
+        for order in itertools.permutations(events):
+            accumulator = DecayAccumulator()
+            for positive, negative, total, at in order:
+                accumulator.add(positive, negative, total, at, HALF_LIFE)
+            decayed = accumulator.decayed_to(NOW, HALF_LIFE)
+            assert decayed.positive == pytest.approx(expected)
+            assert decayed.total == pytest.approx(expected)
+    
+    def test_remove_reverses_add(self):
+        """Test that removing a review subtracts its decayed weight."""
+        accumulator = DecayAccumulator()
+        accumulator.add(0, 1, 1, NOW - timedelta(days=30), HALF_LIFE)
+        accumulator.add(1, 0, 1, NOW, HALF_LIFE)
+        accumulator.add(0, 1, 1, NOW - timedelta(days=30), HALF_LIFE, sign=-1)
+        
+        assert accumulator.negative == pytest.approx(0.0)
+        assert accumulator.positive == pytest.approx(1.0)
+    
+    def test_old_incidents_fade(self):
+        """Test that an old negative review weighs less than a recent one."""
+        old_incident = DecayAccumulator()
+        recent_incident = DecayAccumulator()
+        for accumulator, days_old in ((old_incident, 1500), (recent_incident, 10)):
+            for _ in range(5):
+                accumulator.add(1, 0, 1, NOW - timedelta(days=20), HALF_LIFE)
+            accumulator.add(0, 1, 1, NOW - timedelta(days=days_old), HALF_LIFE)
+        
+        assert old_incident.confidence(NOW, HALF_LIFE) > recent_incident.confidence(NOW, HALF_LIFE)
+    
+    def test_fresh_reviews_match_undecayed_score(self):
+        """Test that reviews written at scoring time count fully."""
+        assert calculate_decayed_confidence_score(8.0, 2.0, 12.0) == calculate_confidence_score(8, 2, 12)
+
+class TestDecayedSignal:
+    """Test decayed accumulators stored on GlutenSignal."""
+    
+    def test_signal_accumulators(self):
+        """Test that review deltas update the decayed columns."""
+        signal = GlutenSignal(gluten_review_count=0, positive_gluten_reviews=0, negative_gluten_reviews=0)
+        apply_review_delta(signal, added=[make_review("positive", 0), make_review("negative", 365)], scored_at=NOW)
+        
+        assert signal.decayed_positive == pytest.approx(1.0)
+        assert signal.decayed_negative == pytest.approx(0.5)
+        assert signal.decayed_total == pytest.approx(1.5)
+        assert signal.decayed_confidence == calculate_decayed_confidence_score(1.0, 0.5, 1.5)
+    
+    def test_confidence_drifts_without_new_reviews(self):
+        """Test that a stored signal can be rescored later from its columns alone."""
+        signal = GlutenSignal(gluten_review_count=0, positive_gluten_reviews=0, negative_gluten_reviews=0)
+        apply_review_delta(signal, added=[make_review("positive", 0) for _ in range(20)], scored_at=NOW)
+        
+        later = decayed_confidence_at(signal, NOW + timedelta(days=3 * 365))
+        assert later < signal.decayed_confidence
+
+if __name__ == "__main__":
+    pytest.main([__file__])
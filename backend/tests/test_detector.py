@@ -1,6 +1,8 @@
+import re
 import pytest
 from app.nlp.keywords import gluten_detector
 from app.nlp.sentiment import sentiment_analyzer
+from app.nlp.analysis import review_analyzer
 
 class TestGlutenKeywordDetector:
     """Test gluten keyword detection."""
@@ -73,6 +75,31 @@ class TestGlutenKeywordDetector:
         assert not gluten_detector.has_gluten_keywords("")
         assert len(gluten_detector.detect_keywords("")) == 0
         assert gluten_detector.get_keyword_count("") == 0
+    
+    def test_overlapping_keywords(self):
+        """Test that keywords nested in longer keywords are all reported."""
+        text = "Their Gluten Free Menu and GF menu are great"
+        matches = [(m.text, m.start, m.end) for m in gluten_detector.detect_matches(text)]
+        assert ("Gluten Free Menu", 6, 22) in matches
+        assert ("Gluten Free", 6, 17) in matches
+        assert ("GF menu", 27, 34) in matches
+        assert ("GF", 27, 29) in matches
+    
+    def test_matches_agree_with_per_keyword_patterns(self):
+        """Test that the combined pattern finds what one regex per keyword would."""
+        texts = [
+            "No dedicated fryer, so not safe for celiac. Got sick after the gf menu.",
+            "cross-contamination vs cross contamination vs cross contaminated",
+            "Gluten-free-menu, celiac_safe, gf2 and gf. all in one",
+        ]
+        for text in texts:
+            expected = sorted(
+                (match.group(), match.start(), match.end())
+                for keyword in gluten_detector.gluten_keywords
+                for match in re.finditer(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE)
+            )
+            actual = sorted((m.text, m.start, m.end) for m in gluten_detector.detect_matches(text))
+            assert actual == expected
 
 class TestGlutenSentimentAnalyzer:
     """Test gluten safety sentiment analysis."""
@@ -152,6 +179,39 @@ class TestGlutenSentimentAnalyzer:
         neutral_score = sentiment_analyzer.get_sentiment_score("Some gluten-free options")
         assert neutral_score == 0.0
 
+class TestNegationScoping:
+    """Test negation windows and per-indicator contributions."""
+    
+    def test_negated_negative_indicator(self):
+        """Test that a negated negative indicator counts as positive."""
+        assert sentiment_analyzer.analyze_sentiment("I never got sick eating here") == "positive"
+    
+    def test_negation_phrases_not_double_counted(self):
+        """Test that indicators containing a negation aren't flipped by it."""
+        assert sentiment_analyzer.analyze_sentiment("No cross contamination at all") == "positive"
+        assert sentiment_analyzer.analyze_sentiment("Not celiac safe") == "negative"
+    
+    def test_negation_window(self):
+        """Test that negations only reach a few tokens ahead."""
+        text = "Not the best pizza in town but they have a dedicated fryer"
+        assert sentiment_analyzer.analyze_sentiment(text) == "positive"
+    
+    def test_punctuation_ends_negation(self):
+        """Test that a negation doesn't cross clause punctuation."""
+        assert sentiment_analyzer.analyze_sentiment("Not cheap. Dedicated fryer though") == "positive"
+    
+    def test_contributions(self):
+        """Test that contributions explain the score with offsets."""
+        text = "They do not have a dedicated fryer, and I got sick."
+        contributions = sentiment_analyzer.analyze_contributions(text)
+        
+        assert [(c.phrase, c.negated, c.weight) for c in contributions] == [
+            ("dedicated fryer", True, -1),
+            ("got sick", False, -1)
+        ]
+        assert text[contributions[0].start:contributions[0].end] == "dedicated fryer"
+        assert sentiment_analyzer.classify(contributions) == "negative"
+
 class TestIntegration:
     """Test integration between keyword detection and sentiment analysis."""
     
@@ -185,5 +245,36 @@ class TestIntegration:
         score = sentiment_analyzer.get_sentiment_score(review)
         assert score == -1.0
 
+class TestReviewAnalyzer:
+    """Test single-pass review analysis."""
+    
+    def test_gluten_review_analysis(self):
+        """Test that one analysis holds keywords, offsets and sentiment."""
+        review = "Celiac safe kitchen with a dedicated fryer."
+        analysis = review_analyzer.analyze(review)
+        
+        assert analysis.is_gluten_related
+        assert analysis.sentiment == "positive"
+        assert "dedicated fryer" in [kw.lower() for kw in analysis.keywords]
+        
+        for match in analysis.matches:
+            assert review[match.start:match.end] == match.text
+    
+    def test_non_gluten_review_analysis(self):
+        """Test that reviews without gluten keywords are neutral and unmatched."""
+        analysis = review_analyzer.analyze("Great tacos and friendly service")
+        
+        assert not analysis.is_gluten_related
+        assert analysis.keywords == ()
+        assert analysis.sentiment == "neutral"
+    
+    def test_matches_agree_with_detector(self):
+        """Test that analysis keywords agree with the keyword detector."""
+        review = "Gluten-free menu, no cross contamination, and a separate kitchen"
+        analysis = review_analyzer.analyze(review)
+        
+        assert set(analysis.keywords) == set(gluten_detector.detect_keywords(review))
+        assert analysis.sentiment == sentiment_analyzer.analyze_sentiment(review)
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from app.util.distance import (
+    haversine_distance,
+    is_within_radius,
+    haversine_distance_batch,
+    is_within_radius_batch,
+    points_within_radius
+)
+
+def random_points(center_lat, center_lon, spread, count=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    lats = np.clip(center_lat + rng.uniform(-spread, spread, count), -90, 90)
+    lons = (center_lon + rng.uniform(-spread, spread, count) + 180) % 360 - 180
+    return lats, lons
+
+class TestBatchDistance:
+    """Test vectorized distance calculations against the scalar versions."""
+    
+    def test_haversine_batch_matches_scalar(self):
+        """Test that batch distances agree with haversine_distance."""
+        lats, lons = random_points(33.749, -84.388, 2.0)
+        expected = [haversine_distance(33.749, -84.388, lat, lon) for lat, lon in zip(lats, lons)]
+        np.testing.assert_allclose(haversine_distance_batch(33.749, -84.388, lats, lons), expected, rtol=1e-12)
+    
+    @pytest.mark.parametrize("center", [(33.749, -84.388), (64.8, -147.7), (-33.87, 151.21), (0.0, 179.99), (89.5, 0.0)])
+    @pytest.mark.parametrize("radius", [0.5, 10, 25, 120])
+    def test_within_radius_matches_scalar(self, center, radius):
+        """Test that the bounding box never rejects a point inside the radius."""
+        lats, lons = random_points(*center, spread=radius / 30)
+        expected = [is_within_radius(*center, lat, lon, radius) for lat, lon in zip(lats, lons)]
+        
+        assert is_within_radius_batch(*center, lats, lons, radius).tolist() == expected
+    
+    def test_points_within_radius(self):
+        """Test that indices keep input order and come with their distances."""
+        lats = [33.749, 40.7128, 33.76, 33.80]
+        lons = [-84.388, -74.006, -84.39, -84.40]
+        
+        indices, distances = points_within_radius(33.749, -84.388, lats, lons, 10)
+        
+        assert indices.tolist() == [0, 2, 3]
+        assert distances[0] == pytest.approx(0.0)
+        assert distances[2] == pytest.approx(haversine_distance(33.749, -84.388, 33.80, -84.40))
+    
+    def test_empty_input(self):
+        """Test that no points means no matches."""
+        indices, distances = points_within_radius(33.749, -84.388, [], [], 10)
+        assert len(indices) == 0 and len(distances) == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__])
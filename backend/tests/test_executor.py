@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+from app.nlp.analysis import ReviewAnalyzer
+from app.nlp.cache import AnalysisCache
+from app.nlp.executor import AnalysisExecutor
+
+TEXTS = [
+    "Celiac safe kitchen with a dedicated fryer.",
+    "They do not have a dedicated fryer and I got sick.",
+    "Lots of gluten-free options on the menu.",
+    "Great tacos and friendly service.",
+] * 10
+
+class TestAnalysisExecutor:
+    """Test offloading review analysis from the event loop."""
+    
+    def test_small_batches_run_inline(self):
+        """Test that batches under the threshold skip the pool."""
+        executor = AnalysisExecutor(mode="thread", inline_threshold=100)
+        analyzer = ReviewAnalyzer()
+        
+        results = asyncio.run(executor.analyze(analyzer, TEXTS))
+        
+        assert results == [analyzer.analyze(text) for text in TEXTS]
+        assert executor.stats()["inline_batches"] == 1
+        assert executor.stats()["offloaded_batches"] == 0
+    
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    def test_pool_matches_inline(self, mode):
+        """Test that pooled analysis returns the same analyses in order."""
+        executor = AnalysisExecutor(mode=mode, max_workers=2, inline_threshold=1, chunk_size=7)
+        analyzer = ReviewAnalyzer()
+        try:
+            results = asyncio.run(executor.analyze(analyzer, TEXTS))
+        finally:
+            executor.shutdown()
+        
+        assert results == [analyzer.analyze(text) for text in TEXTS]
+        assert executor.stats()["offloaded_texts"] == len(TEXTS)
+    
+    def test_unknown_mode(self):
+        """Test that an unknown mode is rejected."""
+        with pytest.raises(ValueError):
+            AnalysisExecutor(mode="gpu")
+    
+    def test_cache_misses_use_executor(self):
+        """Test that the analyzer sends only cache misses to the executor."""
+        executor = AnalysisExecutor(mode="thread", inline_threshold=1)
+        analyzer = ReviewAnalyzer(cache=AnalysisCache(lru_size=100, ttl_seconds=60), executor=executor)
+        try:
+            asyncio.run(analyzer.analyze_batch(TEXTS[:4]))
+            asyncio.run(analyzer.analyze_batch(TEXTS[:5]))
+        finally:
+            executor.shutdown()
+        
+        # The second batch is all cache hits, since its fifth text repeats the first
+        assert executor.stats()["offloaded_texts"] == 4
+
+class TestCombinedBatches:
+    """Test combining small concurrent batches before analysis."""
+    
+    def test_small_concurrent_batches_reach_pool(self):
+        """Test that batches under the threshold are combined into one pooled run."""
+        executor = AnalysisExecutor(mode="thread", inline_threshold=20, batch_window_seconds=0.01)
+        analyzer = ReviewAnalyzer()
+        batches = [TEXTS[i:i + 3] for i in range(0, 30, 3)]
+        
+        async def run():
+            return await asyncio.gather(*(executor.analyze(analyzer, batch) for batch in batches))
+        
+        try:
+            results = asyncio.run(run())
+        finally:
+            executor.shutdown()
+        
+        assert results == [[analyzer.analyze(text) for text in batch] for batch in batches]
+        assert executor.stats()["offloaded_batches"] == 1
+        assert executor.stats()["offloaded_texts"] == 30
+        assert executor.stats()["combined_calls"] == 10
+    
+    def test_lone_small_batch_runs_inline(self):
+        """Test that a small batch with nothing to combine with still runs inline."""
+        executor = AnalysisExecutor(mode="thread", inline_threshold=20, batch_window_seconds=0.001)
+        analyzer = ReviewAnalyzer()
+        
+        results = asyncio.run(executor.analyze(analyzer, TEXTS[:3]))
+        
+        assert results == [analyzer.analyze(text) for text in TEXTS[:3]]
+        assert executor.stats()["inline_batches"] == 1
+        assert executor.stats()["offloaded_batches"] == 0
+    
+    def test_failure_reaches_every_caller(self):
+        """Test that an error in a combined run is raised to each caller."""
+        executor = AnalysisExecutor(mode="thread", inline_threshold=100, batch_window_seconds=0.001)
+        
+        class BrokenAnalyzer(ReviewAnalyzer):
+            def analyze(self, text):
+                raise RuntimeError("bad lexicon")
+        
+        analyzer = BrokenAnalyzer()
+        
+        async def run():
+            return await asyncio.gather(
+                executor.analyze(analyzer, TEXTS[:2]),
+                executor.analyze(analyzer, TEXTS[2:4]),
+                return_exceptions=True
+            )
+        
+        results = asyncio.run(run())
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
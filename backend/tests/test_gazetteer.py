@@ -0,0 +1,101 @@
+import pytest
+from app.providers.build_gazetteer import build_gazetteer
+from app.providers.gazetteer import Gazetteer, LocalGeocoder, gazetteer_key, parse_coordinates
+
+# GeoNames postal code rows: country, postal code, place, state, state code, ..., lat, lng, accuracy
+SAMPLE_ROWS = [
+    ["US", "30301", "Atlanta", "Georgia", "GA", "Fulton", "121", "", "", "33.7500", "-84.3900", "4"],
+    ["US", "30303", "Atlanta", "Georgia", "GA", "Fulton", "121", "", "", "33.7600", "-84.3800", "4"],
+    ["US", "63101", "Saint Louis", "Missouri", "MO", "St. Louis City", "510", "", "", "38.6343", "-90.1910", "4"],
+    ["US", "10001", "New York", "New York", "NY", "New York", "061", "", "", "40.7484", "-73.9967", "4"],
+]
+
+@pytest.fixture
+def gazetteer_path(tmp_path):
+    source = tmp_path / "US.txt"
+    source.write_text("\n".join("\t".join(row) for row in SAMPLE_ROWS) + "\n")
+    output = tmp_path / "gazetteer.bin"
+    build_gazetteer(str(source), str(output))
+    return str(output)
+
+class TestParsing:
+    """Test query classification."""
+    
+    def test_coordinates(self):
+        """Test that "lat,lng" strings parse to coordinates."""
+        assert parse_coordinates("33.749,-84.388") == (33.749, -84.388)
+        assert parse_coordinates(" 33.749 , -84.388 ") == (33.749, -84.388)
+    
+    def test_non_coordinates(self):
+        """Test that addresses and out-of-range values are not coordinates."""
+        assert parse_coordinates("Atlanta, GA") is None
+        assert parse_coordinates("95.0,-84.388") is None
+    
+    def test_keys(self):
+        """Test ZIP code and city/state keys."""
+        assert gazetteer_key("30301") == "zip:30301"
+        assert gazetteer_key("30301-1234") == "zip:30301"
+        assert gazetteer_key("Atlanta, Georgia") == gazetteer_key("atlanta, GA") == "city:atlanta ga"
+        assert gazetteer_key("123 Peachtree St") is None
+
+class TestGazetteer:
+    """Test building and searching the gazetteer file."""
+    
+    def test_zip_lookup(self, gazetteer_path):
+        """Test that ZIP codes resolve to their coordinates."""
+        gazetteer = Gazetteer(gazetteer_path)
+        lat, lng = gazetteer.lookup("zip:10001")
+        assert lat == pytest.approx(40.7484, abs=1e-4)
+        assert lng == pytest.approx(-73.9967, abs=1e-4)
+        gazetteer.close()
+    
+    def test_city_lookup_uses_centroid(self, gazetteer_path):
+        """Test that cities resolve to the centroid of their ZIP codes."""
+        gazetteer = Gazetteer(gazetteer_path)
+        lat, lng = gazetteer.lookup("city:atlanta ga")
+        assert lat == pytest.approx(33.755, abs=1e-4)
+        assert lng == pytest.approx(-84.385, abs=1e-4)
+        gazetteer.close()
+    
+    def test_missing_key(self, gazetteer_path):
+        """Test that unknown keys return None."""
+        gazetteer = Gazetteer(gazetteer_path)
+        assert gazetteer.lookup("zip:99999") is None
+        assert gazetteer.lookup("city:springfield il") is None
+        gazetteer.close()
+    
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a file without the gazetteer header is rejected."""
+        path = tmp_path / "bogus.bin"
+        path.write_bytes(b"not a gazetteer file")
+        with pytest.raises(ValueError):
+            Gazetteer(str(path))
+
+class TestLocalGeocoder:
+    """Test the local geocoding front end."""
+    
+    def test_resolves_locally(self, gazetteer_path):
+        """Test coordinates, ZIP codes and city/state queries."""
+        geocoder = LocalGeocoder(gazetteer_path)
+        assert geocoder.geocode("33.749,-84.388") == (33.749, -84.388)
+        assert geocoder.geocode("63101") is not None
+        assert geocoder.geocode("Saint Louis, Missouri") is not None
+        assert geocoder.geocode("1600 Pennsylvania Ave NW") is None
+        assert geocoder.stats()["hits"] == 3
+        assert geocoder.stats()["misses"] == 1
+        geocoder.close()
+    
+    def test_coordinates_without_gazetteer(self):
+        """Test that coordinates resolve even when no gazetteer is configured."""
+        geocoder = LocalGeocoder(None)
+        assert geocoder.geocode("40.7484,-73.9967") == (40.7484, -73.9967)
+        assert geocoder.geocode("30301") is None
+    
+    def test_missing_file(self, tmp_path):
+        """Test that a missing gazetteer file disables lookups instead of failing."""
+        geocoder = LocalGeocoder(str(tmp_path / "missing.bin"))
+        assert geocoder.geocode("30301") is None
+        assert geocoder.stats()["loaded"] is False
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from app.providers.cache import PersistentCache
+from app.providers.geocache import GeocodeCache, normalize_address, quantize_coordinates
+
+class TestNormalizeAddress:
+    """Test geocode query normalization."""
+    
+    def test_case_and_whitespace(self):
+        """Test that case and extra whitespace are ignored."""
+        assert normalize_address("  Atlanta,   GA ") == normalize_address("atlanta ga")
+    
+    def test_state_names_abbreviated(self):
+        """Test that full state names map to their abbreviations."""
+        assert normalize_address("Atlanta, Georgia") == "atlanta ga"
+        assert normalize_address("Charleston, West Virginia") == "charleston wv"
+    
+    def test_only_final_state_abbreviated(self):
+        """Test that state names inside street or city names are kept."""
+        assert normalize_address("Washington St, Boston, MA") != normalize_address("WA St, Boston, MA")
+        assert normalize_address("1600 Pennsylvania Ave, Washington, DC") == "1600 pennsylvania ave washington dc"
+        assert normalize_address("Seattle, Washington 98101") == "seattle wa 98101"
+    
+    def test_bare_state_name_kept(self):
+        """Test that a lone "Washington" doesn't share a key with "WA"."""
+        assert normalize_address("Washington") != normalize_address("WA")
+    
+    def test_country_suffix_dropped(self):
+        """Test that a trailing country name is ignored."""
+        assert normalize_address("Atlanta, GA, USA") == normalize_address("Atlanta, GA")
+    
+    def test_zip_codes_kept(self):
+        """Test that ZIP codes survive normalization."""
+        assert normalize_address("30301") == "30301"
+        assert normalize_address("30301-1234") == "30301-1234"
+
+class TestQuantizeCoordinates:
+    """Test reverse geocode key quantization."""
+    
+    def test_nearby_points_share_key(self):
+        """Test that points within the quantum share a key."""
+        assert quantize_coordinates(33.74901, -84.38799, 4) == quantize_coordinates(33.74899, -84.38801, 4)
+    
+    def test_distant_points_differ(self):
+        """Test that distinct points get distinct keys."""
+        assert quantize_coordinates(33.7490, -84.3880, 4) != quantize_coordinates(33.7500, -84.3880, 4)
+
+class TestGeocodeCache:
+    """Test the two-tier geocode cache."""
+    
+    def test_persistent_tier_refills_memory(self, tmp_path):
+        """Test that a fresh process is served from the persistent tier."""
+        path = str(tmp_path / "geocode.sqlite3")
+        first = GeocodeCache(PersistentCache(path, 60, 100), lru_size=10, ttl_seconds=60, negative_ttl_seconds=5)
+        asyncio.run(first.set("forward:atlanta ga", [33.749, -84.388]))
+        first.close()
+        
+        second = GeocodeCache(PersistentCache(path, 60, 100), lru_size=10, ttl_seconds=60, negative_ttl_seconds=5)
+        assert asyncio.run(second.get("forward:atlanta ga")) == (True, [33.749, -84.388])
+        assert second.lru.stats()["entries"] == 1
+    
+    def test_negative_caching(self):
+        """Test that failed lookups are cached as hits with a None value."""
+        cache = GeocodeCache(None, lru_size=10, ttl_seconds=60, negative_ttl_seconds=5)
+        
+        async def run():
+            await cache.set("forward:nowhere", None)
+            return await cache.get("forward:nowhere")
+        
+        assert asyncio.run(run()) == (True, None)
+    
+    def test_miss(self):
+        """Test a cold miss."""
+        cache = GeocodeCache(None, lru_size=10, ttl_seconds=60, negative_ttl_seconds=5)
+        assert asyncio.run(cache.get("forward:atlanta ga")) == (False, None)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
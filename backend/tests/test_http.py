@@ -0,0 +1,111 @@
+import asyncio
+import httpx
+import pytest
+from app.core.config import settings
+from app.providers.http import HTTPClientRegistry, PooledClient
+
+def mock_client(pooled, delay=0.0):
+    """Route a pooled client through a mock transport that tracks concurrency."""
+    state = {"active": 0, "peak": 0}
+    
+    async def handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(delay)
+        state["active"] -= 1
+        return httpx.Response(200, json={"ok": True})
+    
+    pooled._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return state
+
+class TestClientReuse:
+    """Test that upstreams share one long-lived client."""
+    
+    def test_register_returns_same_client(self):
+        """Test that registering an upstream twice reuses its pool."""
+        registry = HTTPClientRegistry()
+        
+        assert registry.register("yelp") is registry.register("yelp")
+        assert registry.register("yelp") is not registry.register("opencage")
+    
+    def test_client_created_once(self):
+        """Test that the underlying client is reused across requests."""
+        pooled = PooledClient("test")
+        
+        assert pooled.client is pooled.client
+    
+    def test_shutdown_closes_and_reopens(self):
+        """Test that shutdown closes clients and a later request opens a new one."""
+        registry = HTTPClientRegistry()
+        pooled = registry.register("test")
+        
+        async def run():
+            await registry.startup()
+            first = pooled.client
+            await registry.shutdown()
+            closed = pooled.stats()["open"]
+            return first, closed, pooled.client
+        
+        first, closed, reopened = asyncio.run(run())
+        
+        assert first.is_closed
+        assert closed is False
+        assert reopened is not first and not reopened.is_closed
+
+class TestRequestLimits:
+    """Test in-flight limits and their counters."""
+    
+    def test_in_flight_capped_and_waits_counted(self, monkeypatch):
+        """Test that requests past the limit wait and are counted."""
+        monkeypatch.setattr(settings, "HTTP_MAX_CONNECTIONS", 2)
+        pooled = PooledClient("test")
+        state = mock_client(pooled, delay=0.01)
+        
+        async def run():
+            return await asyncio.gather(*(pooled.get("https://example.test/") for _ in range(5)))
+        
+        responses = asyncio.run(run())
+        stats = pooled.stats()
+        
+        assert [response.status_code for response in responses] == [200] * 5
+        assert state["peak"] == 2
+        assert stats["requests"] == 5
+        assert stats["waits"] == 3
+        assert stats["wait_seconds"] > 0
+        assert stats["in_flight"] == 0
+    
+    def test_no_waits_under_limit(self, monkeypatch):
+        """Test that requests within the limit never count as waits."""
+        monkeypatch.setattr(settings, "HTTP_MAX_CONNECTIONS", 10)
+        pooled = PooledClient("test")
+        mock_client(pooled)
+        
+        async def run():
+            await asyncio.gather(*(pooled.get("https://example.test/") for _ in range(5)))
+        
+        asyncio.run(run())
+        
+        assert pooled.stats()["waits"] == 0
+    
+    def test_pool_timeout(self, monkeypatch):
+        """Test that a request waiting past the pool timeout fails."""
+        monkeypatch.setattr(settings, "HTTP_MAX_CONNECTIONS", 1)
+        monkeypatch.setattr(settings, "HTTP_POOL_TIMEOUT_SECONDS", 0.01)
+        pooled = PooledClient("test")
+        mock_client(pooled, delay=0.05)
+        
+        async def run():
+            return await asyncio.gather(
+                pooled.get("https://example.test/"),
+                pooled.get("https://example.test/"),
+                return_exceptions=True
+            )
+        
+        first, second = asyncio.run(run())
+        
+        assert first.status_code == 200
+        assert isinstance(second, httpx.PoolTimeout)
+        assert pooled.stats()["errors"] == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+import pytest
+from app.models.gluten_signal import GlutenSignal
+from app.models.review import Review
+from app.nlp.analysis import review_analyzer
+from app.scoring.incremental import apply_review_delta, stamp_review_analysis, update_gluten_signal
+from app.scoring.wilson import calculate_confidence_score
+
+TEXTS = [
+    "Celiac safe kitchen with a dedicated fryer.",
+    "Dedicated fryer and very careful staff.",
+    "Shared fryer, I got sick.",
+    "Lots of gluten-free options.",
+    "Great tacos and friendly service.",
+]
+
+def make_review(text: str) -> Review:
+    review = Review(review_id=str(uuid.uuid4()), text=text)
+    return stamp_review_analysis(review, review_analyzer.analyze(text))
+
+def empty_signal() -> GlutenSignal:
+    return GlutenSignal(
+        place_id=uuid.uuid4(),
+        gluten_review_count=0,
+        positive_gluten_reviews=0,
+        negative_gluten_reviews=0
+    )
+
+class FakeSession:
+    """Minimal stand-in for the AsyncSession calls used by update_gluten_signal."""
+    
+    def __init__(self):
+        self.rows = {}
+    
+    async def get(self, model, key):
+        return self.rows.get(key)
+    
+    def add(self, row):
+        self.rows[row.place_id] = row
+
+class TestIncrementalSignal:
+    """Test incremental GlutenSignal maintenance."""
+    
+    def test_stamp_review_analysis(self):
+        """Test that analysis results are stored on the review row."""
+        assert make_review(TEXTS[0]).gluten_sentiment == "positive"
+        assert make_review(TEXTS[2]).gluten_sentiment == "negative"
+        
+        review = make_review(TEXTS[4])
+        assert not review.is_gluten_related
+        assert review.gluten_sentiment is None
+    
+    def test_added_reviews(self):
+        """Test that counters and scores match a full recount."""
+        signal = apply_review_delta(empty_signal(), added=[make_review(text) for text in TEXTS])
+        
+        assert signal.positive_gluten_reviews == 2
+        assert signal.negative_gluten_reviews == 1
+        assert signal.gluten_review_count == 4
+        assert signal.positivity_rate == pytest.approx(2 / 3)
+        assert signal.confidence == calculate_confidence_score(2, 1, 4)
+        assert signal.last_scored_at is not None
+    
+    def test_incremental_equals_batch(self):
+        """Test that applying deltas one at a time equals applying them together."""
+        reviews = [make_review(text) for text in TEXTS]
+        batch = apply_review_delta(empty_signal(), added=reviews)
+        
+        incremental = empty_signal()
+        for review in reviews:
+            apply_review_delta(incremental, added=[review])
+        
+        assert incremental.confidence == batch.confidence
+        assert incremental.gluten_review_count == batch.gluten_review_count
+    
+    def test_removed_reviews(self):
+        """Test that removing reviews reverses their contribution."""
+        reviews = [make_review(text) for text in TEXTS]
+        signal = apply_review_delta(empty_signal(), added=reviews)
+        apply_review_delta(signal, removed=[reviews[2]])
+        
+        assert signal.negative_gluten_reviews == 0
+        assert signal.gluten_review_count == 3
+        assert signal.confidence == calculate_confidence_score(2, 0, 3)
+    
+    def test_counters_never_negative(self):
+        """Test that removing uncounted reviews doesn't underflow."""
+        signal = apply_review_delta(empty_signal(), removed=[make_review(TEXTS[0])])
+        assert signal.positive_gluten_reviews == 0
+        assert signal.gluten_review_count == 0
+        assert signal.confidence == 0
+    
+    def test_update_creates_signal(self):
+        """Test that a missing signal row is created on first update."""
+        session = FakeSession()
+        place_id = uuid.uuid4()
+        
+        asyncio.run(update_gluten_signal(session, place_id, added=[make_review(TEXTS[0])]))
+        signal = asyncio.run(update_gluten_signal(session, place_id, added=[make_review(TEXTS[1])]))
+        
+        assert session.rows[place_id] is signal
+        assert signal.positive_gluten_reviews == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__])
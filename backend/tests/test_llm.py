@@ -0,0 +1,124 @@
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from app.nlp.analysis import ReviewAnalyzer
+from app.nlp.llm import LLMClassifier
+
+AMBIGUOUS = "Lots of gluten-free options on the menu."
+POSITIVE = "Celiac safe with a dedicated fryer."
+
+def create_stub_server(delay: float = 0.0, reply=None):
+    """Local chat-completions server that labels "options" reviews positive."""
+    app = FastAPI()
+    app.state.batches = []
+    
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        reviews = json.loads(body["messages"][-1]["content"])
+        app.state.batches.append(reviews)
+        await asyncio.sleep(delay)
+        
+        labels = ["positive" if "options" in review else "neutral" for review in reviews]
+        content = reply if reply is not None else json.dumps(labels)
+        return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+    
+    return app
+
+def create_classifier(app: FastAPI, **kwargs) -> LLMClassifier:
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    return LLMClassifier(api_key="test", base_url="http://stub/v1", client=client, **kwargs)
+
+class TestLLMClassifier:
+    """Test micro-batched LLM classification against a stub server."""
+    
+    def test_batches_reviews_into_one_request(self):
+        """Test that reviews submitted together share one prompt."""
+        app = create_stub_server()
+        classifier = create_classifier(app, batch_size=10)
+        texts = [f"Review {i} mentions gluten-free options" for i in range(5)]
+        
+        labels = asyncio.run(classifier.classify_batch(texts))
+        
+        assert labels == ["positive"] * 5
+        assert len(app.state.batches) == 1
+        assert classifier.stats()["requests"] == 1
+    
+    def test_batch_size_splits_requests(self):
+        """Test that large submissions are split into batch_size prompts."""
+        app = create_stub_server()
+        classifier = create_classifier(app, batch_size=2)
+        
+        asyncio.run(classifier.classify_batch([f"Review {i} options" for i in range(5)]))
+        
+        assert [len(batch) for batch in app.state.batches] == [2, 2, 1]
+    
+    def test_verdicts_cached_by_text(self):
+        """Test that repeated reviews aren't sent again."""
+        app = create_stub_server()
+        classifier = create_classifier(app)
+        
+        asyncio.run(classifier.classify_batch([AMBIGUOUS, AMBIGUOUS]))
+        asyncio.run(classifier.classify_batch([AMBIGUOUS]))
+        
+        assert app.state.batches == [[AMBIGUOUS]]
+    
+    def test_malformed_reply(self):
+        """Test that an unparseable reply yields no verdicts."""
+        classifier = create_classifier(create_stub_server(reply="positive"))
+        
+        assert asyncio.run(classifier.classify_batch([AMBIGUOUS])) == [None]
+        assert classifier.stats()["errors"] == 1
+    
+    def test_disabled_without_api_key(self):
+        """Test that nothing is sent when no API key is configured."""
+        classifier = LLMClassifier(api_key=None)
+        assert asyncio.run(classifier.classify_batch([AMBIGUOUS])) == [None]
+    
+    def test_cancelled_caller_leaves_shared_review(self):
+        """Test that cancelling one classify_batch doesn't cancel another caller's identical review."""
+        classifier = create_classifier(create_stub_server(delay=0.05))
+        
+        async def run():
+            first = asyncio.ensure_future(classifier.classify_batch([AMBIGUOUS]))
+            second = asyncio.ensure_future(classifier.classify_batch([AMBIGUOUS]))
+            await asyncio.sleep(0.03)
+            first.cancel()
+            return await second
+        
+        assert asyncio.run(run()) == ["positive"]
+
+class TestRefine:
+    """Test applying LLM verdicts to rule-based analyses."""
+    
+    def test_only_ambiguous_reviews_sent(self):
+        """Test that only neutral gluten reviews are classified."""
+        app = create_stub_server()
+        classifier = create_classifier(app)
+        texts = [AMBIGUOUS, POSITIVE, "Great tacos"]
+        analyses = ReviewAnalyzer().analyze_many(texts)
+        
+        refined = asyncio.run(classifier.refine(texts, analyses))
+        
+        assert app.state.batches == [[AMBIGUOUS]]
+        assert [a.sentiment for a in refined] == ["positive", "positive", "neutral"]
+    
+    def test_deadline_falls_back(self):
+        """Test that slow verdicts past the deadline keep the rule-based result."""
+        classifier = create_classifier(create_stub_server(delay=0.5))
+        texts = [AMBIGUOUS]
+        analyses = ReviewAnalyzer().analyze_many(texts)
+        
+        async def run():
+            deadline = asyncio.get_running_loop().time() + 0.05
+            return await classifier.refine(texts, analyses, deadline)
+        
+        refined = asyncio.run(run())
+        
+        assert refined[0].sentiment == "neutral"
+        assert classifier.stats()["fallbacks"] == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
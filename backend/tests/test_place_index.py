@@ -0,0 +1,181 @@
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from app.providers.place_index import PlaceIndex, business_from_place
+from app.util import geohash
+from app.util.distance import haversine_distance
+from conftest import make_business
+
+def random_businesses(center_lat, center_lon, spread, count=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    lats = np.clip(center_lat + rng.uniform(-spread, spread, count), -90, 90)
+    lons = (center_lon + rng.uniform(-spread, spread, count) + 180) % 360 - 180
+    return [make_business(f"p{i}", float(lat), float(lon)) for i, (lat, lon) in enumerate(zip(lats, lons))]
+
+class TestGeohash:
+    """Test geohash encoding and cell coverage."""
+    
+    def test_encode_known_value(self):
+        """Test encoding against a published geohash."""
+        assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    
+    def test_decode_bounds_contains_point(self):
+        """Test that a cell's bounds contain the encoded point."""
+        min_lat, max_lat, min_lon, max_lon = geohash.decode_bounds(geohash.encode(33.749, -84.388, 6))
+        
+        assert min_lat <= 33.749 <= max_lat
+        assert min_lon <= -84.388 <= max_lon
+    
+    def test_cells_covering_includes_every_point(self):
+        """Test that every point in a box falls in one of the covering cells."""
+        cells = set(geohash.cells_covering(33.6, 33.9, -84.6, -84.2, 5))
+        rng = np.random.default_rng(1)
+        for lat, lon in zip(rng.uniform(33.6, 33.9, 500), rng.uniform(-84.6, -84.2, 500)):
+            assert geohash.encode(lat, lon, 5) in cells
+    
+    def test_cells_covering_wraps_antimeridian(self):
+        """Test that boxes crossing the antimeridian cover both sides."""
+        cells = set(geohash.cells_covering(-0.1, 0.1, 179.9, 180.1, 5))
+        
+        assert geohash.encode(0.0, 179.95, 5) in cells
+        assert geohash.encode(0.0, -179.95, 5) in cells
+
+class TestPlaceIndex:
+    """Test radius and nearest-neighbour queries."""
+    
+    @pytest.mark.parametrize("center", [(33.749, -84.388), (64.8, -147.7), (-33.87, 151.21), (0.0, 179.99)])
+    @pytest.mark.parametrize("radius", [0.5, 5, 25])
+    def test_within_radius_matches_brute_force(self, center, radius):
+        """Test that radius queries return exactly the places within the radius."""
+        businesses = random_businesses(*center, spread=radius / 30)
+        index = PlaceIndex()
+        index.add_businesses(businesses)
+        
+        found = index.within_radius(*center, radius)
+        expected = {
+            business["id"] for business in businesses
+            if haversine_distance(*center, business["coordinates"]["latitude"], business["coordinates"]["longitude"]) <= radius
+        }
+        
+        assert {business["id"] for business, _ in found} == expected
+        assert [distance for _, distance in found] == sorted(distance for _, distance in found)
+    
+    def test_nearest(self):
+        """Test that k-nearest queries return the closest places in order."""
+        businesses = random_businesses(33.749, -84.388, 0.5)
+        index = PlaceIndex()
+        index.add_businesses(businesses)
+        
+        found = index.nearest(33.749, -84.388, 10)
+        distances = sorted(
+            haversine_distance(33.749, -84.388, b["coordinates"]["latitude"], b["coordinates"]["longitude"])
+            for b in businesses
+        )
+        
+        assert [distance for _, distance in found] == pytest.approx(distances[:10])
+    
+    def test_nearest_respects_max_radius(self):
+        """Test that k-nearest queries stop at the maximum radius."""
+        index = PlaceIndex()
+        index.add_businesses([make_business("near", 33.75, -84.39), make_business("far", 40.71, -74.0)])
+        
+        assert [business["id"] for business, _ in index.nearest(33.749, -84.388, 5, max_radius_miles=20)] == ["near"]
+    
+    def test_moved_place_is_reindexed(self):
+        """Test that updating a place's coordinates moves it between cells."""
+        index = PlaceIndex()
+        index.add_businesses([make_business("a", 33.749, -84.388)])
+        index.add_businesses([make_business("a", 40.7128, -74.006)])
+        
+        assert len(index) == 1
+        assert index.within_radius(33.749, -84.388, 5) == []
+        assert index.get("a")["coordinates"]["latitude"] == 40.7128
+    
+    def test_search_distance_is_not_stored(self):
+        """Test that per-search distance fields are dropped from payloads."""
+        index = PlaceIndex()
+        index.add_businesses([make_business("a", 33.749, -84.388, distance=120.5)])
+        
+        assert "distance" not in index.get("a")
+    
+    def test_business_from_place(self):
+        """Test that stored places become search-pipeline payloads."""
+        place = SimpleNamespace(
+            provider_id="yelp-1", name="Cafe", lat=33.7, lng=-84.4, address=None, city="Atlanta",
+            state="GA", country="US", rating=4.5, user_ratings_total=10, phone=None,
+            website="https://www.yelp.com/biz/cafe", price="$$", categories=None
+        )
+        business = business_from_place(place)
+        
+        assert business["id"] == "yelp-1"
+        assert business["location"]["address1"] == ""
+        assert business["review_count"] == 10
+        assert business["categories"] == []
+
+class TestSearchCoverage:
+    """Test answering searches from previously covered areas."""
+    
+    def setup_method(self):
+        self.index = PlaceIndex(ttl_seconds=3600)
+        self.businesses = [
+            make_business("a", 33.749, -84.388),
+            make_business("b", 33.80, -84.40),
+            make_business("c", 33.90, -84.50)
+        ]
+    
+    def test_contained_search_is_covered(self):
+        """Test that a search inside a complete earlier search is answered."""
+        self.index.record_search(33.749, -84.388, 15, "term:", self.businesses, limit=50)
+        
+        found = self.index.covered_businesses(33.76, -84.39, 5, "term:")
+        
+        assert [business["id"] for business, _ in found] == ["a", "b"]
+        assert self.index.hits == 1
+    
+    def test_search_outside_coverage_misses(self):
+        """Test that a search reaching outside the covered circle misses."""
+        self.index.record_search(33.749, -84.388, 5, "term:", self.businesses, limit=50)
+        
+        assert self.index.covered_businesses(33.80, -84.40, 5, "term:") is None
+        assert self.index.misses == 1
+    
+    def test_coverage_is_per_query_key(self):
+        """Test that coverage for one cuisine doesn't answer another."""
+        self.index.record_search(33.749, -84.388, 15, "pizza", self.businesses, limit=50)
+        
+        assert self.index.covered_businesses(33.749, -84.388, 5, "sushi") is None
+        self.index.record_search(33.749, -84.388, 15, "sushi", self.businesses[:1], limit=50)
+        found = self.index.covered_businesses(33.749, -84.388, 5, "sushi")
+        
+        assert [business["id"] for business, _ in found] == ["a"]
+    
+    def test_truncated_search_only_covers_itself(self):
+        """Test that a search that hit the result limit only answers the same search."""
+        self.index.record_search(33.749, -84.388, 15, "term:", self.businesses, limit=3)
+        
+        assert self.index.covered_businesses(33.749, -84.388, 5, "term:") is None
+        assert len(self.index.covered_businesses(33.749, -84.388, 15, "term:")) == 3
+    
+    def test_coverage_expires(self):
+        """Test that stale coverage is not used."""
+        self.index.record_search(33.749, -84.388, 15, "term:", self.businesses, limit=50)
+        for records in self.index._coverage.values():
+            for record in records:
+                record["recorded_at"] = time.time() - 7200
+        
+        assert self.index.covered_businesses(33.749, -84.388, 5, "term:") is None
+    
+    def test_coverage_spans_coarse_cells(self):
+        """Test that coverage is found from a neighbouring coarse cell."""
+        self.index.record_search(33.76, -84.388, 15, "term:", self.businesses, limit=50)
+        center_cell = geohash.encode(33.76, -84.388, 3)
+        other = next(
+            lat for lat in np.arange(33.76, 33.0, -0.01)
+            if geohash.encode(lat, -84.388, 3) != center_cell
+        )
+        
+        assert self.index.covered_businesses(float(other), -84.388, 2, "term:") is not None
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from app.providers.ratelimit import (
+    Priority,
+    QuotaExceededError,
+    RateLimiterRegistry,
+    MemoryRateLimitBackend
+)
+
+class YieldingBackend(MemoryRateLimitBackend):
+    """Memory backend that yields on every call, like a network round trip."""
+    
+    async def take_token(self, *args):
+        await asyncio.sleep(0)
+        return await super().take_token(*args)
+    
+    async def incr_count(self, *args):
+        await asyncio.sleep(0)
+        return await super().incr_count(*args)
+    
+    async def decr_count(self, *args):
+        await asyncio.sleep(0)
+        return await super().decr_count(*args)
+
+def make_limiter(per_second: float = 1000.0, daily_limit: int = 10, backend=None):
+    registry = RateLimiterRegistry()
+    registry.backend = backend or MemoryRateLimitBackend()
+    return registry.register("test", per_second, daily_limit)
+
+class TestRateLimiter:
+    """Test the token bucket and daily quota accounting."""
+    
+    def test_daily_quota_exhausted(self):
+        """Test that requests past the daily quota are rejected."""
+        limiter = make_limiter(daily_limit=3)
+        
+        async def run():
+            for _ in range(3):
+                await limiter.acquire()
+            with pytest.raises(QuotaExceededError):
+                await limiter.acquire()
+        
+        asyncio.run(run())
+        assert limiter.remaining_today == 0
+        assert limiter.rejected == 1
+    
+    def test_background_reserve(self):
+        """Test that background requests can't spend the interactive reserve."""
+        limiter = make_limiter(daily_limit=10)
+        limiter.background_reserve = 5
+        
+        async def run():
+            for _ in range(5):
+                await limiter.acquire(Priority.BACKGROUND)
+            with pytest.raises(QuotaExceededError):
+                await limiter.acquire(Priority.BACKGROUND)
+            
+            # Interactive requests can still use the reserve
+            await limiter.acquire(Priority.INTERACTIVE)
+        
+        asyncio.run(run())
+        assert limiter.remaining_today == 4
+    
+    def test_quota_low_signal(self):
+        """Test the early quota-low signal."""
+        limiter = make_limiter(daily_limit=10)
+        limiter.quota_low_threshold = 2
+        
+        async def run():
+            for _ in range(7):
+                await limiter.acquire()
+            assert not limiter.is_quota_low()
+            await limiter.acquire()
+            assert limiter.is_quota_low()
+        
+        asyncio.run(run())
+    
+    def test_per_second_throttling(self):
+        """Test that bursts beyond the per-second rate are delayed."""
+        limiter = make_limiter(per_second=20.0, daily_limit=100)
+        
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.gather(*(limiter.acquire() for _ in range(25)))
+            return loop.time() - start
+        
+        elapsed = asyncio.run(run())
+        
+        # 20 tokens are available up front, the other 5 refill at 20/s
+        assert elapsed >= 0.2
+        assert limiter.throttled > 0
+
+class TestQuotaAtomicity:
+    """Test that concurrent callers can't overshoot the daily quota."""
+    
+    def test_concurrent_acquires_stay_within_quota(self):
+        """Test that exactly the quota is granted when many callers race."""
+        backend = YieldingBackend()
+        limiter = make_limiter(daily_limit=5, backend=backend)
+        
+        async def run():
+            return await asyncio.gather(*(limiter.acquire() for _ in range(20)), return_exceptions=True)
+        
+        results = asyncio.run(run())
+        
+        assert results.count(None) == 5
+        assert sum(isinstance(result, QuotaExceededError) for result in results) == 15
+        assert backend._counts[limiter._day_key()] == 5
+    
+    def test_cancelled_wait_returns_slot(self):
+        """Test that a request abandoned while throttled gives its slot back."""
+        backend = MemoryRateLimitBackend()
+        limiter = make_limiter(per_second=1.0, daily_limit=5, backend=backend)
+        
+        async def run():
+            await limiter.acquire()
+            waiter = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        
+        asyncio.run(run())
+        assert backend._counts[limiter._day_key()] == 1
+        assert limiter.remaining_today == 4
+
+if __name__ == "__main__":
+    pytest.main([__file__])
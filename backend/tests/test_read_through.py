@@ -0,0 +1,295 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from app.api import routes
+from app.db.base import get_db
+from app.core.config import settings
+from app.db.store import fresh_places, is_stale
+from app.main import app
+from app.models.gluten_signal import GlutenSignal
+from app.models.place import Place
+from app.models.review import Review
+from conftest import make_business
+from app.providers.ratelimit import QuotaExceededError
+from app.nlp.analysis import ReviewAnalyzer
+from app.nlp.cache import AnalysisCache
+
+def make_place(provider_id, lat=33.75, lng=-84.39):
+    return Place(
+        id=uuid.uuid4(), provider_id=provider_id, name=provider_id.title(), lat=lat, lng=lng,
+        address="1 Main St", city="Atlanta", state="GA", country="US", rating=4.5,
+        user_ratings_total=120, website=f"https://www.yelp.com/biz/{provider_id}",
+        last_fetched_at=datetime.now(timezone.utc)
+    )
+
+def make_signal(place):
+    return GlutenSignal(
+        place_id=place.id, gluten_review_count=4, positive_gluten_reviews=3,
+        negative_gluten_reviews=1, confidence=41.0
+    )
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+    
+    def all(self):
+        return self.rows
+    
+    def scalars(self):
+        return self
+
+class FakeSession:
+    """Answers the stored place and review queries from canned rows."""
+    
+    def __init__(self, rows=(), reviews=(), fail=False):
+        self.rows = list(rows)
+        self.reviews = list(reviews)
+        self.fail = fail
+        self.statements = []
+    
+    @property
+    def queries(self):
+        return len(self.statements)
+    
+    async def execute(self, statement):
+        self.statements.append(statement)
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        if statement.column_descriptions[0]["entity"] is Review:
+            return FakeResult(self.reviews)
+        if len(statement.column_descriptions) == 3:
+            # Radius queries also select the distance
+            return FakeResult([(place, signal, 0.5) for place, signal in self.rows])
+        return FakeResult(self.rows)
+
+@pytest.fixture
+def live_search(monkeypatch):
+    """Search against stubbed upstreams, recording review fetches."""
+    fetched = []
+    
+    async def geocode_address(query):
+        return 33.749, -84.388
+    
+    async def search_businesses(**kwargs):
+        return [make_business("stored-cafe"), make_business("new-bistro", 33.76, -84.40)]
+    
+    async def get_business_reviews(business_id, **kwargs):
+        fetched.append(business_id)
+        return [{"id": f"{business_id}-1", "text": "Dedicated fryer, celiac safe.", "rating": 5}]
+    
+    monkeypatch.setattr(routes.geocoding_provider, "geocode_address", geocode_address)
+    monkeypatch.setattr(routes.yelp_provider, "search_businesses", search_businesses)
+    monkeypatch.setattr(routes.yelp_provider, "get_business_reviews", get_business_reviews)
+    monkeypatch.setattr(routes, "place_index", None)
+    monkeypatch.setattr(routes.persistence_writer, "enqueue", lambda *args: None)
+    yield fetched
+    app.dependency_overrides.clear()
+
+def use_session(session):
+    async def override():
+        yield session
+    app.dependency_overrides[get_db] = override
+
+class TestStoredQuery:
+    """Test the stored place query."""
+    
+    def test_query_joins_signals_and_checks_freshness(self):
+        """Test that one query joins signals and filters by last_fetched_at."""
+        session = FakeSession()
+        asyncio.run(fresh_places(session, ["a", "b"], 3600))
+        sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+        
+        assert session.queries == 1
+        assert "JOIN gluten_signals ON gluten_signals.place_id = places.id" in sql
+        assert "places.last_fetched_at >=" in sql
+    
+    def test_no_ids_skips_query(self):
+        """Test that an empty candidate list doesn't touch the database."""
+        session = FakeSession()
+        
+        assert asyncio.run(fresh_places(session, [], 3600)) == {}
+        assert session.queries == 0
+
+class TestSearchReadThrough:
+    """Test serving search results from stored signals."""
+    
+    def test_fresh_places_skip_review_fetch(self, live_search):
+        """Test that only places without a fresh stored signal hit Yelp."""
+        place = make_place("stored-cafe")
+        use_session(FakeSession(rows=[(place, make_signal(place))]))
+        client = TestClient(app, base_url="http://localhost")
+        
+        response = client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        results = {result["placeId"]: result for result in response.json()["results"]}
+        
+        assert response.status_code == 200
+        assert live_search == ["new-bistro"]
+        assert results["stored-cafe"]["servedFrom"] == "storage"
+        assert results["stored-cafe"]["confidence"] == 41
+        assert results["stored-cafe"]["glutenReviewCount"] == 4
+        assert results["new-bistro"]["servedFrom"] == "live"
+    
+    def test_database_error_falls_back_to_live(self, live_search):
+        """Test that a failing database never fails the search."""
+        use_session(FakeSession(fail=True))
+        client = TestClient(app, base_url="http://localhost")
+        
+        response = client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        
+        assert response.status_code == 200
+        assert sorted(live_search) == ["new-bistro", "stored-cafe"]
+        assert {result["servedFrom"] for result in response.json()["results"]} == {"live"}
+    
+    def test_quota_exhausted_serves_stored_places(self, live_search, monkeypatch):
+        """Test that fresh stored places in the circle answer a search Yelp can't."""
+        async def search_businesses(**kwargs):
+            raise QuotaExceededError("yelp", 5000, 5000)
+        
+        monkeypatch.setattr(routes.yelp_provider, "search_businesses", search_businesses)
+        place = make_place("stored-cafe")
+        session = FakeSession(rows=[(place, make_signal(place))])
+        use_session(session)
+        client = TestClient(app, base_url="http://localhost")
+        
+        response = client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        results = response.json()["results"]
+        radius_sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+        
+        assert response.status_code == 200
+        assert live_search == []
+        assert [result["placeId"] for result in results] == ["stored-cafe"]
+        assert results[0]["servedFrom"] == "storage"
+        assert "ST_DWithin(places.location" in radius_sql
+        assert "places.last_fetched_at >=" in radius_sql
+    
+    def test_quota_exhausted_without_stored_places(self, live_search, monkeypatch):
+        """Test that the search is still unavailable when nothing is stored nearby."""
+        async def search_businesses(**kwargs):
+            raise QuotaExceededError("yelp", 5000, 5000)
+        
+        monkeypatch.setattr(routes.yelp_provider, "search_businesses", search_businesses)
+        use_session(FakeSession())
+        client = TestClient(app, base_url="http://localhost")
+        
+        response = client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        
+        assert response.status_code == 503
+    
+    def test_empty_review_fetch_leaves_place_stale(self, live_search, monkeypatch):
+        """Test that a failed review fetch doesn't mark a stored place fresh."""
+        enqueued = []
+        
+        async def get_business_reviews(business_id, **kwargs):
+            # The provider returns no reviews when a fetch fails
+            return [] if business_id == "stored-cafe" else [{"id": f"{business_id}-1", "text": "Celiac safe.", "rating": 5}]
+        
+        monkeypatch.setattr(routes.yelp_provider, "get_business_reviews", get_business_reviews)
+        monkeypatch.setattr(routes.persistence_writer, "enqueue", lambda business, *args: enqueued.append(business["id"]))
+        place = make_place("stored-cafe")
+        place.last_fetched_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        
+        # The stale place's signal is past the grace window, so it isn't loaded
+        use_session(FakeSession())
+        client = TestClient(app, base_url="http://localhost")
+        
+        search = client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        
+        assert search.status_code == 200
+        assert enqueued == ["new-bistro"]
+        assert is_stale(place, settings.CACHE_TTL_SECONDS)
+    
+    def test_mock_mode_never_reads_storage(self):
+        """Test that mock searches don't query the database."""
+        session = FakeSession()
+        use_session(session)
+        client = TestClient(app, base_url="http://localhost")
+        
+        try:
+            response = client.post("/api/search?mock=1", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        assert session.queries == 0
+
+class TestPlaceDetailReadThrough:
+    """Test serving place details from stored rows."""
+    
+    def test_fresh_place_is_served_from_storage(self, live_search, monkeypatch):
+        """Test that a fresh stored place needs no Yelp calls."""
+        async def get_business_details(business_id, **kwargs):
+            raise AssertionError("Yelp should not be called")
+        
+        monkeypatch.setattr(routes.yelp_provider, "get_business_details", get_business_details)
+        place = make_place("stored-cafe")
+        review = Review(
+            review_id="r1", place_id=place.id, rating=5, text="Dedicated fryer, celiac safe.",
+            published_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+            is_gluten_related=True, gluten_sentiment="positive"
+        )
+        use_session(FakeSession(rows=[(place, make_signal(place))], reviews=[review]))
+        client = TestClient(app, base_url="http://localhost")
+        
+        response = client.get("/api/places/stored-cafe")
+        body = response.json()
+        
+        assert response.status_code == 200
+        assert body["servedFrom"] == "storage"
+        assert body["glutenSignal"]["confidence"] == 41
+        assert body["glutenSnippets"][0]["sentiment"] == "positive"
+        assert body["place"]["website"] == "https://www.yelp.com/biz/stored-cafe"
+    
+    def test_stored_snippets_use_cached_analyses(self, live_search, monkeypatch):
+        """Test that stored reviews already analyzed aren't analyzed again for their snippets."""
+        class CountingAnalyzer(ReviewAnalyzer):
+            calls = 0
+            
+            def analyze(self, text):
+                CountingAnalyzer.calls += 1
+                return super().analyze(text)
+        
+        analyzer = CountingAnalyzer(cache=AnalysisCache(lru_size=100, ttl_seconds=60))
+        monkeypatch.setattr(routes, "review_analyzer", analyzer)
+        text = "Great brunch spot. " * 20 + "They have a dedicated fryer and the staff understands celiac."
+        asyncio.run(analyzer.analyze_batch([text]))
+        place = make_place("stored-cafe")
+        review = Review(
+            review_id="r1", place_id=place.id, rating=5, text=text,
+            is_gluten_related=True, gluten_sentiment="positive"
+        )
+        use_session(FakeSession(rows=[(place, make_signal(place))], reviews=[review]))
+        client = TestClient(app, base_url="http://localhost")
+        
+        response = client.get("/api/places/stored-cafe")
+        
+        assert response.status_code == 200
+        assert "dedicated fryer" in response.json()["glutenSnippets"][0]["text"]
+        assert CountingAnalyzer.calls == 1
+    
+    def test_empty_review_fetch_is_not_stored(self, live_search, monkeypatch):
+        """Test that place details with no reviews fetched don't refresh the stored row."""
+        enqueued = []
+        
+        async def get_business_details(business_id, **kwargs):
+            return make_business(business_id)
+        
+        async def get_business_reviews(business_id, **kwargs):
+            return []
+        
+        monkeypatch.setattr(routes.yelp_provider, "get_business_details", get_business_details)
+        monkeypatch.setattr(routes.yelp_provider, "get_business_reviews", get_business_reviews)
+        monkeypatch.setattr(routes.persistence_writer, "enqueue", lambda business, *args: enqueued.append(business["id"]))
+        use_session(FakeSession(rows=[]))
+        client = TestClient(app, base_url="http://localhost")
+        
+        response = client.get("/api/places/stored-cafe")
+        
+        assert response.status_code == 200
+        assert response.json()["servedFrom"] == "live"
+        assert enqueued == []
+
+if __name__ == "__main__":
+    pytest.main([__file__])
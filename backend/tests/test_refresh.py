@@ -0,0 +1,197 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.api import routes
+from app.core.config import settings
+from app.models.gluten_signal import GlutenSignal
+from app.models.place import Place
+from app.providers.cache import PersistentCache, make_cache_key
+from app.providers.ratelimit import Priority
+from app.providers.yelp import YelpProvider
+from app.util.refresh import BackgroundRefresher
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.data
+
+class FakeHttp:
+    """Counts GETs and returns an increasing version number."""
+    
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+    
+    async def get(self, url, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return FakeResponse({"version": self.calls})
+
+def make_provider(tmp_path, grace_seconds=60, delay=0.0):
+    provider = YelpProvider()
+    provider.cache = PersistentCache(
+        str(tmp_path / "yelp.sqlite3"), ttl_seconds=60, max_entries=100, stale_grace_seconds=grace_seconds
+    )
+    provider.http = FakeHttp(delay)
+    provider.refresher = BackgroundRefresher("yelp")
+    return provider
+
+class TestBackgroundRefresher:
+    """Test per-key background refreshes."""
+    
+    def test_one_refresh_per_key(self):
+        """Test that concurrent schedules for a key start one refresh."""
+        refresher = BackgroundRefresher("test")
+        runs = []
+        
+        async def refresh(key):
+            runs.append(key)
+            await asyncio.sleep(0.01)
+        
+        async def scenario():
+            started = [refresher.schedule("a", lambda: refresh("a")) for _ in range(5)]
+            started.append(refresher.schedule("b", lambda: refresh("b")))
+            await asyncio.sleep(0.05)
+            return started
+        
+        assert asyncio.run(scenario()) == [True, False, False, False, False, True]
+        assert sorted(runs) == ["a", "b"]
+        assert refresher.stats() == {"in_flight": 0, "scheduled": 2, "coalesced": 4, "failures": 0}
+    
+    def test_key_can_refresh_again_after_completion(self):
+        """Test that a finished refresh doesn't block the next one."""
+        refresher = BackgroundRefresher("test")
+        
+        async def scenario():
+            refresher.schedule("a", lambda: asyncio.sleep(0))
+            await asyncio.sleep(0.01)
+            return refresher.schedule("a", lambda: asyncio.sleep(0))
+        
+        assert asyncio.run(scenario()) is True
+    
+    def test_failures_are_counted(self):
+        """Test that a failing refresh is logged, not raised."""
+        refresher = BackgroundRefresher("test")
+        
+        async def fail():
+            raise RuntimeError("upstream down")
+        
+        async def scenario():
+            refresher.schedule("a", fail)
+            await asyncio.sleep(0.01)
+        
+        asyncio.run(scenario())
+        assert refresher.failures == 1
+
+class TestStaleCacheEntries:
+    """Test the persistent cache's grace window."""
+    
+    def test_grace_window(self, tmp_path):
+        """Test that entries are served until the grace window ends."""
+        cache = PersistentCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_entries=10, stale_grace_seconds=30)
+        
+        async def run():
+            await cache.set("stale", {"v": 1}, ttl_seconds=-10)
+            await cache.set("dead", {"v": 2}, ttl_seconds=-40)
+            return await cache.lookup("stale"), await cache.lookup("dead")
+        
+        stale, dead = asyncio.run(run())
+        
+        assert stale.value == {"v": 1} and stale.is_expired
+        assert dead is None
+        assert cache.stats()["stale_hits"] == 1
+
+class TestYelpStaleWhileRevalidate:
+    """Test stale-while-revalidate in the Yelp provider."""
+    
+    def test_stale_entry_served_and_refreshed_once(self, tmp_path):
+        """Test that concurrent readers get the stale value and trigger one refresh."""
+        provider = make_provider(tmp_path, delay=0.01)
+        key = make_cache_key("/businesses/x", None)
+        
+        async def scenario():
+            await provider.cache.set(key, {"version": 0}, ttl_seconds=-10)
+            served = await asyncio.gather(*(provider._get_json("/businesses/x") for _ in range(5)))
+            await asyncio.sleep(0.05)
+            return served, await provider.cache.lookup(key)
+        
+        served, refreshed = asyncio.run(scenario())
+        
+        assert served == [{"version": 0}] * 5
+        assert provider.http.calls == 1
+        assert refreshed.value == {"version": 1} and not refreshed.is_expired
+    
+    def test_hard_expiry_fetches_synchronously(self, tmp_path):
+        """Test that entries past the grace window are fetched before returning."""
+        provider = make_provider(tmp_path, grace_seconds=5)
+        key = make_cache_key("/businesses/x", None)
+        
+        async def scenario():
+            await provider.cache.set(key, {"version": 0}, ttl_seconds=-10)
+            return await provider._get_json("/businesses/x")
+        
+        assert asyncio.run(scenario()) == {"version": 1}
+        assert provider.refresher.scheduled == 0
+    
+    def test_background_callers_revalidate_themselves(self, tmp_path):
+        """Test that background requests don't accept stale entries."""
+        provider = make_provider(tmp_path)
+        key = make_cache_key("/businesses/x", None)
+        
+        async def scenario():
+            await provider.cache.set(key, {"version": 0}, ttl_seconds=-10)
+            return await provider._get_json("/businesses/x", priority=Priority.BACKGROUND)
+        
+        assert asyncio.run(scenario()) == {"version": 1}
+
+class TestStoredPlaceRefresh:
+    """Test refreshing stale stored places served by searches."""
+    
+    def test_stale_stored_place_served_and_refreshed_once(self, monkeypatch):
+        """Test that a stale stored place is served and refreshed at background priority."""
+        place = Place(
+            id=uuid.uuid4(), provider_id="cafe", name="Cafe", lat=33.75, lng=-84.39,
+            last_fetched_at=datetime.now(timezone.utc) - timedelta(seconds=settings.CACHE_TTL_SECONDS + 60)
+        )
+        signal = GlutenSignal(
+            place_id=place.id, gluten_review_count=2, positive_gluten_reviews=2,
+            negative_gluten_reviews=0, confidence=30.0
+        )
+        business = {
+            "id": "cafe", "name": "Cafe", "coordinates": {"latitude": 33.75, "longitude": -84.39},
+            "location": {"address1": "1 Main St"}
+        }
+        fetches, enqueued = [], []
+        
+        async def get_business_reviews(business_id, priority=Priority.INTERACTIVE, **kwargs):
+            fetches.append(priority)
+            await asyncio.sleep(0.01)
+            return [{"id": "r1", "text": "Celiac safe, dedicated fryer.", "rating": 5}]
+        
+        monkeypatch.setattr(routes.yelp_provider, "get_business_reviews", get_business_reviews)
+        monkeypatch.setattr(routes.persistence_writer, "enqueue", lambda *args: enqueued.append(args))
+        monkeypatch.setattr(routes, "stored_place_refresher", BackgroundRefresher("stored_places"))
+        
+        async def scenario():
+            results = []
+            for _ in range(2):
+                async for _, result in routes._score_businesses([(business, 0.1)], False, {"cafe": (place, signal)}):
+                    results.append(result)
+            await asyncio.sleep(0.05)
+            return results
+        
+        results = asyncio.run(scenario())
+        
+        assert [result.servedFrom for result in results] == ["storage", "storage"]
+        assert fetches == [Priority.BACKGROUND]
+        assert len(enqueued) == 1
+        assert routes.stored_place_refresher.coalesced == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
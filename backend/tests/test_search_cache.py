@@ -0,0 +1,119 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.api import routes
+from app.main import app
+from app.providers.search_cache import SearchResultCache
+from conftest import make_business
+
+ATLANTA = (33.749, -84.388)
+
+# Roughly 0.7, 6.9 and 19.3 miles north of the center
+PLACES = [("near", 33.759, -84.388), ("midtown", 33.849, -84.388), ("far", 34.029, -84.388)]
+
+def make_results():
+    return [(place_id, lat, lng) for place_id, lat, lng in PLACES]
+
+class TestContainment:
+    """Test answering searches from a containing search."""
+    
+    def test_smaller_radius_is_filtered(self):
+        """Test that 5 and 10 mile searches are cut from a 25 mile search."""
+        cache = SearchResultCache()
+        cache.put(*ATLANTA, 25, "", make_results(), complete=True)
+        
+        five = cache.get(*ATLANTA, 5, "")
+        ten = cache.get(*ATLANTA, 10, "")
+        
+        assert [result for result, _ in five] == ["near"]
+        assert [result for result, _ in ten] == ["near", "midtown"]
+        assert ten[1][1] == pytest.approx(6.9, abs=0.1)
+        assert cache.stats()["contained_hits"] == 2
+    
+    def test_nearby_address_same_radius(self):
+        """Test that a center in the same block reuses the search."""
+        cache = SearchResultCache()
+        cache.put(*ATLANTA, 10, "", make_results(), complete=True)
+        
+        assert cache.get(33.7493, -84.3882, 10, "") is not None
+    
+    def test_circle_reaching_just_past_cached_search_misses(self):
+        """Test that a smaller circle poking out of the stored one isn't answered."""
+        cache = SearchResultCache()
+        cache.put(*ATLANTA, 10, "", make_results(), complete=True)
+        
+        # About 0.12 miles off center, so 9.9 miles reaches past the 10 mile circle
+        assert cache.get(33.7507, -84.388, 9.9, "") is None
+        assert cache.get(33.7507, -84.388, 9.8, "") is not None
+    
+    def test_circle_outside_cached_search_misses(self):
+        """Test that a circle reaching past the cached one is not answered."""
+        cache = SearchResultCache()
+        cache.put(*ATLANTA, 10, "", make_results(), complete=True)
+        
+        assert cache.get(*ATLANTA, 15, "") is None
+        assert cache.get(33.76, -84.388, 10, "") is None
+        assert cache.misses == 2
+    
+    def test_truncated_search_only_answers_itself(self):
+        """Test that a cut-off search doesn't answer smaller searches."""
+        cache = SearchResultCache()
+        cache.put(*ATLANTA, 25, "", make_results(), complete=False)
+        
+        assert cache.get(*ATLANTA, 5, "") is None
+        assert len(cache.get(*ATLANTA, 25, "")) == 3
+    
+    def test_cuisine_is_part_of_the_key(self):
+        """Test that searches for another cuisine don't match."""
+        cache = SearchResultCache()
+        cache.put(*ATLANTA, 25, "pizza", make_results(), complete=True)
+        
+        assert cache.get(*ATLANTA, 5, "sushi") is None
+        assert cache.get(*ATLANTA, 5, "pizza") is not None
+    
+    def test_expired_search_misses(self):
+        """Test that entries past the TTL are not served."""
+        cache = SearchResultCache(ttl_seconds=0)
+        cache.put(*ATLANTA, 25, "", make_results(), complete=True)
+        
+        assert cache.get(*ATLANTA, 5, "") is None
+
+class TestSearchRoute:
+    """Test the search route's use of the search result cache."""
+    
+    def test_contained_search_skips_upstream(self, monkeypatch):
+        """Test that a smaller search after a larger one calls no provider."""
+        calls = []
+        
+        async def geocode_address(query):
+            return ATLANTA
+        
+        async def search_businesses(**kwargs):
+            calls.append("search")
+            return [make_business(*place) for place in PLACES]
+        
+        async def get_business_reviews(business_id, **kwargs):
+            calls.append(business_id)
+            return [{"id": f"{business_id}-1", "text": "Dedicated fryer, celiac safe.", "rating": 5}]
+        
+        monkeypatch.setattr(routes.geocoding_provider, "geocode_address", geocode_address)
+        monkeypatch.setattr(routes.yelp_provider, "search_businesses", search_businesses)
+        monkeypatch.setattr(routes.yelp_provider, "get_business_reviews", get_business_reviews)
+        monkeypatch.setattr(routes, "place_index", None)
+        monkeypatch.setattr(routes, "persistence_writer", None)
+        monkeypatch.setattr(routes, "search_result_cache", SearchResultCache())
+        client = TestClient(app, base_url="http://localhost")
+        
+        wide = client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 25})
+        fetched = len(calls)
+        narrow = client.post("/api/search", json={"query": "Atlanta, GA", "radiusMiles": 10})
+        streamed = client.post("/api/search/stream", json={"query": "Atlanta, GA", "radiusMiles": 5})
+        
+        assert wide.status_code == narrow.status_code == streamed.status_code == 200
+        assert wide.json()["totalResults"] == 3
+        assert fetched == 4 and len(calls) == fetched
+        assert [result["placeId"] for result in narrow.json()["results"]] == ["near", "midtown"]
+        assert narrow.json()["results"][1]["distanceMiles"] == 6.9
+        assert '"order": ["near"]' in streamed.text
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,157 @@
+import asyncio
+import pytest
+from app.providers.geocache import GeocodeCache
+from app.providers.geocode import GeocodingProvider
+from app.providers.ratelimit import Priority
+from app.providers.yelp import YelpProvider
+from app.util.singleflight import SingleFlight
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.data
+
+class FakeHttp:
+    """Counts GETs and answers after a short delay."""
+    
+    def __init__(self, data):
+        self.data = data
+        self.calls = 0
+    
+    async def get(self, url, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return FakeResponse(self.data)
+
+class TestSingleFlight:
+    """Test coalescing identical concurrent calls."""
+    
+    def test_concurrent_calls_share_one_result(self):
+        """Test that callers with the same key share one call."""
+        flights = SingleFlight("test")
+        calls = []
+        
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return {"key": key}
+        
+        async def scenario():
+            return await asyncio.gather(
+                *(flights.do("a", lambda: fetch("a")) for _ in range(4)),
+                flights.do("b", lambda: fetch("b"))
+            )
+        
+        results = asyncio.run(scenario())
+        
+        assert results == [{"key": "a"}] * 4 + [{"key": "b"}]
+        assert sorted(calls) == ["a", "b"]
+        assert flights.stats() == {"in_flight": 0, "calls": 2, "coalesced": 3, "hot_keys": {"a": 3}}
+    
+    def test_exception_is_shared(self):
+        """Test that every waiting caller sees the call's exception."""
+        flights = SingleFlight("test")
+        
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream error")
+        
+        async def scenario():
+            return await asyncio.gather(*(flights.do("a", fail) for _ in range(3)), return_exceptions=True)
+        
+        results = asyncio.run(scenario())
+        
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flights.calls == 1
+    
+    def test_finished_call_is_not_reused(self):
+        """Test that sequential calls each run, so results are never stale."""
+        flights = SingleFlight("test")
+        counter = iter(range(10))
+        
+        async def fetch():
+            return next(counter)
+        
+        async def scenario():
+            return [await flights.do("a", fetch), await flights.do("a", fetch)]
+        
+        assert asyncio.run(scenario()) == [0, 1]
+        assert flights.coalesced == 0
+    
+    def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that the shared call survives one caller being cancelled."""
+        flights = SingleFlight("test")
+        
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "done"
+        
+        async def scenario():
+            first = asyncio.ensure_future(flights.do("a", fetch))
+            second = asyncio.ensure_future(flights.do("a", fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+        
+        assert asyncio.run(scenario()) == "done"
+    
+    def test_tracked_keys_are_bounded(self):
+        """Test that per-key counters keep only the hottest keys."""
+        flights = SingleFlight("test", max_tracked_keys=4)
+        
+        async def fetch():
+            await asyncio.sleep(0.01)
+        
+        async def scenario():
+            await asyncio.gather(*(flights.do(str(i % 6), fetch) for i in range(18)))
+        
+        asyncio.run(scenario())
+        
+        assert len(flights.coalesced_by_key) <= 4
+        assert flights.coalesced == 12
+
+class TestProviderCoalescing:
+    """Test that providers send one upstream request for identical calls."""
+    
+    def test_yelp_reviews(self):
+        """Test concurrent review fetches without a response cache."""
+        provider = YelpProvider()
+        provider.api_key = "test"
+        provider.cache = None
+        provider.http = FakeHttp({"reviews": [{"id": "r1", "text": "Celiac safe."}]})
+        
+        async def scenario():
+            return await asyncio.gather(*(
+                provider.get_business_reviews("cafe", priority=priority)
+                for priority in (Priority.INTERACTIVE, Priority.INTERACTIVE, Priority.BACKGROUND)
+            ))
+        
+        results = asyncio.run(scenario())
+        
+        assert [len(reviews) for reviews in results] == [1, 1, 1]
+        assert provider.http.calls == 1
+        assert provider.flights.coalesced == 2
+    
+    def test_geocode_equivalent_addresses(self):
+        """Test that addresses normalizing to the same key share one lookup."""
+        provider = GeocodingProvider()
+        provider.api_key = "test"
+        provider.cache = GeocodeCache(None, lru_size=0, ttl_seconds=60, negative_ttl_seconds=60)
+        provider.http = FakeHttp({"results": [{"geometry": {"lat": 33.77, "lng": -84.38}}]})
+        
+        async def scenario():
+            return await asyncio.gather(
+                provider.geocode_address("123 Peachtree Street, Atlanta, Georgia"),
+                provider.geocode_address("123 peachtree street atlanta ga")
+            )
+        
+        assert asyncio.run(scenario()) == [(33.77, -84.38), (33.77, -84.38)]
+        assert provider.http.calls == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.db.spatial import places_within_radius, spatial_query
+from app.models.gluten_signal import GlutenSignal
+from app.models.place import Place
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+    
+    def all(self):
+        return self.rows
+
+class FakeSession:
+    """Returns canned rows and records executed statements."""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+    
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows)
+
+class TestSchema:
+    """Test the generated geography column and its index."""
+    
+    def test_location_is_generated_geography(self):
+        """Test that location is derived from lat/lng in the database."""
+        ddl = compile_sql(CreateTable(Place.__table__))
+        
+        assert "location geography(Point, 4326) GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography) STORED" in ddl
+    
+    def test_location_has_gist_index(self):
+        """Test that the GIST index covers the column queries use."""
+        ddl = [compile_sql(CreateIndex(index)) for index in Place.__table__.indexes]
+        
+        assert "CREATE INDEX idx_places_location ON places USING gist (location)" in ddl
+
+class TestSpatialQuery:
+    """Test the PostGIS radius and KNN query."""
+    
+    def test_radius_query_uses_index_operators(self):
+        """Test that the query filters with ST_DWithin and orders by KNN distance."""
+        sql = compile_sql(spatial_query(33.749, -84.388, 10, limit=50))
+        
+        assert "ST_DWithin(places.location, CAST(ST_SetSRID(ST_MakePoint(" in sql
+        assert "ORDER BY places.location <-> CAST(" in sql
+        assert "LEFT OUTER JOIN gluten_signals ON gluten_signals.place_id = places.id" in sql
+        assert "LIMIT" in sql
+    
+    def test_radius_is_in_meters(self):
+        """Test that the radius is converted to meters."""
+        params = spatial_query(33.749, -84.388, 10).compile(dialect=postgresql.dialect()).params
+        
+        assert pytest.approx(16093.44) in params.values()
+    
+    def test_nearest_query_has_no_radius(self):
+        """Test that KNN-only queries don't filter by distance."""
+        sql = compile_sql(spatial_query(33.749, -84.388, limit=5))
+        
+        assert "ST_DWithin" not in sql
+        assert "<->" in sql
+    
+    def test_fetched_since_keeps_fresh_scored_places(self):
+        """Test that a freshness cutoff also drops places without a signal."""
+        cutoff = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        sql = compile_sql(spatial_query(33.749, -84.388, 10, fetched_since=cutoff))
+        
+        assert "places.last_fetched_at >=" in sql
+        assert "gluten_signals.place_id IS NOT NULL" in sql
+
+class TestFallback:
+    """Test radius queries without PostGIS."""
+    
+    def test_filters_bounding_box_rows_by_distance(self):
+        """Test that rows in the bounding box are cut by haversine distance and sorted."""
+        near = Place(id=uuid.uuid4(), provider_id="near", name="Near", lat=33.75, lng=-84.39)
+        nearer = Place(id=uuid.uuid4(), provider_id="nearer", name="Nearer", lat=33.749, lng=-84.388)
+        corner = Place(id=uuid.uuid4(), provider_id="corner", name="Corner", lat=33.88, lng=-84.54)
+        signal = GlutenSignal(place_id=near.id)
+        session = FakeSession([(near, signal), (nearer, None), (corner, None)])
+        
+        matches = asyncio.run(places_within_radius(session, 33.749, -84.388, 10, use_postgis=False))
+        
+        assert [(place.provider_id, match_signal) for place, match_signal, _ in matches] == [("nearer", None), ("near", signal)]
+        assert "places.lat BETWEEN" in compile_sql(session.statements[0])
+    
+    def test_fetched_since_without_postgis(self):
+        """Test that the bounding box query applies the freshness cutoff too."""
+        session = FakeSession([])
+        cutoff = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        
+        asyncio.run(places_within_radius(session, 33.749, -84.388, 10, use_postgis=False, fetched_since=cutoff))
+        
+        assert "places.last_fetched_at >=" in compile_sql(session.statements[0])
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,9 +1,14 @@
+import numpy as np
 import pytest
 from app.scoring.wilson import (
     wilson_confidence,
     calculate_volume_bonus,
     calculate_confidence_score,
-    get_confidence_breakdown
+    get_confidence_breakdown,
+    wilson_confidence_batch,
+    calculate_volume_bonus_batch,
+    calculate_confidence_score_batch,
+    get_confidence_breakdown_batch
 )
 
 class TestWilsonConfidence:
@@ -135,5 +140,44 @@ class TestConfidenceBreakdown:
         assert breakdown["polarized_reviews"] == 0
         assert breakdown["total_reviews"] == 0
 
+class TestBatchScoring:
+    """Test that vectorized scoring matches the scalar functions exactly."""
+    
+    @pytest.fixture
+    def counts(self):
+        positive, negative, extra = np.meshgrid(np.arange(0, 25), np.arange(0, 25), np.arange(-2, 30, 3))
+        positive, negative = positive.ravel(), negative.ravel()
+        return positive, negative, positive + negative + extra.ravel()
+    
+    def test_wilson_confidence_batch(self):
+        """Test the Wilson lower bound over proportions and sample sizes."""
+        phat = np.linspace(0, 1, 41)
+        for n in [0, 1, 5, 50, 1000]:
+            expected = [wilson_confidence(p, n) for p in phat]
+            assert wilson_confidence_batch(phat, np.full(len(phat), n)).tolist() == expected
+    
+    def test_volume_bonus_batch(self):
+        """Test the volume bonus, including zero and negative counts."""
+        n = np.arange(-3, 500)
+        assert calculate_volume_bonus_batch(n).tolist() == [calculate_volume_bonus(int(v)) for v in n]
+    
+    def test_confidence_score_batch(self, counts):
+        """Test confidence scores."""
+        positive, negative, total = counts
+        expected = [
+            calculate_confidence_score(int(p), int(q), int(t))
+            for p, q, t in zip(positive, negative, total)
+        ]
+        assert calculate_confidence_score_batch(positive, negative, total).tolist() == expected
+    
+    def test_confidence_breakdown_batch(self, counts):
+        """Test every field of the breakdown."""
+        positive, negative, total = counts
+        batch = get_confidence_breakdown_batch(positive, negative, total)
+        
+        for i in range(len(positive)):
+            expected = get_confidence_breakdown(int(positive[i]), int(negative[i]), int(total[i]))
+            assert {key: batch[key][i] for key in expected} == expected
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
@@ -0,0 +1,301 @@
+import asyncio
+import re
+import uuid
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.db.writer import PersistenceWriter, parse_review_time, place_values
+from app.models.gluten_signal import GlutenSignal
+from app.nlp.analysis import review_analyzer
+from app.scoring.wilson import calculate_confidence_score
+from conftest import make_business
+
+def make_review(review_id, text):
+    return {"id": review_id, "text": text, "rating": 5, "time_created": "2023-12-01 12:00:00"}
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+    
+    def all(self):
+        return self.rows
+
+def statement_rows(params):
+    """Split a multi-row INSERT's bind parameters into one dict per row."""
+    rows = {}
+    for name, value in params.items():
+        column, index = re.match(r"^(.*?)(?:_m(\d+))?$", name).groups()
+        rows.setdefault(int(index or 0), {})[column] = value
+    return [rows[index] for index in sorted(rows)]
+
+class FakeDatabase:
+    """In-memory stand-in for the tables, shared by every session."""
+    
+    def __init__(self):
+        self.place_ids = {}
+        self.review_ids = set()
+        self.signals = {}
+        self.statements = []
+        self.commits = 0
+        self.fail = False
+
+class FakeSession:
+    """Executes the writer's INSERT statements against a FakeDatabase."""
+    
+    def __init__(self, database):
+        self.database = database
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    async def execute(self, statement, params=None):
+        if self.database.fail:
+            raise ConnectionError("database unavailable")
+        self.database.statements.append(statement)
+        
+        if params is not None:
+            # Bulk UPDATE of the recomputed scores by primary key
+            for values in params:
+                for name, value in values.items():
+                    setattr(self.database.signals[values["place_id"]], name, value)
+            return FakeResult([])
+        
+        rows = statement.compile(dialect=postgresql.dialect()).params
+        
+        if statement.table.name == "gluten_signals":
+            # Counters add up on conflict, like the real upsert
+            returned = []
+            for row in statement_rows(rows):
+                row = {name: value for name, value in row.items() if hasattr(GlutenSignal, name)}
+                signal = self.database.signals.get(row["place_id"])
+                if signal is None:
+                    signal = self.database.signals[row["place_id"]] = GlutenSignal(**row)
+                else:
+                    for name in ("gluten_review_count", "positive_gluten_reviews", "negative_gluten_reviews"):
+                        setattr(signal, name, getattr(signal, name) + row[name])
+                returned.append(SimpleNamespace(_mapping={
+                    name: getattr(signal, name)
+                    for name in (
+                        "place_id", "gluten_review_count", "positive_gluten_reviews", "negative_gluten_reviews",
+                        "decayed_positive", "decayed_negative", "decayed_total", "decay_reference_at"
+                    )
+                }))
+            return FakeResult(returned)
+        
+        if statement.table.name == "places":
+            provider_ids = [value for name, value in rows.items() if name.startswith("provider_id")]
+            returned = []
+            for provider_id in provider_ids:
+                place_id = self.database.place_ids.setdefault(provider_id, uuid.uuid4())
+                returned.append((place_id, provider_id))
+            return FakeResult(returned)
+        
+        review_ids = [value for name, value in rows.items() if name.startswith("review_id")]
+        place_ids = [value for name, value in rows.items() if name.startswith("place_id")]
+        returned = []
+        for review_id, place_id in zip(review_ids, place_ids):
+            if review_id not in self.database.review_ids:
+                self.database.review_ids.add(review_id)
+                returned.append((review_id, place_id))
+        return FakeResult(returned)
+    
+    async def commit(self):
+        self.database.commits += 1
+
+def make_writer(database, **kwargs):
+    return PersistenceWriter(session_factory=lambda: FakeSession(database), **kwargs)
+
+def enqueue(writer, business_id, reviews):
+    texts = [review["text"] for review in reviews]
+    writer.enqueue(make_business(business_id), reviews, [review_analyzer.analyze(text) for text in texts])
+
+class TestValues:
+    """Test mapping provider payloads to column values."""
+    
+    def test_parse_review_time(self):
+        """Test Yelp timestamps become aware datetimes."""
+        parsed = parse_review_time("2023-12-01 12:00:00")
+        
+        assert parsed.year == 2023 and parsed.tzinfo is not None
+        assert parse_review_time("yesterday") is None
+        assert parse_review_time(None) is None
+    
+    def test_place_values(self):
+        """Test business payload fields map to place columns."""
+        values = place_values(make_business("cafe", review_count=12, url="https://yelp.com/biz/cafe"), None)
+        
+        assert values["provider_id"] == "cafe"
+        assert values["user_ratings_total"] == 12
+        assert values["website"] == "https://yelp.com/biz/cafe"
+        assert values["address"] == "1 Main St"
+
+class TestFlush:
+    """Test batched writes."""
+    
+    def test_statements_upsert_places_and_skip_known_reviews(self):
+        """Test the INSERT ... ON CONFLICT forms used for each table."""
+        database = FakeDatabase()
+        writer = make_writer(database)
+        enqueue(writer, "cafe", [make_review("r1", "Dedicated fryer, celiac safe.")])
+        
+        asyncio.run(writer.flush())
+        place_sql, review_sql, signal_sql = (str(s.compile(dialect=postgresql.dialect())) for s in database.statements[:3])
+        
+        assert "ON CONFLICT (provider_id) DO UPDATE SET" in place_sql
+        assert "phone = coalesce(excluded.phone, places.phone)" in place_sql
+        assert "RETURNING places.id, places.provider_id" in place_sql
+        assert "ON CONFLICT (review_id) DO NOTHING RETURNING reviews.review_id, reviews.place_id" in review_sql
+        assert "ON CONFLICT (place_id) DO UPDATE SET" in signal_sql
+        assert "gluten_review_count = (coalesce(gluten_signals.gluten_review_count" in signal_sql
+        assert "+ excluded.gluten_review_count)" in signal_sql
+        assert "decay_reference_at = greatest(gluten_signals.decay_reference_at, excluded.decay_reference_at)" in signal_sql
+    
+    def test_signal_counts_only_new_reviews(self):
+        """Test that reviews seen in an earlier flush don't count twice."""
+        database = FakeDatabase()
+        writer = make_writer(database)
+        reviews = [make_review("r1", "Dedicated fryer, celiac safe."), make_review("r2", "Shared fryer, I got sick.")]
+        
+        enqueue(writer, "cafe", reviews)
+        asyncio.run(writer.flush())
+        enqueue(writer, "cafe", reviews + [make_review("r3", "Gluten free menu, celiac friendly staff.")])
+        asyncio.run(writer.flush())
+        
+        signal = database.signals[database.place_ids["cafe"]]
+        assert isinstance(signal, GlutenSignal)
+        assert signal.gluten_review_count == 3
+        assert signal.positive_gluten_reviews == 2
+        assert signal.negative_gluten_reviews == 1
+        assert writer.reviews_written == 3
+        assert database.commits == 2
+    
+    def test_buffer_dedupes_places_and_reviews(self):
+        """Test that repeated enqueues collapse before writing."""
+        writer = make_writer(FakeDatabase())
+        enqueue(writer, "cafe", [make_review("r1", "Celiac safe.")])
+        enqueue(writer, "cafe", [make_review("r1", "Celiac safe.")])
+        
+        assert writer.pending == 2
+    
+    def test_concurrent_writers_add_up(self):
+        """Test that two workers flushing new reviews for one place both count."""
+        database = FakeDatabase()
+        first, second = make_writer(database), make_writer(database)
+        enqueue(first, "cafe", [make_review("r1", "Dedicated fryer, celiac safe.")])
+        enqueue(second, "cafe", [make_review("r2", "Shared fryer, I got sick.")])
+        
+        async def run():
+            await asyncio.gather(first.flush(), second.flush())
+        
+        asyncio.run(run())
+        signal = database.signals[database.place_ids["cafe"]]
+        
+        assert signal.gluten_review_count == 2
+        assert signal.positive_gluten_reviews == 1
+        assert signal.negative_gluten_reviews == 1
+        assert signal.confidence == calculate_confidence_score(1, 1, 2)
+    
+    def test_failed_flush_is_retried(self):
+        """Test that a database error keeps the batch for the next flush."""
+        database = FakeDatabase()
+        database.fail = True
+        writer = make_writer(database)
+        enqueue(writer, "cafe", [make_review("r1", "Dedicated fryer, celiac safe.")])
+        
+        assert asyncio.run(writer.flush()) == 0
+        assert writer.errors == 1
+        assert writer.pending == 2
+        
+        database.fail = False
+        assert asyncio.run(writer.flush()) == 2
+        assert writer.reviews_written == 1
+        assert writer.stats()["retried"] == 1
+    
+    def test_requeued_batch_keeps_newer_payloads(self):
+        """Test that a place enqueued after a failed flush keeps its newer fields."""
+        database = FakeDatabase()
+        database.fail = True
+        writer = make_writer(database)
+        writer.enqueue(make_business("cafe", phone="+14045550100", rating=4.0))
+        asyncio.run(writer.flush())
+        writer.enqueue(make_business("cafe", rating=4.5))
+        
+        assert writer._places["cafe"]["rating"] == 4.5
+        assert writer._places["cafe"]["phone"] == "+14045550100"
+    
+    def test_batch_dropped_after_max_retries(self):
+        """Test that a batch is given up after max_retries failed flushes in a row."""
+        database = FakeDatabase()
+        database.fail = True
+        writer = make_writer(database, max_retries=2)
+        enqueue(writer, "cafe", [])
+        
+        for _ in range(3):
+            asyncio.run(writer.flush())
+        
+        assert writer.errors == 3
+        assert writer.pending == 0
+        assert writer.dropped == 1
+    
+    def test_max_pending(self):
+        """Test that writes are dropped once the buffer is full."""
+        writer = make_writer(FakeDatabase(), max_pending=1)
+        enqueue(writer, "cafe", [])
+        enqueue(writer, "bistro", [])
+        
+        assert writer.pending == 1
+        assert writer.dropped == 1
+
+class TestBackgroundFlush:
+    """Test size- and time-triggered flushing."""
+    
+    def test_flushes_when_batch_fills(self):
+        """Test that reaching the batch size wakes the flusher early."""
+        database = FakeDatabase()
+        
+        async def scenario():
+            writer = make_writer(database, batch_size=2, flush_interval_seconds=60)
+            await writer.start()
+            enqueue(writer, "cafe", [make_review("r1", "Celiac safe.")])
+            await asyncio.sleep(0.05)
+            flushed = writer.flushes
+            await writer.stop()
+            return flushed
+        
+        assert asyncio.run(scenario()) == 1
+    
+    def test_flushes_on_interval(self):
+        """Test that a partial batch is written after the interval."""
+        database = FakeDatabase()
+        
+        async def scenario():
+            writer = make_writer(database, batch_size=100, flush_interval_seconds=0.02)
+            await writer.start()
+            enqueue(writer, "cafe", [])
+            await asyncio.sleep(0.1)
+            flushed = writer.flushes
+            await writer.stop()
+            return flushed
+        
+        assert asyncio.run(scenario()) == 1
+    
+    def test_stop_flushes_remaining(self):
+        """Test that shutdown writes whatever is still buffered."""
+        database = FakeDatabase()
+        
+        async def scenario():
+            writer = make_writer(database, batch_size=100, flush_interval_seconds=60)
+            await writer.start()
+            enqueue(writer, "cafe", [])
+            await writer.stop()
+            return writer
+        
+        writer = asyncio.run(scenario())
+        assert writer.places_written == 1
+        assert writer.stats()["running"] is False
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -9,9 +9,34 @@ CREATE EXTENSION IF NOT EXISTS postgis;
 -- Create tables (these will be created by SQLAlchemy/Alembic)
 -- The tables are defined in the Python models and will be created automatically
 
+-- Upgrade databases created before these columns and constraints existed
+-- (safe to run again; fresh databases get them from the models)
+ALTER TABLE places ADD COLUMN IF NOT EXISTS location geography(Point, 4326)
+    GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography) STORED;
+
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS is_gluten_related BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS gluten_sentiment VARCHAR;
+
+ALTER TABLE gluten_signals ADD COLUMN IF NOT EXISTS decayed_positive DOUBLE PRECISION DEFAULT 0;
+ALTER TABLE gluten_signals ADD COLUMN IF NOT EXISTS decayed_negative DOUBLE PRECISION DEFAULT 0;
+ALTER TABLE gluten_signals ADD COLUMN IF NOT EXISTS decayed_total DOUBLE PRECISION DEFAULT 0;
+ALTER TABLE gluten_signals ADD COLUMN IF NOT EXISTS decay_reference_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE gluten_signals ADD COLUMN IF NOT EXISTS decayed_confidence DOUBLE PRECISION DEFAULT 0;
+
+-- The writer's INSERT ... ON CONFLICT (review_id) needs a unique constraint;
+-- keep the first copy of any review stored twice before adding it
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_review_review_id') THEN
+        DELETE FROM reviews a USING reviews b
+            WHERE a.review_id = b.review_id AND a.ctid > b.ctid;
+        ALTER TABLE reviews ADD CONSTRAINT uq_review_review_id UNIQUE (review_id);
+    END IF;
+END $$;
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_places_provider_id ON places(provider_id);
-CREATE INDEX IF NOT EXISTS idx_places_location ON places USING GIST (ST_SetSRID(ST_MakePoint(lng, lat), 4326));
+CREATE INDEX IF NOT EXISTS idx_places_location ON places USING GIST (location);
 CREATE INDEX IF NOT EXISTS idx_reviews_place_id ON reviews(place_id);
 CREATE INDEX IF NOT EXISTS idx_reviews_review_id ON reviews(review_id);
 CREATE INDEX IF NOT EXISTS idx_gluten_signals_place_id ON gluten_signals(place_id);